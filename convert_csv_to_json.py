@@ -3,6 +3,11 @@ import json
 import os
 from datetime import datetime
 import glob
+import sys
+
+# Share the scrapers' date and time parsing
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scraper'))
+from museums import dates, times
 
 def convert_csv_to_json():
     # Directory containing CSV files
@@ -67,11 +72,17 @@ def convert_csv_to_json():
                         "type": row.get('Event Type', 'Special Event').strip(),
                         "date": formatted_date,
                         "time": row.get('Time', '10:00 AM - 5:00 PM').strip(),
+                        "start_time": None,
+                        "end_time": None,
                         "description": row.get('Short Description', row.get('Description', '')).strip(),
                         "location": row.get('Location', f"{museum_info['name']}, New York, NY").strip(),
                         "url": row.get('More Info:', '').strip()
                     }
                     
+                    parsed_time = times.parse_time_range(event['time'])
+                    if parsed_time:
+                        event['start_time'], event['end_time'] = parsed_time.start_time, parsed_time.end_time
+                    
                     # Clean up the URL field (remove double colons if present)
                     if event['url'] and event['url'].startswith(':'):
                         event['url'] = event['url'][1:].strip()
@@ -105,27 +116,7 @@ def parse_date(date_str):
     if not date_str:
         return None
     
-    # Try different date formats
-    date_formats = [
-        "%Y-%m-%d",           # 2025-07-15
-        "%B %d, %Y",          # July 15, 2025
-        "%b %d, %Y",          # Jul 15, 2025
-        "%m/%d/%Y",           # 07/15/2025
-        "%d/%m/%Y",           # 15/07/2025
-        "%Y/%m/%d",           # 2025/07/15
-        "%d-%m-%Y",           # 15-07-2025
-        "%d %B %Y",           # 15 July 2025
-        "%d %b %Y",           # 15 Jul 2025
-    ]
-    
-    for fmt in date_formats:
-        try:
-            date_obj = datetime.strptime(date_str.strip(), fmt)
-            return date_obj.strftime("%Y-%m-%d")
-        except ValueError:
-            continue
-    
-    return None
+    return dates.parse_date(date_str.strip())
 
 if __name__ == "__main__":
     output_file = convert_csv_to_json()
@@ -3,6 +3,11 @@ import json
 import os
 from datetime import datetime
 import glob
+import sys
+
+# Share the scrapers' date and time parsing
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scraper'))
+from museums import dates, times
 
 def debug_csv_directory():
     """Debug function to check CSV files"""
@@ -150,11 +155,17 @@ def convert_csv_to_json_with_debug():
                         "type": row.get('Event Type', 'Special Event').strip(),
                         "date": formatted_date,
                         "time": row.get('Time', '10:00 AM - 5:00 PM').strip(),
+                        "start_time": None,
+                        "end_time": None,
                         "description": row.get('Short Description', row.get('Description', '')).strip(),
                         "location": row.get('Location', f"{museum_info['name']}, New York, NY").strip(),
                         "url": row.get('More Info:', row.get('More Info', '')).strip()
                     }
                     
+                    parsed_time = times.parse_time_range(event['time'])
+                    if parsed_time:
+                        event['start_time'], event['end_time'] = parsed_time.start_time, parsed_time.end_time
+                    
                     # Clean up the URL field
                     if event['url'] and event['url'].startswith(':'):
                         event['url'] = event['url'][1:].strip()
@@ -200,36 +211,11 @@ def parse_date(date_str):
     if not date_str:
         return None
     
-    # Clean the date string
-    date_str = date_str.strip()
-    
-    # Try different date formats
-    date_formats = [
-        "%Y-%m-%d",           # 2025-07-15
-        "%B %d, %Y",          # July 15, 2025
-        "%b %d, %Y",          # Jul 15, 2025
-        "%m/%d/%Y",           # 07/15/2025
-        "%d/%m/%Y",           # 15/07/2025
-        "%Y/%m/%d",           # 2025/07/15
-        "%d-%m-%Y",           # 15-07-2025
-        "%d %B %Y",           # 15 July 2025
-        "%d %b %Y",           # 15 Jul 2025
-        "%B %d",              # July 15 (assume current year)
-        "%b %d",              # Jul 15 (assume current year)
-    ]
-    
-    for fmt in date_formats:
-        try:
-            if "%Y" not in fmt:  # If year not in format, add current year
-                date_obj = datetime.strptime(f"{date_str} 2025", f"{fmt} %Y")
-            else:
-                date_obj = datetime.strptime(date_str, fmt)
-            return date_obj.strftime("%Y-%m-%d")
-        except ValueError:
-            continue
-    
-    print(f"  Could not parse date: '{date_str}'")
-    return None
+    # Dates without a year (e.g. "July 15") assume the current year
+    date = dates.parse_date(date_str.strip(), default_year=datetime.now().year)
+    if not date:
+        print(f"  Could not parse date: '{date_str}'")
+    return date
 
 if __name__ == "__main__":
     # First debug to see what's in the directory
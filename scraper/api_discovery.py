@@ -2,11 +2,16 @@ import requests
 import json
 from urllib.parse import urljoin, urlparse
 import re
+from config import load_config
+from museums.retry import RetryPolicy
 
 class APIDiscovery:
     """Discover and use hidden APIs that museums use for their own websites"""
     
-    def __init__(self):
+    def __init__(self, config=None):
+        config = config or load_config()
+        # Transient failures are retried like every other fetch path
+        self.retry_policy = RetryPolicy.from_config(config['retry'])
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
@@ -16,6 +21,11 @@ class APIDiscovery:
             'Origin': 'https://www.moma.org'
         })
         
+    def get(self, url, **kwargs):
+        """GET through the session, retrying transient failures"""
+        kwargs.setdefault('timeout', 15)
+        return self.retry_policy.call(lambda: self.session.get(url, **kwargs))
+        
     def discover_api_endpoints(self, base_url):
         """Discover API endpoints by analyzing network traffic patterns"""
         
@@ -50,7 +60,7 @@ class APIDiscovery:
                 
                 for url in urls_to_try:
                     try:
-                        response = self.session.get(url, timeout=5)
+                        response = self.get(url, timeout=5)
                         if response.status_code == 200:
                             # Check if it's JSON
                             try:
@@ -72,7 +82,7 @@ class APIDiscovery:
         """Analyze JavaScript files to find API endpoints"""
         
         # First, get the main page
-        response = self.session.get(base_url)
+        response = self.get(base_url)
         
         # Find all JavaScript files
         js_pattern = re.compile(r'<script[^>]+src=["\']([^"\']+\.js)["\']', re.IGNORECASE)
@@ -83,7 +93,7 @@ class APIDiscovery:
         for js_file in js_files:
             js_url = urljoin(base_url, js_file)
             try:
-                js_response = self.session.get(js_url)
+                js_response = self.get(js_url)
                 js_content = js_response.text
                 
                 # Look for API calls in JavaScript
@@ -145,7 +155,7 @@ class APIDiscovery:
             for endpoint in config['endpoints']:
                 url = config['base'] + endpoint
                 try:
-                    response = self.session.get(url, timeout=10)
+                    response = self.get(url, timeout=10)
                     if response.status_code == 200:
                         working_apis.append({
                             'museum': museum,
@@ -157,30 +167,36 @@ class APIDiscovery:
                     
         return working_apis
     
-    def intercept_ajax_calls(self, url):
+    def intercept_ajax_calls(self, url, museum=''):
         """
-        Use browser developer tools approach to intercept AJAX calls
-        This is what you would do manually:
+        Load url in headless Chrome and list the JSON endpoints it calls
+        This automates the manual DevTools approach:
         1. Open Chrome DevTools
         2. Go to Network tab
         3. Filter by XHR/Fetch
         4. Look for API calls when page loads or when clicking "Load More"
+        Returns [{'url', 'status', 'events'}], the most events first
         """
+        from browser_pool import chrome_driver
+        from browser_waits import wait_for_network_idle, wait_until_ready
+        from xhr_capture import capture_json_responses, events_from_json
         
-        # Example findings from manual inspection:
-        ajax_endpoints = {
-            'moma': [
-                'https://www.moma.org/calendar/load-more',
-                'https://www.moma.org/api/calendar/events',
-                'https://www.moma.org/wp-json/wp/v2/events'
-            ],
-            'whitney': [
-                'https://whitney.org/api/events',
-                'https://whitney.org/calendar/api/load'
-            ]
-        }
+        driver = chrome_driver(capture_network=True)
+        try:
+            driver.get(url)
+            wait_until_ready(driver)
+            wait_for_network_idle(driver)
+            captured = capture_json_responses(driver)
+        finally:
+            driver.quit()
+        
+        ajax_endpoints = [{
+            'url': response['url'],
+            'status': response['status'],
+            'events': len(events_from_json(response['payload'], museum)),
+        } for response in captured]
         
-        return ajax_endpoints
+        return sorted(ajax_endpoints, key=lambda endpoint: -endpoint['events'])
 
 # Example: How to find hidden APIs manually
 """
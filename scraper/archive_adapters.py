@@ -0,0 +1,71 @@
+"""
+requests transport adapters that record to / replay from a FetchArchive
+Mount them on a requests.Session with mount_archive()
+"""
+
+import time
+
+from requests import Response
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+# Bodies are stored decoded, so transfer encodings must not be replayed
+_DROPPED_HEADERS = ('content-encoding', 'transfer-encoding', 'content-length')
+
+
+class RecordingAdapter(HTTPAdapter):
+    """Sends requests normally and appends every exchange to the archive"""
+
+    def __init__(self, archive, **kwargs):
+        super().__init__(**kwargs)
+        self.archive = archive
+
+    def send(self, request, **kwargs):
+        start = time.perf_counter()
+        response = super().send(request, **kwargs)
+        body = response.text
+        self.archive.record(request.url, response.status_code, response.headers, body,
+                            time.perf_counter() - start, method=request.method,
+                            encoding=response.encoding or 'utf-8')
+        return response
+
+
+class ReplayAdapter(BaseAdapter):
+    """Serves responses from the archive without touching the network"""
+
+    def __init__(self, archive):
+        super().__init__()
+        self.archive = archive
+
+    def send(self, request, **kwargs):
+        entry = self.archive.lookup(request.url, request.method)
+        response = Response()
+        response.request = request
+        response.url = request.url
+        response.connection = self
+        if entry is None:
+            response.status_code = 404
+            response.reason = 'Not in archive'
+            response._content = b''
+            return response
+
+        headers = {k: v for k, v in entry['headers'].items() if k.lower() not in _DROPPED_HEADERS}
+        response.status_code = entry['status']
+        response.headers = CaseInsensitiveDict(headers)
+        response.encoding = entry['encoding']
+        response._content = entry['body'].encode(entry['encoding'], errors='replace')
+        return response
+
+    def close(self):
+        pass
+
+
+def mount_archive(session, archive):
+    """Route every request made through session via the archive"""
+    if archive.replaying:
+        adapter = ReplayAdapter(archive)
+    else:
+        adapter = RecordingAdapter(archive)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Parser benchmark suite over saved museum pages
+Runs every museums/* parse_events implementation and the
+TargetedMuseumScraper parse_* helpers against the fixtures in
+benchmark_fixtures/ and reports throughput and memory per parser.
+
+    python benchmark_parsers.py --import-archive run.jsonl.gz   # add fixtures
+    python benchmark_parsers.py --output results.json           # run
+    python benchmark_parsers.py --baseline benchmark_fixtures/baseline.json
+"""
+
+import argparse
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from types import SimpleNamespace
+from urllib.parse import urlparse
+
+from compare_parsers import SCRAPER_CLASSES
+from museums import jsonld
+from museums.parsing import make_soup
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURES_DIR = os.path.join(SCRIPT_DIR, 'benchmark_fixtures')
+RESULTS_DIR = os.path.join(SCRIPT_DIR, 'benchmark_results')
+MANIFEST = 'fixtures.json'
+
+
+# ========== Fixtures ==========
+def load_fixtures(fixtures_dir=FIXTURES_DIR):
+    """Return [{'url', 'kind', 'body'}] for every fixture in the manifest"""
+    manifest_path = os.path.join(fixtures_dir, MANIFEST)
+    if not os.path.exists(manifest_path):
+        return []
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    fixtures = []
+    for entry in manifest:
+        with open(os.path.join(fixtures_dir, entry['file']), 'r', encoding='utf-8') as f:
+            fixtures.append({'url': entry['url'], 'kind': entry['kind'], 'body': f.read()})
+    return fixtures
+
+
+def import_archive(archive_path, fixtures_dir=FIXTURES_DIR):
+    """Save every 200 response of a recorded archive as a fixture"""
+    os.makedirs(fixtures_dir, exist_ok=True)
+    manifest_path = os.path.join(fixtures_dir, MANIFEST)
+    manifest = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = {entry['url']: entry for entry in json.load(f)}
+
+    with gzip.open(archive_path, 'rt', encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            if entry['status'] != 200 or not entry['body']:
+                continue
+            content_type = {k.lower(): v for k, v in entry['headers'].items()}.get('content-type', '')
+            kind = 'json' if 'json' in content_type or entry['body'].lstrip()[:1] in ('{', '[') else 'html'
+            host = urlparse(entry['url']).netloc.replace('www.', '')
+            digest = hashlib.sha1(entry['url'].encode('utf-8')).hexdigest()[:10]
+            filename = f"{host}-{digest}.{kind}"
+            with open(os.path.join(fixtures_dir, filename), 'w', encoding='utf-8') as out:
+                out.write(entry['body'])
+            manifest[entry['url']] = {'file': filename, 'url': entry['url'], 'kind': kind}
+
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(sorted(manifest.values(), key=lambda e: e['file']), f, indent=2)
+    print(f"Saved {len(manifest)} fixtures to {fixtures_dir}")
+
+
+# ========== Parsers under test ==========
+def museum_parsers():
+    """One benchmark entry per museums/* parse_events implementation"""
+    parsers = {}
+    for scraper_class in SCRAPER_CLASSES:
+        scraper = scraper_class(None)
+        hosts = {urlparse(url).netloc for url in scraper.get_urls()}
+
+        def run(fixture, scraper=scraper):
+            return len(asyncio.run(scraper.parse_events(fixture['body'], fixture['url'])))
+
+        name = f"{scraper_class.__module__}.{scraper_class.__name__}.parse_events"
+        parsers[name] = (lambda fixture, hosts=hosts: fixture['kind'] == 'html'
+                         and urlparse(fixture['url']).netloc in hosts, run)
+
+    parsers['museums.jsonld.extract_events'] = (
+        lambda fixture: fixture['kind'] == 'html',
+        lambda fixture: len(jsonld.extract_events(fixture['body'])))
+    return parsers
+
+
+def targeted_parsers():
+    """One benchmark entry per TargetedMuseumScraper parse_* helper"""
+    try:
+        from targeted_scraper import TargetedMuseumScraper
+    except ImportError as e:
+        print(f"Skipping TargetedMuseumScraper helpers: {e}")
+        return {}
+
+    scraper = TargetedMuseumScraper()
+
+    def response_for(fixture):
+        return SimpleNamespace(text=fixture['body'], content=fixture['body'].encode('utf-8'),
+                               json=lambda: json.loads(fixture['body']))
+
+    def with_response(method):
+        def run(fixture):
+            scraper.events = []
+            method(response_for(fixture), 'bench', 'Benchmark')
+            return len(scraper.events)
+        return run
+
+    def with_soup(method):
+        def run(fixture):
+            scraper.events = []
+            method(make_soup(fixture['body'], scraper.parser_engine), 'bench', 'Benchmark')
+            return len(scraper.events)
+        return run
+
+    is_html = lambda fixture: fixture['kind'] == 'html'
+    is_json = lambda fixture: fixture['kind'] == 'json'
+    prefix = 'TargetedMuseumScraper.'
+    return {
+        prefix + 'parse_moma_html': (is_html, with_response(scraper.parse_moma_html)),
+        prefix + 'parse_jsonld': (is_html, with_response(scraper.parse_jsonld)),
+        prefix + 'parse_met_html': (is_html, with_soup(scraper.parse_met_html)),
+        prefix + 'parse_generic_events': (is_html, with_soup(scraper.parse_generic_events)),
+        prefix + 'parse_academic_events': (is_html, with_soup(scraper.parse_academic_events)),
+        prefix + 'parse_tribe_events_html': (is_html, with_soup(scraper.parse_tribe_events_html)),
+        prefix + 'parse_wordpress_json': (is_json, with_response(scraper.parse_wordpress_json)),
+        prefix + 'parse_tribe_events': (is_json, with_response(scraper.parse_tribe_events)),
+        prefix + 'parse_json_endpoint': (is_json, with_response(scraper.parse_json_endpoint)),
+    }
+
+
+# ========== Measurement ==========
+def measure(run, fixtures, repeat):
+    """Throughput of the fastest of repeat passes, then peak memory over one traced pass"""
+    events, elapsed = 0, float('inf')
+    for _ in range(repeat):
+        # The best pass is the least disturbed by warm-up and machine noise
+        start = time.perf_counter()
+        events = sum(run(fixture) for fixture in fixtures)
+        elapsed = min(elapsed, time.perf_counter() - start)
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    for fixture in fixtures:
+        run(fixture)
+    _, peak = tracemalloc.get_traced_memory()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    # Net memory the pass left behind (caches, interned strings, leaks); the
+    # snapshots only see live blocks, so this is not a count of allocations
+    untraced = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    retained = after.filter_traces(untraced).compare_to(before.filter_traces(untraced), 'filename')
+
+    return {
+        'pages': len(fixtures),
+        'events': events,
+        'seconds': round(elapsed, 6),
+        'pages_per_s': round(len(fixtures) / elapsed, 2) if elapsed else 0,
+        'events_per_s': round(events / elapsed, 2) if elapsed else 0,
+        'peak_kib': round(peak / 1024, 1),
+        'retained_blocks': sum(stat.count_diff for stat in retained),
+        'retained_kib': round(sum(stat.size_diff for stat in retained) / 1024, 1),
+    }
+
+
+def run_benchmarks(fixtures, repeat=5, only=None):
+    parsers = {**museum_parsers(), **targeted_parsers()}
+    results = {}
+    for name, (accepts, run) in parsers.items():
+        if only and only not in name:
+            continue
+        selected = [fixture for fixture in fixtures if accepts(fixture)]
+        if not selected:
+            continue
+        results[name] = measure(run, selected, repeat)
+        r = results[name]
+        print(f"{name:<62} {r['pages']:>4} pages {r['pages_per_s']:>9.1f} pages/s "
+              f"{r['events_per_s']:>10.1f} events/s {r['peak_kib']:>9.1f} KiB peak")
+    return results
+
+
+def find_regressions(results, baseline, threshold):
+    """Parsers whose throughput fell or peak memory grew by more than threshold"""
+    regressions = []
+    for name, old in baseline.get('parsers', {}).items():
+        new = results.get(name)
+        if not new or new['pages'] != old['pages']:
+            continue
+        if old['pages_per_s'] and new['pages_per_s'] < old['pages_per_s'] * (1 - threshold):
+            regressions.append(f"{name}: {old['pages_per_s']} -> {new['pages_per_s']} pages/s")
+        if old['peak_kib'] and new['peak_kib'] > old['peak_kib'] * (1 + threshold):
+            regressions.append(f"{name}: {old['peak_kib']} -> {new['peak_kib']} KiB peak")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark museum parsers over saved pages')
+    parser.add_argument('--fixtures', default=FIXTURES_DIR, help='Fixture directory')
+    parser.add_argument('--import-archive', metavar='ARCHIVE',
+                       help='Add the pages of a recorded archive to the fixtures and exit')
+    parser.add_argument('--repeat', type=int, default=5, help='Timed passes per parser (the best counts)')
+    parser.add_argument('--only', help='Only run parsers whose name contains this')
+    parser.add_argument('--output', help='Results file (default: benchmark_results/<timestamp>.json)')
+    parser.add_argument('--baseline', help='Earlier results file to compare against')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                       help='Allowed slowdown / memory growth before failing (0.25 = 25%%)')
+    args = parser.parse_args()
+
+    if args.import_archive:
+        import_archive(args.import_archive, args.fixtures)
+        return
+
+    fixtures = load_fixtures(args.fixtures)
+    if not fixtures:
+        # The committed fixtures are missing, so a run would measure nothing
+        print(f"❌ No fixtures in {args.fixtures}: {MANIFEST} is missing or empty")
+        sys.exit(1)
+
+    print(f"Benchmarking over {len(fixtures)} fixtures\n")
+    results = run_benchmarks(fixtures, args.repeat, args.only)
+
+    output = args.output
+    if not output:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(RESULTS_DIR, datetime.now().strftime('%Y%m%d-%H%M%S') + '.json')
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump({
+            'created': datetime.now().isoformat(),
+            'python': platform.python_version(),
+            'fixtures': len(fixtures),
+            'repeat': args.repeat,
+            'parsers': results
+        }, f, indent=2)
+    print(f"\nSaved results to {output}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = find_regressions(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+            for regression in regressions:
+                print(f"  - {regression}")
+            sys.exit(1)
+        print(f"\n✅ No regressions beyond {args.threshold:.0%} against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+"""
+Pool of warm headless Chrome drivers shared by browser-based scrapers
+Starting Chrome costs seconds, so the pool starts N drivers once and lends
+them to jobs. Between jobs a driver is reset (cookies, storage, extra tabs,
+blocked URLs, back to about:blank) so one museum never sees another's session; a driver
+that fails to reset is replaced.
+
+    with BrowserPool(size=3) as pool:
+        results = pool.run({'moma': scrape_moma, 'met': scrape_met})
+
+PoolRenderer wraps a pool as the renderer BaseScraper escalates to.
+"""
+
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+
+def chrome_driver(capture_network: bool = False):
+    """Headless Chrome with the options the museum scrapers have always used;
+    capture_network keeps the performance log xhr_capture reads"""
+    # Imported here so modules that only reference the pool stay cheap to import
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+
+    options = Options()
+    options.add_argument('--headless')
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    options.add_argument('--disable-gpu')
+    options.add_argument('--window-size=1920,1080')
+    options.add_argument(f'--user-agent={USER_AGENT}')
+    if capture_network:
+        from xhr_capture import enable_performance_log
+        enable_performance_log(options)
+    return webdriver.Chrome(options=options)
+
+
+def reset_driver(driver) -> bool:
+    """Clear session state left by the previous job; False if the driver is unusable"""
+    try:
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+        # Storage can only be cleared from the page's own origin
+        driver.execute_script(
+            "try { localStorage.clear(); sessionStorage.clear(); } catch (e) {}")
+        try:
+            # Chrome can drop cookies for every domain at once; the next job
+            # installs its own resource-blocking policy
+            driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': []})
+        except Exception:
+            driver.delete_all_cookies()
+        driver.get('about:blank')
+        try:
+            # Drop network events the previous job did not read
+            driver.get_log('performance')
+        except Exception:
+            pass
+        return True
+    except Exception as e:
+        print(f"⚠️ Browser reset failed, replacing it: {e}")
+        return False
+
+
+class BrowserPool:
+    def __init__(self, size: int = 2, factory: Optional[Callable[[], Any]] = None):
+        self.size = max(1, size)
+        self.factory = factory or chrome_driver
+        self._idle = queue.Queue()
+        self._drivers = []
+        self._starting = 0
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _reserve(self) -> bool:
+        # Claims a slot before launching so concurrent callers never exceed size
+        with self._lock:
+            if len(self._drivers) + self._starting >= self.size:
+                return False
+            self._starting += 1
+            return True
+
+    def _new_driver(self):
+        try:
+            driver = self.factory()
+        finally:
+            with self._lock:
+                self._starting -= 1
+        with self._lock:
+            self._drivers.append(driver)
+        return driver
+
+    def _discard(self, driver):
+        with self._lock:
+            if driver in self._drivers:
+                self._drivers.remove(driver)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def start(self):
+        """Launch every driver up front, in parallel"""
+        missing = sum(self._reserve() for _ in range(self.size))
+        if not missing:
+            return
+        with ThreadPoolExecutor(max_workers=missing) as executor:
+            for driver in executor.map(lambda _: self._new_driver(), range(missing)):
+                self._idle.put(driver)
+        print(f"🌐 Browser pool ready with {len(self._drivers)} drivers")
+
+    def acquire(self):
+        """Take an idle driver, starting one if the pool is not full yet"""
+        if self._closed:
+            raise RuntimeError("Browser pool is closed")
+        timeout = 0
+        while True:
+            try:
+                return self._idle.get(timeout=timeout) if timeout else self._idle.get_nowait()
+            except queue.Empty:
+                pass
+            # Also covers a slot freed by a driver that could not be replaced
+            if self._reserve():
+                return self._new_driver()
+            timeout = 1
+
+    def release(self, driver):
+        """Reset a driver and return it to the pool, replacing it if it is broken"""
+        if self._closed:
+            self._discard(driver)
+            return
+        if not reset_driver(driver):
+            self._discard(driver)
+            if not self._reserve():
+                return
+            try:
+                driver = self._new_driver()
+            except Exception as e:
+                print(f"❌ Could not replace browser: {e}")
+                return
+        self._idle.put(driver)
+
+    @contextmanager
+    def driver(self):
+        """Borrow a driver for the duration of a with-block"""
+        driver = self.acquire()
+        try:
+            yield driver
+        finally:
+            self.release(driver)
+
+    def run(self, jobs: Dict[str, Callable[[Any], Any]]) -> Dict[str, Any]:
+        """Run job(driver) for every named job, up to size at a time; None for jobs that fail"""
+        def run_job(name, job):
+            with self.driver() as driver:
+                try:
+                    return job(driver)
+                except Exception as e:
+                    print(f"❌ {name} failed: {e}")
+                    return None
+
+        with ThreadPoolExecutor(max_workers=self.size) as executor:
+            futures = {name: executor.submit(run_job, name, job) for name, job in jobs.items()}
+            return {name: future.result() for name, future in futures.items()}
+
+    def close(self):
+        self._closed = True
+        with self._lock:
+            drivers, self._drivers = self._drivers, []
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class PoolRenderer:
+    """Renders pages for BaseScraper's browser escalation (async render(url, museum) -> html)
+
+    The pool is started on the first render, so runs where every page works
+    over plain HTTP never launch Chrome.
+    """
+
+    def __init__(self, size: int = 2, factory: Optional[Callable[[], Any]] = None,
+                 timeout: float = 15, rate_limiter=None, config: Optional[Dict[str, Any]] = None):
+        self.size = size
+        self.factory = factory
+        self.timeout = timeout
+        # Optional RateLimiter that page loads wait on, like any other fetch
+        self.rate_limiter = rate_limiter
+        # Loaded config for the resource blocking policies (loaded on first render if None)
+        self.config = config
+        self._policies = None
+        self._pool = None
+        self._executor = None
+        self._lock = threading.Lock()
+        self.unavailable = False
+
+    def _ensure_pool(self) -> BrowserPool:
+        with self._lock:
+            if self._pool is None:
+                self._pool = BrowserPool(self.size, self.factory)
+        return self._pool
+
+    def render_sync(self, url: str, museum: Optional[str] = None) -> Optional[str]:
+        from browser_waits import wait_until_ready
+        from resource_blocking import Policies, block_with_cdp
+
+        pool = self._ensure_pool()
+        with self._lock:
+            if self._policies is None:
+                self._policies = Policies(self.config)
+        if self.rate_limiter:
+            # Wait for the host's turn before holding a browser
+            self.rate_limiter.wait(url)
+        try:
+            driver = pool.acquire()
+        except Exception as e:
+            # No Chrome here; stop trying for the rest of the run
+            self.unavailable = True
+            print(f"⚠️ Headless browser unavailable, pages stay static: {e}")
+            return None
+        try:
+            # Drivers are shared between museums, so every page sets its own policy
+            block_with_cdp(driver, self._policies(museum))
+            driver.get(url)
+            wait_until_ready(driver, timeout=self.timeout)
+            return driver.page_source
+        finally:
+            pool.release(driver)
+
+    async def render(self, url: str, museum: Optional[str] = None) -> Optional[str]:
+        import asyncio
+
+        if self.unavailable:
+            return None
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.size)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self.render_sync, url, museum)
+
+    def close(self):
+        if self._executor:
+            self._executor.shutdown()
+        if self._pool:
+            self._pool.close()
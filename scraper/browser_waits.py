@@ -0,0 +1,106 @@
+"""
+Condition-driven waits for the Selenium scrapers
+Each wait returns as soon as its condition holds (target selectors present,
+DOM no longer mutating, no new network requests) and gives up at a hard cap,
+so a page costs only as long as it takes to render instead of a fixed sleep.
+All waits return True if the condition was met and False on timeout.
+"""
+
+import time
+from typing import Callable, Iterable, Optional
+
+DEFAULT_TIMEOUT = 10
+POLL_INTERVAL = 0.1
+
+# Installs a MutationObserver once per document and reports ms since the last mutation
+_MUTATION_AGE = """
+if (!window.__lastMutation) {
+    window.__lastMutation = performance.now();
+    new MutationObserver(function () { window.__lastMutation = performance.now(); })
+        .observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+}
+return performance.now() - window.__lastMutation;
+"""
+
+_ANY_SELECTOR = """
+return arguments[0].some(function (s) { return document.querySelector(s) !== null; });
+"""
+
+_RESOURCE_COUNT = "return performance.getEntriesByType('resource').length;"
+
+
+def poll(condition: Callable[[], bool], timeout: float = DEFAULT_TIMEOUT,
+         interval: float = POLL_INTERVAL) -> bool:
+    """Call condition until it is truthy or timeout seconds have passed"""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            if condition():
+                return True
+        except Exception:
+            # Navigation in progress or a detached document; try again
+            pass
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        time.sleep(min(interval, remaining))
+
+
+def wait_for_load(driver, timeout: float = DEFAULT_TIMEOUT) -> bool:
+    return poll(lambda: driver.execute_script("return document.readyState") == 'complete', timeout)
+
+
+def wait_for_selectors(driver, selectors: Iterable[str], timeout: float = DEFAULT_TIMEOUT) -> bool:
+    """Wait until any of the CSS selectors matches an element"""
+    selectors = list(selectors)
+    return poll(lambda: driver.execute_script(_ANY_SELECTOR, selectors), timeout)
+
+
+def wait_for_dom_stable(driver, quiet: float = 0.5, timeout: float = DEFAULT_TIMEOUT) -> bool:
+    """Wait until the DOM has not changed for quiet seconds"""
+    return poll(lambda: driver.execute_script(_MUTATION_AGE) >= quiet * 1000, timeout)
+
+
+def wait_for_network_idle(driver, quiet: float = 0.5, timeout: float = DEFAULT_TIMEOUT) -> bool:
+    """Wait until the page has started no new requests for quiet seconds"""
+    state = {'count': -1, 'since': time.monotonic()}
+
+    def idle():
+        count = driver.execute_script(_RESOURCE_COUNT)
+        now = time.monotonic()
+        if count != state['count']:
+            state['count'], state['since'] = count, now
+        return now - state['since'] >= quiet
+
+    return poll(idle, timeout)
+
+
+def wait_until_ready(driver, selectors: Optional[Iterable[str]] = None,
+                     timeout: float = DEFAULT_TIMEOUT, quiet: float = 0.5) -> bool:
+    """Document loaded, then the selectors (if any) present, then the DOM settled,
+    all within one overall timeout"""
+    deadline = time.monotonic() + timeout
+
+    def remaining():
+        return max(0.0, deadline - time.monotonic())
+
+    if not wait_for_load(driver, remaining()):
+        return False
+    if selectors and not wait_for_selectors(driver, selectors, remaining()):
+        return False
+    return wait_for_dom_stable(driver, quiet, remaining())
+
+
+def scroll_to_end(driver, settle: float = 2.0, max_rounds: int = 20) -> int:
+    """Scroll until the page stops growing; each round waits at most settle
+    seconds for new content. Returns the number of rounds that loaded more."""
+    height = driver.execute_script("return document.body.scrollHeight")
+    for rounds in range(max_rounds):
+        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+        grew = poll(lambda: driver.execute_script("return document.body.scrollHeight") > height,
+                    settle)
+        if not grew:
+            return rounds
+        wait_for_dom_stable(driver, timeout=settle)
+        height = driver.execute_script("return document.body.scrollHeight")
+    return max_rounds
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Compare HTML parser engines over recorded museum pages
+Times every scraper's parse_events with each engine and checks the events
+are identical to the html.parser baseline
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from urllib.parse import urlparse
+
+from config import load_config
+from museums.parsing import available_engines
+from museums.registry import scraper_classes
+
+SCRAPER_CLASSES = scraper_classes()
+
+
+def scrapers_by_host():
+    """Map each museum host to a scraper instance (no session needed to parse)"""
+    hosts = {}
+    for scraper_class in SCRAPER_CLASSES:
+        scraper = scraper_class(None)
+        for url in scraper.get_urls():
+            hosts[urlparse(url).netloc] = scraper
+    return hosts
+
+
+def load_recorded_pages(cache_dir):
+    """Yield (url, html) for every page stored in the HTTP cache"""
+    if not os.path.isdir(cache_dir):
+        return
+    for name in sorted(os.listdir(cache_dir)):
+        if not name.endswith('.json'):
+            continue
+        meta_path = os.path.join(cache_dir, name)
+        body_path = meta_path[:-len('.json')] + '.body'
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            with open(body_path, 'r', encoding='utf-8') as f:
+                yield meta['url'], f.read()
+        except (OSError, ValueError, KeyError):
+            continue
+
+
+def compare_engines(pages, engines, repeat=3):
+    """Return per-engine timings and whether its events match html.parser"""
+    hosts = scrapers_by_host()
+    results = {engine: {'seconds': 0.0, 'pages': 0, 'events': 0, 'identical': True}
+               for engine in engines}
+
+    for url, html in pages:
+        scraper = hosts.get(urlparse(url).netloc)
+        if not scraper:
+            continue
+
+        scraper.parser_engine = 'html.parser'
+        baseline = asyncio.run(scraper.parse_events(html, url))
+
+        for engine in engines:
+            scraper.parser_engine = engine
+            start = time.perf_counter()
+            for _ in range(repeat):
+                events = asyncio.run(scraper.parse_events(html, url))
+            elapsed = (time.perf_counter() - start) / repeat
+
+            result = results[engine]
+            result['seconds'] += elapsed
+            result['pages'] += 1
+            result['events'] += len(events)
+            if events != baseline:
+                result['identical'] = False
+                print(f"  {engine}: events differ from html.parser on {url}")
+
+    return results
+
+
+def main():
+    config = load_config()
+    parser = argparse.ArgumentParser(description='Compare parser engines over recorded pages')
+    parser.add_argument('--pages', default=config['http_cache']['dir'],
+                       help='Directory of recorded pages (defaults to the HTTP cache)')
+    parser.add_argument('--repeat', type=int, default=3,
+                       help='Parses per page per engine')
+    args = parser.parse_args()
+
+    engines = available_engines()
+    print(f"Comparing engines {engines} over pages in {args.pages}")
+    results = compare_engines(load_recorded_pages(args.pages), engines, args.repeat)
+
+    print(f"\n{'engine':<12} {'pages':>6} {'events':>7} {'ms/page':>9}  identical")
+    for engine, result in results.items():
+        per_page = result['seconds'] / result['pages'] * 1000 if result['pages'] else 0
+        print(f"{engine:<12} {result['pages']:>6} {result['events']:>7} {per_page:>9.2f}  {result['identical']}")
+
+    candidates = [(r['seconds'], e) for e, r in results.items() if r['identical'] and r['pages']]
+    if candidates:
+        print(f"\nFastest engine with identical events: {min(candidates)[1]}")
+    else:
+        print("\nNo recorded pages to compare; run scraper.py first to fill the cache")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,10 +3,12 @@ import json
 import os
 from datetime import datetime
 import re
+from museums import dates, times
+from museums.event import EventTable
 
 class CSVToEvents:
     def __init__(self):
-        self.events = []
+        self.events = EventTable()
         # Get the correct paths
         self.script_dir = os.path.dirname(os.path.abspath(__file__))
         self.root_dir = os.path.dirname(self.script_dir)
@@ -26,25 +28,8 @@ class CSVToEvents:
         """Parse various date formats"""
         if not date_str:
             return None
-            
-        # Try different date formats
-        date_formats = [
-            '%Y-%m-%d',
-            '%m/%d/%Y',
-            '%d/%m/%Y',
-            '%B %d, %Y',
-            '%b %d, %Y',
-            '%Y-%m-%d %H:%M:%S'
-        ]
-        
-        for fmt in date_formats:
-            try:
-                return datetime.strptime(date_str.strip(), fmt).strftime('%Y-%m-%d')
-            except ValueError:
-                continue
-        
         # If no format matches, return the original string
-        return date_str
+        return dates.parse_date(date_str) or date_str
     
     def generate_event_id(self, event):
         """Generate unique ID for event"""
@@ -89,6 +74,8 @@ class CSVToEvents:
                             ''),
                         'date': self.parse_date(row.get('date', row.get('Date', row.get('event_date', '')))),
                         'time': self.clean_text(row.get('time', row.get('Time', row.get('event_time', '')))),
+                        'start_time': None,
+                        'end_time': None,
                         'location': self.clean_text(row.get('location', row.get('Location', row.get('venue', '')))),
                         'museum': museum_id,
                         'museumName': museum_name,
@@ -113,6 +100,11 @@ class CSVToEvents:
                         'data_source': 'csv'
                     }
 
+                    # Keep the display time as written; add 24h start/end alongside it
+                    parsed_time = times.parse_time_range(event['time'])
+                    if parsed_time:
+                        event['start_time'], event['end_time'] = parsed_time.start_time, parsed_time.end_time
+
                     # Normalize specific type values
                     if event['type'].lower() == 'films':
                         event['type'] = 'Film'
@@ -184,17 +176,11 @@ class CSVToEvents:
         os.makedirs(self.data_dir, exist_ok=True)
         
         # Remove duplicates
-        unique_events = []
-        seen_ids = set()
-        
-        for event in self.events:
-            event_id = event.get('id')
-            if event_id and event_id not in seen_ids:
-                seen_ids.add(event_id)
-                unique_events.append(event)
+        self.events.dedupe('id')
         
         # Sort by date
-        unique_events.sort(key=lambda x: x.get('date', ''))
+        self.events.sort_by('date')
+        unique_events = self.events.to_dicts()
         
         # Save to file
         output = {
@@ -0,0 +1,66 @@
+"""
+Single-round-trip extraction of listing tiles from a Selenium page
+Every find_element / .text call is a WebDriver HTTP round trip, so reading
+a few fields from 20 tiles costs dozens of them. A selector spec instead
+describes the tiles once and one execute_script call returns every tile's
+fields:
+
+    MOMA_TILES = {
+        'item': '.calendar-tile',
+        'fields': {
+            'title': '.calendar-tile__title',               # innerText
+            'url': {'selector': 'a', 'attr': 'href'},       # attribute
+        },
+        'required': ['title'],   # tiles missing these are dropped (default: all fields)
+    }
+
+    extract(driver, MOMA_TILES, limit=20) -> [{'title': ..., 'url': ...}, ...]
+"""
+
+from typing import Any, Dict, List, Optional
+
+_EXTRACT = """
+var spec = arguments[0], limit = arguments[1], results = [];
+var items = document.querySelectorAll(spec.item);
+for (var i = 0; i < items.length && (limit === null || results.length < limit); i++) {
+    var item = items[i], row = {}, complete = true;
+    for (var name in spec.fields) {
+        var field = spec.fields[name];
+        var el = field.selector ? item.querySelector(field.selector) : item;
+        var value = null;
+        if (el) {
+            value = field.attr ? el.getAttribute(field.attr) : el.innerText;
+        }
+        if (value !== null && !field.attr) {
+            value = value.trim();
+        }
+        if ((value === null || value === '') && spec.required.indexOf(name) >= 0) {
+            complete = false;
+            break;
+        }
+        row[name] = value;
+    }
+    if (complete) {
+        results.push(row);
+    }
+}
+return results;
+"""
+
+
+def _normalize(spec: Dict[str, Any]) -> Dict[str, Any]:
+    fields = {}
+    for name, field in spec['fields'].items():
+        if isinstance(field, str):
+            field = {'selector': field}
+        fields[name] = {'selector': field.get('selector') or '', 'attr': field.get('attr')}
+    return {
+        'item': spec['item'],
+        'fields': fields,
+        'required': list(spec.get('required', fields)),
+    }
+
+
+def extract(driver, spec: Dict[str, Any], limit: Optional[int] = None) -> List[Dict[str, Optional[str]]]:
+    """Fields of every tile matching spec['item'], read in one execute_script call"""
+    return driver.execute_script(_EXTRACT, _normalize(spec), limit) or []
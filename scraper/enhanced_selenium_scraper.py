@@ -8,15 +8,30 @@ import undetected_chromedriver as uc
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-import time
 import random
 from datetime import datetime
 import os
+from browser_waits import wait_for_dom_stable, wait_until_ready
+from config import load_config
+from dom_extract import extract
+from museums import dates
+from museums.rate_limit import shared_limiter
+from resource_blocking import block_with_cdp, policy_for
+
+MOMA_TILES = {
+    'item': '.calendar-tile, .event-item',
+    'fields': {
+        'title': 'h3, h4, .title',
+        'date': 'time, .date',
+    },
+}
 
 class EnhancedSeleniumScraper:
-    def __init__(self):
+    def __init__(self, rate_limiter=None):
         self.events = []
         self.driver = None
+        # Per-host request rate, shared with every other scraper in the process
+        self.rate_limiter = rate_limiter or shared_limiter(load_config()['rate_limit'])
         
     def setup_driver(self):
         """Setup undetected Chrome driver"""
@@ -56,19 +71,21 @@ class EnhancedSeleniumScraper:
         scroll_amount = random.randint(100, 300)
         self.driver.execute_script(f"window.scrollBy(0, {scroll_amount});")
         
-        # Random delay
-        time.sleep(random.uniform(0.5, 2))
+        # Let anything the scroll triggered finish rendering
+        wait_for_dom_stable(self.driver, timeout=2)
         
     def scrape_moma_selenium(self):
         """Scrape MoMA with Selenium"""
         url = "https://www.moma.org/calendar/"
         
         try:
+            block_with_cdp(self.driver, policy_for('moma'))
+            self.rate_limiter.wait(url)
             self.driver.get(url)
-            self.human_like_behavior()
             
-            # Wait for initial load
-            time.sleep(3)
+            # Wait for the event tiles instead of a fixed delay
+            wait_until_ready(self.driver, ['.calendar-tile', '.event-item'])
+            self.human_like_behavior()
             
             # Try to click "Load More" button if it exists
             try:
@@ -76,40 +93,27 @@ class EnhancedSeleniumScraper:
                     EC.element_to_be_clickable((By.XPATH, "//button[contains(text(), 'Load More')]"))
                 )
                 self.driver.execute_script("arguments[0].click();", load_more)
-                time.sleep(2)
+                wait_for_dom_stable(self.driver, timeout=5)
             except:
                 pass
             
-            # Get page source and parse
-            page_source = self.driver.page_source
-            # Parse with BeautifulSoup or extract directly
-            
-            # Example: Extract using Selenium
-            events = self.driver.find_elements(By.CSS_SELECTOR, ".calendar-tile, .event-item")
-            
-            for event in events[:20]:
-                try:
-                    title = event.find_element(By.CSS_SELECTOR, "h3, h4, .title").text
-                    date_elem = event.find_element(By.CSS_SELECTOR, "time, .date")
-                    
-                    event_data = {
-                        'id': f"moma-selenium-{len(self.events)}",
-                        'museum': 'moma',
-                        'museumName': 'MoMA',
-                        'title': title,
-                        'date': self.parse_date(date_elem.text),
-                        'time': 'See website for time',
-                        'description': '',
-                        'type': 'Special Event',
-                        'location': 'MoMA, 11 West 53rd Street, New York, NY',
-                        'url': url
-                    }
-                    
-                    if event_data['date']:
-                        self.events.append(event_data)
-                        
-                except:
-                    continue
+            # One script call reads every tile
+            for tile in extract(self.driver, MOMA_TILES, limit=20):
+                event_data = {
+                    'id': f"moma-selenium-{len(self.events)}",
+                    'museum': 'moma',
+                    'museumName': 'MoMA',
+                    'title': tile['title'],
+                    'date': self.parse_date(tile['date']),
+                    'time': 'See website for time',
+                    'description': '',
+                    'type': 'Special Event',
+                    'location': 'MoMA, 11 West 53rd Street, New York, NY',
+                    'url': url
+                }
+                
+                if event_data['date']:
+                    self.events.append(event_data)
                     
         except Exception as e:
             print(f"MoMA Selenium error: {e}")
@@ -132,9 +136,6 @@ class EnhancedSeleniumScraper:
                     print(f"✓ Got {len(self.events)} events from {museum_name}")
                 except Exception as e:
                     print(f"✗ {museum_name} failed: {e}")
-                    
-                # Delay between museums
-                time.sleep(random.uniform(5, 10))
                 
         finally:
             if self.driver:
@@ -144,5 +145,4 @@ class EnhancedSeleniumScraper:
     
     def parse_date(self, date_string):
         """Parse date to YYYY-MM-DD format"""
-        # Implementation from previous scrapers
-        return None
+        return dates.parse_date(date_string)
@@ -10,6 +10,8 @@ from datetime import datetime
 import subprocess
 import sys
 
+from museums.event import to_dicts
+
 
 class HybridEventsScraper:
     def __init__(self):
@@ -116,7 +118,7 @@ class HybridEventsScraper:
         # Create output
         output = {
             'last_updated': datetime.now().isoformat(),
-            'events': self.all_events,
+            'events': to_dicts(self.all_events),
             'sources': {
                 'csv_count': len(self.csv_events),
                 'scraped_count': len(self.scraped_events),
@@ -1,12 +1,12 @@
 import json
 import os
 from datetime import datetime
-from museum_specific_scrapers import MuseumSpecificScrapers
-from csv_to_events import CSVToEvents
+from museums.event import EventTable
 
 class IntegratedScraper:
     def __init__(self):
-        self.events = []
+        # Columnar: merged histories can hold many thousands of events
+        self.events = EventTable()
         self.script_dir = os.path.dirname(os.path.abspath(__file__))
         self.root_dir = os.path.dirname(self.script_dir)
         self.data_dir = os.path.join(self.root_dir, 'data')
@@ -63,9 +63,9 @@ class IntegratedScraper:
         self.load_museum_events()
         
         # Ensure all events have IDs
-        for event in self.events:
-            if not event.get('id'):
-                event['id'] = self.generate_event_id(event)
+        for index, event_id in enumerate(self.events.values('id')):
+            if not event_id:
+                self.events.set_value(index, 'id', self.generate_event_id(self.events[index]))
         
         print(f"\n📊 Total events collected: {len(self.events)}")
     
@@ -80,17 +80,11 @@ class IntegratedScraper:
         os.makedirs(data_dir, exist_ok=True)
         
         # Remove duplicates
-        unique_events = []
-        seen_ids = set()
-        
-        for event in self.events:
-            event_id = event.get('id')
-            if event_id and event_id not in seen_ids:
-                seen_ids.add(event_id)
-                unique_events.append(event)
+        self.events.dedupe('id')
         
         # Sort by date
-        unique_events.sort(key=lambda x: x.get('date', ''))
+        self.events.sort_by('date')
+        unique_events = self.events.to_dicts()
         
         # Save to file
         output = {
@@ -99,7 +93,7 @@ class IntegratedScraper:
             'metadata': {
                 'total_events': len(unique_events),
                 'scraping_method': 'integrated',
-                'museums_scraped': list(set(e.get('museum', '') for e in unique_events if e.get('museum')))
+                'museums_scraped': list(set(museum for museum in self.events.values('museum') if museum))
             }
         }
         
@@ -4,36 +4,179 @@ import os
 import sys
 import argparse
 from datetime import datetime
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 import time
 import re
+from browser_pool import BrowserPool, chrome_driver
+from browser_waits import wait_until_ready
+from config import load_config
+from dom_extract import extract
+from museums.archive import FetchArchive, RECORD, REPLAY, archive_from_env
+from museums.rate_limit import shared_limiter
+from museums.retry import RetryPolicy
+from resource_blocking import block_with_cdp, policy_for
+from xhr_capture import (best_capture, capture_json_responses, endpoint_store,
+                         events_from_json, fetch_endpoint)
+
+# --museum key -> scraper method
+SCRAPE_METHODS = {
+    'moma': 'scrape_moma',
+    'met': 'scrape_met',
+    'nyu-ifa': 'scrape_nyu_ifa',
+    'national-arts-club': 'scrape_national_arts_club',
+    'explorers-club': 'scrape_explorers_club',
+    'womens-history': 'scrape_womens_history',
+    'asia-society': 'scrape_asia_society',
+}
+
+# Display name and location written on every event, whichever path found it
+MUSEUM_DETAILS = {
+    'moma': ('MoMA', 'Museum of Modern Art, New York'),
+    'met': ('The Met', 'The Met Fifth Avenue, 1000 Fifth Avenue, New York, NY'),
+    'nyu-ifa': ('NYU Institute of Fine Arts', 'NYU Institute of Fine Arts, 1 East 78th Street, New York, NY'),
+    'national-arts-club': ('National Arts Club', 'National Arts Club, 15 Gramercy Park South, New York, NY'),
+    'explorers-club': ('The Explorers Club', 'The Explorers Club, 46 East 70th Street, New York, NY'),
+    'womens-history': ("Center for Women's History", 'New-York Historical Society, 170 Central Park West, New York, NY'),
+    'asia-society': ('Asia Society', 'Asia Society Museum, 725 Park Avenue, New York, NY'),
+}
+
+# The registry id (museums/registry.py) each museum's config is keyed by
+REGISTRY_IDS = {
+    'nyu-ifa': 'nyu',
+    'national-arts-club': 'arts',
+    'explorers-club': 'explorers',
+    'womens-history': 'womens',
+    'asia-society': 'asia',
+}
+
+MOMA_TILES = {
+    'item': '.calendar-tile',
+    'fields': {
+        'title': '.calendar-tile__title',
+        'date': '.calendar-tile__date',
+    },
+}
 
 class MuseumSpecificScrapers:
-    def __init__(self):
+    def __init__(self, archive=None, driver=None, rate_limiter=None, config=None, endpoints=None,
+                 retry_policy=None):
         self.events = []
+        self.config = config or load_config()
+        # Record rendered pages to, or replay them from, an archive
+        self.archive = archive or archive_from_env()
+        # Per-host request rate, shared with every other scraper in the process
+        self.rate_limiter = rate_limiter or shared_limiter(self.config['rate_limit'])
+        # Retries for plain HTTP endpoint fetches
+        self.retry_policy = retry_policy or RetryPolicy.from_config(self.config['retry'])
+        # JSON endpoints discovered while rendering, and responses captured so far
+        self.xhr_settings = self.config['xhr_capture']
+        self.endpoints = endpoints or endpoint_store(self.xhr_settings)
+        self.captured = []
         # Get the correct paths
         self.script_dir = os.path.dirname(os.path.abspath(__file__))
         self.root_dir = os.path.dirname(self.script_dir)
         self.data_dir = os.path.join(self.root_dir, 'data')
-        self.setup_driver()
+        # A driver lent by a BrowserPool belongs to the pool, not to us; our
+        # own is started on first use, so endpoint-only runs never launch Chrome
+        self.owns_driver = driver is None
+        self._driver = driver
+        
+    @property
+    def driver(self):
+        if self._driver is None:
+            self.setup_driver()
+        return self._driver
+    
+    @property
+    def wait(self):
+        return WebDriverWait(self.driver, 10)
         
     def setup_driver(self):
         """Setup Chrome driver with options"""
-        options = Options()
-        options.add_argument('--headless')
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        options.add_argument('--disable-gpu')
-        options.add_argument('--window-size=1920,1080')
-        options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36')
-        
-        self.driver = webdriver.Chrome(options=options)
-        self.wait = WebDriverWait(self.driver, 10)
+        self._driver = chrome_driver(capture_network=self.xhr_settings['enabled'])
+    
+    def scrape_museum(self, museum):
+        """Scrape one museum from its stored JSON endpoint, or else in the browser"""
+        if not self.scrape_from_endpoint(museum):
+            self.scrape_in_browser(museum)
+    
+    def scrape_in_browser(self, museum):
+        """Render the museum's pages, preferring any JSON they load over the DOM"""
+        self.block_resources(museum)
+        getattr(self, SCRAPE_METHODS[museum])()
+        self.use_captured_json(museum)
+    
+    def add_json_events(self, events):
+        for event in events:
+            event['id'] = self.generate_event_id(event)
+            self.events.append(event)
+    
+    def scrape_from_endpoint(self, museum):
+        """Fetch the museum's stored endpoint over plain HTTP; False if there is
+        none (or it stopped returning events) and the browser is needed"""
+        entry = self.endpoints.get(museum)
+        # Archived runs stay on the recorded pages
+        if not entry or not self.xhr_settings['enabled'] or self.archive:
+            return False
+        status, payload = fetch_endpoint(entry['url'], retry_policy=self.retry_policy,
+                                         rate_limiter=self.rate_limiter)
+        if payload is None:
+            # A blip, rate limit or outage says nothing about the endpoint;
+            # keep it for the next run
+            print(f"⚠️ Stored endpoint for {museum} unavailable ({status or 'no response'}), using the browser")
+            return False
+        events = events_from_json(payload, *MUSEUM_DETAILS[museum])
+        if len(events) < self.xhr_settings['min_events']:
+            print(f"⚠️ Stored endpoint for {museum} returned {len(events)} events, using the browser")
+            self.endpoints.forget(museum)
+            return False
+        self.add_json_events(events)
+        self.endpoints.record(museum, entry['url'], payload, len(events))
+        print(f"✅ Fetched {len(events)} events for {museum} from {entry['url']} (no browser)")
+        return True
+    
+    def use_captured_json(self, museum):
+        """Replace DOM-scraped events with those of the best JSON response the
+        pages loaded, and remember its endpoint for the next run"""
+        captured, self.captured = self.captured, []
+        response, events = best_capture(captured, *MUSEUM_DETAILS[museum])
+        if len(events) < self.xhr_settings['min_events']:
+            return False
+        self.events = []
+        self.add_json_events(events)
+        self.endpoints.record(museum, response['url'], response['payload'], len(events))
+        print(f"✅ Parsed {len(events)} events for {museum} from JSON at {response['url']}")
+        return True
+    
+    def block_resources(self, museum):
+        """Stop the browser fetching what this museum's pages do not need"""
+        block_with_cdp(self.driver, policy_for(REGISTRY_IDS.get(museum, museum), self.config))
+    
+    def load_page(self, url, selectors=None):
+        """Open url in the browser, recording or replaying the rendered HTML;
+        waits until selectors (if given) appear and the page settles"""
+        if self.archive and self.archive.replaying:
+            entry = self.archive.lookup(url)
+            html = entry['body'] if entry else ''
+            if not entry:
+                print(f"Not in archive: {url}")
+            self.driver.get('about:blank')
+            self.driver.execute_script(
+                "document.open(); document.write(arguments[0]); document.close();", html)
+            return
+            
+        self.rate_limiter.wait(url)
+        start = time.perf_counter()
+        self.driver.get(url)
+        if not wait_until_ready(self.driver, selectors):
+            print(f"⚠️ {url} not ready before the wait cap, using what has rendered")
+        self.captured.extend(capture_json_responses(self.driver))
+        if self.archive:
+            self.archive.record(url, 200, {}, self.driver.page_source,
+                                time.perf_counter() - start)
     
     def clean_text(self, text):
         """Clean and normalize text"""
@@ -56,32 +199,23 @@ class MuseumSpecificScrapers:
         """Scrape MoMA events"""
         print("Scraping MoMA...")
         try:
-            self.driver.get("https://www.moma.org/calendar/")
-            time.sleep(3)
+            self.load_page("https://www.moma.org/calendar/", selectors=['.calendar-tile'])
             
             # Wait for events to load
             self.wait.until(EC.presence_of_element_located((By.CLASS_NAME, "calendar-tile")))
             
-            events = self.driver.find_elements(By.CLASS_NAME, "calendar-tile")
-            
-            for event in events[:20]:  # Limit to 20 events
-                try:
-                    title = event.find_element(By.CLASS_NAME, "calendar-tile__title").text
-                    date = event.find_element(By.CLASS_NAME, "calendar-tile__date").text
-                    
-                    event_data = {
-                        'title': self.clean_text(title),
-                        'date': date,
-                        'museum': 'MoMA',
-                        'location': 'Museum of Modern Art, New York',
-                        'data_source': 'web_scraper'
-                    }
-                    
-                    event_data['id'] = self.generate_event_id(event_data)
-                    self.events.append(event_data)
-                    
-                except Exception as e:
-                    continue
+            # One script call reads every tile
+            for tile in extract(self.driver, MOMA_TILES, limit=20):  # Limit to 20 events
+                event_data = {
+                    'title': self.clean_text(tile['title']),
+                    'date': tile['date'],
+                    'museum': MUSEUM_DETAILS['moma'][0],
+                    'location': MUSEUM_DETAILS['moma'][1],
+                    'data_source': 'web_scraper'
+                }
+                
+                event_data['id'] = self.generate_event_id(event_data)
+                self.events.append(event_data)
                     
             print(f"✅ Scraped {len(self.events)} events from MoMA")
             
@@ -92,8 +226,7 @@ class MuseumSpecificScrapers:
         """Scrape The Met events"""
         print("Scraping The Met...")
         try:
-            self.driver.get("https://www.metmuseum.org/events/whats-on")
-            time.sleep(3)
+            self.load_page("https://www.metmuseum.org/events/whats-on")
             
             # Add Met-specific scraping logic here
             # This is a placeholder - you'll need to inspect their actual page structure
@@ -107,8 +240,7 @@ class MuseumSpecificScrapers:
         """Scrape NYU Institute of Fine Arts events"""
         print("Scraping NYU IFA...")
         try:
-            self.driver.get("https://ifa.nyu.edu/events/")
-            time.sleep(3)
+            self.load_page("https://ifa.nyu.edu/events/")
             
             # Add NYU IFA-specific scraping logic here
             
@@ -121,8 +253,7 @@ class MuseumSpecificScrapers:
         """Scrape National Arts Club events"""
         print("Scraping National Arts Club...")
         try:
-            self.driver.get("https://www.nationalartsclub.org/events")
-            time.sleep(3)
+            self.load_page("https://www.nationalartsclub.org/events")
             
             # Add National Arts Club-specific scraping logic here
             
@@ -135,8 +266,7 @@ class MuseumSpecificScrapers:
         """Scrape The Explorers Club events"""
         print("Scraping The Explorers Club...")
         try:
-            self.driver.get("https://www.explorers.org/events/")
-            time.sleep(3)
+            self.load_page("https://www.explorers.org/events/")
             
             # Add Explorers Club-specific scraping logic here
             
@@ -149,8 +279,7 @@ class MuseumSpecificScrapers:
         """Scrape Center for Women's History events"""
         print("Scraping Center for Women's History...")
         try:
-            self.driver.get("https://www.nyhistory.org/womens-history")
-            time.sleep(3)
+            self.load_page("https://www.nyhistory.org/womens-history")
             
             # Add Women's History-specific scraping logic here
             
@@ -163,8 +292,7 @@ class MuseumSpecificScrapers:
         """Scrape Asia Society events"""
         print("Scraping Asia Society...")
         try:
-            self.driver.get("https://asiasociety.org/new-york/events")
-            time.sleep(3)
+            self.load_page("https://asiasociety.org/new-york/events")
             
             # Add Asia Society-specific scraping logic here
             
@@ -224,45 +352,90 @@ class MuseumSpecificScrapers:
                 json.dump(data, f, indent=2, ensure_ascii=False)
     
     def close(self):
-        """Close the driver"""
-        if hasattr(self, 'driver'):
-            self.driver.quit()
+        """Close the driver, unless it was lent by a pool"""
+        if self.owns_driver and self._driver is not None:
+            self._driver.quit()
+
+
+def scrape_all(browsers=3, archive=None, rate_limiter=None, config=None):
+    """Scrape every museum, through stored JSON endpoints where they still work
+    and the pool's warm browsers for the rest; {museum: scraper}"""
+    config = config or load_config()
+    rate_limiter = rate_limiter or shared_limiter(config['rate_limit'])
+    # One policy, and so one retry budget, for every museum
+    retry_policy = RetryPolicy.from_config(config['retry'])
+    endpoints = endpoint_store(config['xhr_capture'])
+
+    def new_scraper(driver=None):
+        return MuseumSpecificScrapers(archive=archive, driver=driver, rate_limiter=rate_limiter,
+                                      config=config, endpoints=endpoints, retry_policy=retry_policy)
+
+    results, pending = {}, []
+    for museum in SCRAPE_METHODS:
+        scraper = new_scraper()
+        if scraper.scrape_from_endpoint(museum):
+            results[museum] = scraper
+        else:
+            pending.append(museum)
+    if not pending:
+        return results
+
+    def job(museum):
+        def run(driver):
+            scraper = new_scraper(driver)
+            scraper.scrape_in_browser(museum)
+            return scraper
+        return run
+
+    capture = config['xhr_capture']['enabled']
+    with BrowserPool(size=min(browsers, len(pending)),
+                     factory=lambda: chrome_driver(capture_network=capture)) as pool:
+        results.update(pool.run({museum: job(museum) for museum in pending}))
+    # Keep the usual museum order for saving
+    return {museum: results.get(museum) for museum in SCRAPE_METHODS}
 
 def main():
     """Main function"""
+    config = load_config()
     parser = argparse.ArgumentParser(description='Scrape museum events')
     parser.add_argument('--museum', type=str, required=True, 
-                       help='Museum to scrape (moma, met, nyu-ifa, etc.)')
+                       help='Museum to scrape (moma, met, nyu-ifa, etc.), or "all"')
+    parser.add_argument('--browsers', type=int, default=config['browser_pool_size'],
+                       help='Warm Chrome instances shared by --museum all')
+    parser.add_argument('--record', metavar='ARCHIVE',
+                       help='Record rendered pages to a .jsonl.gz archive')
+    parser.add_argument('--replay', metavar='ARCHIVE',
+                       help='Load rendered pages from a recorded archive instead of the sites')
     
     args = parser.parse_args()
     museum = args.museum.lower()
     
+    if museum != 'all' and museum not in SCRAPE_METHODS:
+        print(f"❌ Unknown museum: {museum}")
+        sys.exit(1)
+    
     print(f"Starting scraper for {museum}...")
     print(f"Working directory: {os.getcwd()}")
     
-    scraper = MuseumSpecificScrapers()
+    archive = None
+    if args.replay:
+        archive = FetchArchive(args.replay, REPLAY)
+    elif args.record:
+        archive = FetchArchive(args.record, RECORD)
     
-    try:
-        # Map museum names to scraper methods
-        scrapers = {
-            'moma': scraper.scrape_moma,
-            'met': scraper.scrape_met,
-            'nyu-ifa': scraper.scrape_nyu_ifa,
-            'national-arts-club': scraper.scrape_national_arts_club,
-            'explorers-club': scraper.scrape_explorers_club,
-            'womens-history': scraper.scrape_womens_history,
-            'asia-society': scraper.scrape_asia_society
-        }
-        
-        if museum in scrapers:
-            scrapers[museum]()
+    if museum == 'all':
+        results = scrape_all(browsers=args.browsers, archive=archive, config=config)
+        # Saved one at a time: every save also merges into events.json
+        for name, scraper in results.items():
+            if scraper:
+                scraper.save_events(name)
+    else:
+        scraper = MuseumSpecificScrapers(archive=archive, config=config)
+        try:
+            scraper.scrape_museum(museum)
             scraper.save_events(museum)
-        else:
-            print(f"❌ Unknown museum: {museum}")
-            sys.exit(1)
-            
-    finally:
-        scraper.close()
+        finally:
+            scraper.close()
     
     print(f"\nScraping complete for {museum}!")
 
@@ -0,0 +1,93 @@
+"""
+Record/replay archive of HTTP exchanges for offline, deterministic runs
+
+An archive is a gzip-compressed JSON-lines file; each line holds one
+exchange (method, URL, status, headers, body, timing). In record mode every
+fetch is appended; in replay mode fetches are served from the archive and
+the network is never touched.
+"""
+
+import gzip
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+RECORD = 'record'
+REPLAY = 'replay'
+
+
+class FetchArchive:
+    def __init__(self, path: str, mode: str):
+        if mode not in (RECORD, REPLAY):
+            raise ValueError(f"Unknown archive mode: {mode}")
+        self.path = path
+        self.mode = mode
+        self.entries: Dict[tuple, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        if mode == REPLAY:
+            self._load()
+        elif os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == RECORD
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == REPLAY
+
+    def _load(self):
+        with gzip.open(self.path, 'rt', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    # Later recordings of the same URL win
+                    self.entries[(entry['method'], entry['url'])] = entry
+        print(f"Replaying {len(self.entries)} recorded responses from {self.path}")
+
+    def record(self, url: str, status: int, headers, body: str,
+               elapsed: float, method: str = 'GET', encoding: str = 'utf-8'):
+        """Append one exchange to the archive"""
+        entry = {
+            'method': method,
+            'url': url,
+            'status': status,
+            'headers': dict(headers or {}),
+            'encoding': encoding,
+            'body': body,
+            'elapsed': round(elapsed, 4),
+            'recorded_at': time.time()
+        }
+        line = json.dumps(entry, ensure_ascii=False) + '\n'
+        with self._lock:
+            # Each append is its own gzip member; readers see one stream
+            with gzip.open(self.path, 'at', encoding='utf-8') as f:
+                f.write(line)
+            self.entries[(method, url)] = entry
+
+    def lookup(self, url: str, method: str = 'GET') -> Optional[Dict[str, Any]]:
+        """Return the recorded exchange for url, if any"""
+        return self.entries.get((method, url))
+
+    def replay_body(self, url: str) -> Optional[str]:
+        """Body of a recorded 200 response, as fetch_page would return it"""
+        entry = self.lookup(url)
+        if entry is None:
+            print(f"Not in archive: {url}")
+            return None
+        if entry['status'] != 200:
+            print(f"Error fetching {url}: Status {entry['status']} (replayed)")
+            return None
+        return entry['body']
+
+
+def archive_from_env() -> Optional[FetchArchive]:
+    """Archive selected by SCRAPER_RECORD / SCRAPER_REPLAY, if either is set"""
+    if os.environ.get('SCRAPER_REPLAY'):
+        return FetchArchive(os.environ['SCRAPER_REPLAY'], REPLAY)
+    if os.environ.get('SCRAPER_RECORD'):
+        return FetchArchive(os.environ['SCRAPER_RECORD'], RECORD)
+    return None
@@ -1,10 +1,15 @@
 # museums/arts_club.py
 from typing import List, Dict, Any
-from bs4 import BeautifulSoup
 from .base import BaseScraper
 import re
 
 class ArtsClubScraper(BaseScraper):
+    parse_targets = [
+        ('div', {'class': 'event-item'}),
+        ('article', {'class': 'event'}),
+        ('div', {'class': 'tribe-events-list-event'}),
+    ]
+    
     def __init__(self, session):
         super().__init__(session)
         self.museum_id = "arts"
@@ -18,7 +23,7 @@ class ArtsClubScraper(BaseScraper):
         ]
         
     async def parse_events(self, html: str, url: str) -> List[Dict[str, Any]]:
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = self.make_soup(html)
         events = []
         
         # National Arts Club event structure
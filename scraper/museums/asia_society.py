@@ -1,10 +1,15 @@
 # museums/asia_society.py
 from typing import List, Dict, Any
-from bs4 import BeautifulSoup
 from .base import BaseScraper
 import re
 
 class AsiaSocietyScraper(BaseScraper):
+    parse_targets = [
+        ('div', {'class': 'event-item'}),
+        ('article', {'class': 'node-event'}),
+        ('div', {'class': 'views-row'}),
+    ]
+    
     def __init__(self, session):
         super().__init__(session)
         self.museum_id = "asia"
@@ -19,7 +24,7 @@ class AsiaSocietyScraper(BaseScraper):
         ]
         
     async def parse_events(self, html: str, url: str) -> List[Dict[str, Any]]:
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = self.make_soup(html)
         events = []
         
         # Asia Society event structure
@@ -1,18 +1,65 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
-import aiohttp
-from bs4 import BeautifulSoup
-from datetime import datetime
-import re
+from collections import namedtuple
+from typing import List, Dict, Any, Optional, Tuple, TYPE_CHECKING
+import asyncio
+import importlib
+import time
+from . import dates, jsonld, times
+from .classify import event_classifier
+from .event import Event
+from .parsing import DEFAULT_ENGINE, make_soup
+from .render_modes import BROWSER, STATIC, is_bot_challenge
+from .retry import SINGLE_ATTEMPT, TRANSIENT_ERRORS, FetchResult
+
+if TYPE_CHECKING:
+    # Only for annotations; importing aiohttp costs every parse worker ~0.2s
+    import aiohttp
+
+# Everything a worker process needs to rebuild a scraper and parse a page
+ParsePlan = namedtuple('ParsePlan', ['module', 'class_name', 'parser_engine'])
+
+_worker_scrapers = {}
+
+
+def run_parse_plan(plan: ParsePlan, html: str, url: str) -> List[Dict[str, Any]]:
+    """Parse a page inside a worker process"""
+    scraper = _worker_scrapers.get(plan)
+    if scraper is None:
+        module = importlib.import_module(plan.module)
+        scraper = getattr(module, plan.class_name)(None)
+        scraper.parser_engine = plan.parser_engine
+        _worker_scrapers[plan] = scraper
+    return asyncio.run(scraper.extract_events(html, url))
+
 
 class BaseScraper(ABC):
     """Base class for all museum scrapers"""
     
-    def __init__(self, session: aiohttp.ClientSession):
+    # (tag, attrs) subtrees parse_events reads; None builds the whole page
+    parse_targets = None
+    
+    def __init__(self, session: 'aiohttp.ClientSession'):
         self.session = session
         self.museum_id = ""
         self.museum_name = ""
         self.museum_location = ""
+        # Optional HTTPCache and ParseCache, set by the orchestrator
+        self.http_cache = None
+        self.parse_cache = None
+        # HTML parser engine, see parsing.py
+        self.parser_engine = DEFAULT_ENGINE
+        # Optional ProcessPoolExecutor that runs parsing off the event loop
+        self.parse_executor = None
+        # Optional FetchArchive to record every fetch to, or replay from
+        self.archive = None
+        # Optional headless renderer (async render(url, museum) -> html) for pages the
+        # static fetch cannot handle, and the RenderModeStore remembering them
+        self.renderer = None
+        self.render_modes = None
+        # Optional RetryPolicy for transient fetch failures (one attempt without it)
+        self.retry_policy = None
+        # Optional per-host RateLimiter shared by every scraper in the run
+        self.rate_limiter = None
         
     @abstractmethod
     def get_urls(self) -> List[str]:
@@ -24,161 +71,226 @@ class BaseScraper(ABC):
         """Parse events from HTML content"""
         pass
         
+    def make_soup(self, html: str):
+        """Parse HTML with the configured parser engine"""
+        return make_soup(html, self.parser_engine, self.parse_targets)
+        
     async def fetch_page(self, url: str) -> Optional[str]:
-        """Fetch HTML content from URL"""
-        try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
+        """Fetch HTML content from URL
+        
+        With an HTTP cache configured, the request carries the stored
+        validators and a 304 response is served from the cache. With an
+        archive in replay mode the network is not used at all. Every attempt
+        waits for the host's rate_limiter slot, and transient failures are
+        retried according to retry_policy.
+        """
+        if self.archive and self.archive.replaying:
+            return self.archive.replay_body(url)
+            
+        import aiohttp
+        
+        headers = {
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+        }
+        if self.http_cache:
+            headers.update(self.http_cache.conditional_headers(url))
+            
+        async def attempt() -> FetchResult:
+            if self.rate_limiter:
+                await self.rate_limiter.wait_async(url)
+            start = time.perf_counter()
             async with self.session.get(url, headers=headers, timeout=30) as response:
-                if response.status == 200:
-                    return await response.text()
-                else:
-                    print(f"Error fetching {url}: Status {response.status}")
-                    return None
+                html = await response.text() if response.status == 200 else ''
+                if self.archive:
+                    self.archive.record(url, response.status, response.headers, html,
+                                        time.perf_counter() - start)
+                return FetchResult(response.status, response.headers, html)
+                
+        try:
+            policy = self.retry_policy or SINGLE_ATTEMPT
+            result = await policy.call_async(attempt, errors=TRANSIENT_ERRORS + (aiohttp.ClientError,))
         except Exception as e:
             print(f"Error fetching {url}: {e}")
             return None
             
+        if result.status == 304 and self.http_cache:
+            cached = self.http_cache.get(url)
+            if cached is not None:
+                self.http_cache.refresh(url)
+                return cached
+            print(f"Error fetching {url}: 304 without a cached body")
+            return None
+        if result.status == 200:
+            if self.http_cache:
+                self.http_cache.store(url, result.headers, result.body)
+            return result.body
+        print(f"Error fetching {url}: Status {result.status}")
+        return None
+        
+    async def scrape_url(self, url: str) -> List[Dict[str, Any]]:
+        """Fetch and parse a single URL
+        
+        Plain HTTP first; with a renderer configured, the page is rendered
+        in the browser when the static parse finds no events or hits a bot
+        challenge. The mode that worked is remembered per URL.
+        """
+        known = self.render_modes.get(url) if self.render_modes else None
+        if known and known['mode'] == BROWSER and self.renderer:
+            events = await self.scrape_rendered(url)
+            if events:
+                self.remember_mode(url, BROWSER, events)
+                return events
+            known = None
+            
+        html = await self.fetch_page(url)
+        challenged = is_bot_challenge(html)
+        events = await self.parse_page(html, url) if html and not challenged else []
+        if events:
+            self.remember_mode(url, STATIC, events)
+            return events
+        # A recent render of this URL found nothing either; don't pay for another
+        if not self.renderer or (known and known['mode'] == STATIC and not known['events']):
+            return events
+            
+        print(f"{url}: {'bot challenge' if challenged else 'no events'} over HTTP, rendering in the browser")
+        rendered = await self.scrape_rendered(url)
+        if rendered is None:
+            # No render happened (no browser, timeout, challenge); that says
+            # nothing about the page, so nothing is remembered
+            return events
+        self.remember_mode(url, BROWSER if rendered else STATIC, rendered)
+        return rendered
+        
+    async def scrape_rendered(self, url: str) -> Optional[List[Dict[str, Any]]]:
+        """Render url with the injected renderer and parse the result; None if
+        the render failed, as opposed to [] for a rendered page without events"""
+        try:
+            html = await self.renderer.render(url, museum=self.museum_id)
+        except Exception as e:
+            print(f"Error rendering {url}: {e}")
+            return None
+        if not html or is_bot_challenge(html):
+            return None
+        return await self.parse_page(html, url)
+        
+    def remember_mode(self, url: str, mode: str, events: List[Dict[str, Any]]):
+        if self.render_modes:
+            self.render_modes.set(url, mode, len(events))
+        
+    async def parse_page(self, html: str, url: str) -> List[Dict[str, Any]]:
+        """Parse a page, reusing cached events when the body is unchanged"""
+        if not self.parse_cache:
+            return await self.run_parse(html, url)
+            
+        key = self.parse_cache.key(self, html, url)
+        events = self.parse_cache.get(key)
+        if events is None:
+            events = await self.run_parse(html, url)
+            self.parse_cache.put(key, events)
+        return events
+        
+    def parse_plan(self) -> ParsePlan:
+        """Picklable description of this scraper for worker processes"""
+        cls = type(self)
+        return ParsePlan(cls.__module__, cls.__qualname__, self.parser_engine)
+        
+    async def run_parse(self, html: str, url: str) -> List[Dict[str, Any]]:
+        """Parse on the process pool when configured, so fetching keeps going"""
+        if self.parse_executor is None:
+            return await self.extract_events(html, url)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.parse_executor, run_parse_plan,
+                                          self.parse_plan(), html, url)
+        
+    async def extract_events(self, html: str, url: str) -> List[Dict[str, Any]]:
+        """Take the JSON-LD fast path first; fall back to DOM heuristics"""
+        return self.parse_jsonld(html, url) or await self.parse_events(html, url)
+        
+    def parse_jsonld(self, html: str, url: str) -> List[Dict[str, Any]]:
+        """Build events from schema.org JSON-LD without parsing the DOM"""
+        events = []
+        for item in jsonld.extract_events(html):
+            date = item['date'] or self.parse_date(item['start_date'])
+            if not date:
+                continue
+            events.append(self.create_event(
+                title=item['title'],
+                date=date,
+                description=item['description'][:200],
+                event_type=item['type'] or None,
+                url=item['url'] or url
+            ))
+        return events
+        
     async def scrape(self) -> List[Dict[str, Any]]:
-        """Main scraping method"""
+        """Main scraping method
+        
+        All URLs are fetched concurrently; the overall and per-host
+        connection caps come from the session's connector. Results are
+        returned in get_urls() order; a URL that fails is logged and
+        skipped without losing the others.
+        """
         all_events = []
         urls = self.get_urls()
         
-        for url in urls:
-            html = await self.fetch_page(url)
-            if html:
-                events = await self.parse_events(html, url)
-                all_events.extend(events)
+        results = await asyncio.gather(*(self.scrape_url(url) for url in urls),
+                                       return_exceptions=True)
+        for url, events in zip(urls, results):
+            if isinstance(events, Exception):
+                print(f"Error scraping {url}: {events!r}")
+                continue
+            if isinstance(events, BaseException):
+                # Cancellation and interrupts still stop the run
+                raise events
+            all_events.extend(events)
                 
         return all_events
         
     def parse_date(self, date_str: str) -> Optional[str]:
         """Parse various date formats to YYYY-MM-DD"""
-        # Clean the date string
-        date_str = re.sub(r'\s+', ' ', date_str.strip())
-        
-        # Try different date formats
-        formats = [
-            '%B %d, %Y',  # January 15, 2025
-            '%b %d, %Y',  # Jan 15, 2025
-            '%m/%d/%Y',   # 01/15/2025
-            '%Y-%m-%d',   # 2025-01-15
-            '%d %B %Y',   # 15 January 2025
-            '%d %b %Y',   # 15 Jan 2025
-        ]
-        
-        for fmt in formats:
-            try:
-                date = datetime.strptime(date_str, fmt)
-                return date.strftime('%Y-%m-%d')
-            except ValueError:
-                continue
-                
-        # Try to extract date components with regex
-        patterns = [
-            r'(\w+)\s+(\d{1,2}),?\s+(\d{4})',  # Month Day, Year
-            r'(\d{1,2})/(\d{1,2})/(\d{4})',     # MM/DD/YYYY
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, date_str)
-            if match:
-                try:
-                    if '/' in pattern:
-                        month, day, year = match.groups()
-                        date = datetime(int(year), int(month), int(day))
-                    else:
-                        month_str, day, year = match.groups()
-                        # Convert month name to number
-                        date = datetime.strptime(f"{month_str} {day} {year}", '%B %d %Y')
-                    return date.strftime('%Y-%m-%d')
-                except:
-                    pass
-                    
-        print(f"Could not parse date: {date_str}")
-        return None
+        date = dates.parse_date(date_str)
+        if not date:
+            print(f"Could not parse date: {date_str}")
+        return date
+        
+    def parse_date_range(self, date_str: str) -> Tuple[Optional[str], Optional[str]]:
+        """Parse a date range like 'March 3 - June 10, 2025' to (start, end)"""
+        return dates.parse_date_range(date_str)
         
     def parse_time(self, time_str: str) -> str:
         """Parse time string to standardized format"""
-        # Clean the time string
-        time_str = re.sub(r'\s+', ' ', time_str.strip())
-        
-        # Extract time range if present
-        time_match = re.search(r'(\d{1,2}):?(\d{2})?\s*(am|pm|AM|PM)?\s*[-–]\s*(\d{1,2}):?(\d{2})?\s*(am|pm|AM|PM)?', time_str, re.IGNORECASE)
-        
-        if time_match:
-            start_hour, start_min, start_ampm, end_hour, end_min, end_ampm = time_match.groups()
-            
-            # Format start time
-            start_min = start_min or '00'
-            start_ampm = (start_ampm or end_ampm or 'PM').upper()
-            start_time = f"{start_hour}:{start_min} {start_ampm}"
-            
-            # Format end time
-            end_min = end_min or '00'
-            end_ampm = (end_ampm or start_ampm).upper()
-            end_time = f"{end_hour}:{end_min} {end_ampm}"
-            
-            return f"{start_time} - {end_time}"
-        
-        # Single time
-        single_time = re.search(r'(\d{1,2}):?(\d{2})?\s*(am|pm|AM|PM)?', time_str, re.IGNORECASE)
-        if single_time:
-            hour, minute, ampm = single_time.groups()
-            minute = minute or '00'
-            ampm = (ampm or 'PM').upper()
-            return f"{hour}:{minute} {ampm}"
-            
+        parsed = times.parse_time_range(time_str)
         # Default time if parsing fails
-        return "See website for time"
+        return parsed.display if parsed else "See website for time"
         
     def classify_event_type(self, title: str, description: str = "") -> str:
         """Classify event based on title and description"""
-        text = (title + " " + description).lower()
-        
-        type_keywords = {
-            'Exhibition': ['exhibition', 'exhibit', 'display', 'showcase', 'collection'],
-            'Workshop': ['workshop', 'hands-on', 'make', 'create', 'craft'],
-            'Lecture': ['lecture', 'talk', 'presentation', 'speaker'],
-            'Performance': ['performance', 'concert', 'dance', 'music', 'theater'],
-            'Film': ['film', 'screening', 'movie', 'cinema', 'video'],
-            'Family Program': ['family', 'kids', 'children', 'youth'],
-            'Tour': ['tour', 'guided', 'walk'],
-            'Symposium': ['symposium', 'conference', 'colloquium'],
-            'Opening': ['opening', 'reception', 'preview'],
-            'Panel Discussion': ['panel', 'discussion', 'conversation'],
-            'Artist Talk': ['artist talk', 'artist lecture'],
-            'Gallery Talk': ['gallery talk', 'curator talk'],
-        }
-        
-        for event_type, keywords in type_keywords.items():
-            if any(keyword in text for keyword in keywords):
-                return event_type
-                
-        return 'Special Event'
+        return event_classifier.classify(title, description)
         
     def create_event(self, title: str, date: str, time: str = None, 
                     description: str = "", event_type: str = None,
-                    url: str = None) -> Dict[str, Any]:
+                    url: str = None) -> Event:
         """Create standardized event object"""
         if not event_type:
             event_type = self.classify_event_type(title, description)
             
         if not time:
             time = self.get_default_time(event_type)
+        parsed_time = times.parse_time_range(time)
             
-        return {
-            'museum': self.museum_id,
-            'museumName': self.museum_name,
-            'title': title.strip(),
-            'type': event_type,
-            'date': date,
-            'time': time,
-            'description': description.strip() or f"Join us for this {event_type.lower()} at {self.museum_name}.",
-            'location': self.museum_location,
-            'url': url
-        }
+        return Event(
+            museum=self.museum_id,
+            museumName=self.museum_name,
+            title=title.strip(),
+            type=event_type,
+            date=date,
+            time=time,
+            start_time=parsed_time.start_time if parsed_time else None,
+            end_time=parsed_time.end_time if parsed_time else None,
+            description=description.strip() or f"Join us for this {event_type.lower()} at {self.museum_name}.",
+            location=self.museum_location,
+            url=url
+        )
         
     def get_default_time(self, event_type: str) -> str:
         """Get default time based on event type"""
@@ -0,0 +1,88 @@
+"""
+Keyword event-type classifier
+
+Every keyword is compiled into one alternation regex with word boundaries,
+so a text is scanned once no matter how many types there are. When several
+types match, the one listed first in TYPE_KEYWORDS wins, so specific
+multi-word types ("artist talk") beat the generic ones they contain
+("talk" -> Lecture). classify_many scans a whole batch in a single pass.
+"""
+
+import re
+from bisect import bisect_right
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+DEFAULT_TYPE = 'Special Event'
+
+# Highest priority first. Exhibition is last because descriptions of every
+# kind of program mention the collection or a display.
+TYPE_KEYWORDS = [
+    ('Artist Talk', ['artist talk', 'artist lecture']),
+    ('Gallery Talk', ['gallery talk', 'curator talk']),
+    ('Panel Discussion', ['panel', 'discussion', 'conversation']),
+    ('Symposium', ['symposium', 'conference', 'colloquium']),
+    ('Family Program', ['family', 'kids', 'children', 'youth']),
+    ('Workshop', ['workshop', 'hands-on', 'make', 'create', 'craft']),
+    ('Film', ['film', 'screening', 'movie', 'cinema', 'video']),
+    ('Performance', ['performance', 'concert', 'dance', 'music', 'theater']),
+    ('Tour', ['tour', 'guided', 'walk']),
+    ('Lecture', ['lecture', 'talk', 'presentation', 'speaker']),
+    ('Opening', ['opening', 'reception', 'preview']),
+    ('Exhibition', ['exhibition', 'exhibit', 'display', 'showcase', 'collection']),
+]
+
+# Every type the scrapers emit (and index.html filters on)
+EVENT_TYPES = frozenset([event_type for event_type, _ in TYPE_KEYWORDS] + [DEFAULT_TYPE])
+
+# Joins batch texts; contains no word characters, so no keyword spans it
+_SEPARATOR = '\n\x00\n'
+
+
+class EventClassifier:
+    def __init__(self, type_keywords: Sequence[Tuple[str, Sequence[str]]] = TYPE_KEYWORDS,
+                 default: str = DEFAULT_TYPE):
+        self.default = default
+        self.types = [event_type for event_type, _ in type_keywords]
+        self.rank = {}
+        for rank, (_, keywords) in enumerate(type_keywords):
+            for keyword in keywords:
+                self.rank.setdefault(keyword.lower(), rank)
+        # Longest first so "artist talk" is tried before "talk" at the same spot
+        alternatives = sorted(self.rank, key=len, reverse=True)
+        self.pattern = re.compile(
+            r'\b(' + '|'.join(re.escape(k) for k in alternatives) + r')s?\b', re.IGNORECASE)
+
+    def _best(self, matches) -> Optional[int]:
+        best = None
+        for match in matches:
+            rank = self.rank[match.group(1).lower()]
+            if best is None or rank < best:
+                best = rank
+                if rank == 0:
+                    break
+        return best
+
+    def classify(self, title: str, description: str = "") -> str:
+        """Return the highest-priority type whose keywords appear in the text"""
+        best = self._best(self.pattern.finditer(f"{title} {description}"))
+        return self.types[best] if best is not None else self.default
+
+    def classify_many(self, texts: Iterable[Tuple[str, str]]) -> List[str]:
+        """Classify (title, description) pairs with one scan over the batch"""
+        starts, parts, offset = [], [], 0
+        for title, description in texts:
+            text = f"{title or ''} {description or ''}"
+            starts.append(offset)
+            parts.append(text)
+            offset += len(text) + len(_SEPARATOR)
+
+        best = [None] * len(parts)
+        for match in self.pattern.finditer(_SEPARATOR.join(parts)):
+            index = bisect_right(starts, match.start()) - 1
+            rank = self.rank[match.group(1).lower()]
+            if best[index] is None or rank < best[index]:
+                best[index] = rank
+        return [self.types[rank] if rank is not None else self.default for rank in best]
+
+
+event_classifier = EventClassifier()
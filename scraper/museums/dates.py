@@ -0,0 +1,167 @@
+"""
+Shared date normalization for every scraper and converter
+
+One precompiled regex recognizes each supported date shape and dispatches
+to a small handler by the name of the alternative that matched, instead of
+looping over strptime formats. Results are memoized because the same date
+strings repeat across pages, listings and CSV rows.
+
+Supported shapes:
+    2025-01-15, 2025-01-15T18:00:00Z, 2025-01-15T18:00-05:00   ISO 8601
+    2025/01/15                                                 year first
+    01/15/2025, 15/01/2025, 15-01-2025, 1.15.25                numeric (US first)
+    January 15, 2025, Wed, Jan. 15th 2025                      month first
+    15 January 2025, 15th Jan 2025                             day first
+"""
+
+import re
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Optional, Tuple
+
+try:
+    from zoneinfo import ZoneInfo
+    LOCAL_TZ = ZoneInfo('America/New_York')
+except Exception:
+    LOCAL_TZ = None
+
+_MONTH = (r'(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|'
+          r'aug(?:ust)?|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)')
+_ORDINAL = r'(?:st|nd|rd|th)?'
+_SEPARATOR = r'(?:[-–—]|\bto\b|\bthrough\b|\bthru\b|\buntil\b)'
+
+MONTHS = {name: number for number, name in enumerate(
+    ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec'], 1)}
+
+# Each alternative is an outer named group, so match.lastgroup names the shape
+_DATE = re.compile(r'\b(?:' + '|'.join([
+    r'(?P<iso>(?P<iso_y>\d{4})-(?P<iso_m>\d{1,2})-(?P<iso_d>\d{1,2})'
+    r'(?:[T ](?P<iso_time>\d{1,2}:\d{2}(?::\d{2}(?:\.\d+)?)?)\s*(?P<iso_tz>Z|[+-]\d{2}:?\d{2})?)?)',
+    r'(?P<ymd>(?P<ymd_y>\d{4})/(?P<ymd_m>\d{1,2})/(?P<ymd_d>\d{1,2}))',
+    r'(?P<numeric>(?P<num_a>\d{1,2})[/.-](?P<num_b>\d{1,2})[/.-](?P<num_y>\d{4}|\d{2})(?!\d))',
+    rf'(?P<dmy>(?P<dmy_d>\d{{1,2}}){_ORDINAL}\s+(?P<dmy_m>{_MONTH})\.?,?\s+(?P<dmy_y>\d{{4}}))',
+    rf'(?P<mdy>(?P<mdy_m>{_MONTH})\.?\s+(?P<mdy_d>\d{{1,2}}){_ORDINAL},?\s+(?P<mdy_y>\d{{4}}))',
+]) + r')', re.IGNORECASE)
+
+# "Jan 15" with no year, only used when the caller supplies one
+_MONTH_DAY = re.compile(rf'\b(?P<m>{_MONTH})\.?\s+(?P<d>\d{{1,2}}){_ORDINAL}\b', re.IGNORECASE)
+
+# "March 3-10, 2025": one month, a span of days, one year
+_DAY_SPAN = re.compile(rf'\b(?P<m>{_MONTH})\.?\s+(?P<d1>\d{{1,2}}){_ORDINAL}\s*{_SEPARATOR}\s*'
+                       rf'(?P<d2>\d{{1,2}}){_ORDINAL},?\s+(?P<y>\d{{4}})\b', re.IGNORECASE)
+
+# Start of a range whose year (and maybe month) comes from the end date
+_PARTIAL_START = re.compile(rf'(?:\b(?P<m>{_MONTH})\.?\s+(?P<d>\d{{1,2}})|\b(?P<d2>\d{{1,2}})'
+                            rf'(?:\s+(?P<m2>{_MONTH}))?){_ORDINAL}\.?,?\s*{_SEPARATOR}\s*$',
+                            re.IGNORECASE)
+_OPEN_START = re.compile(r'\b(?:through|thru|until|ends|closing)\s*$', re.IGNORECASE)
+
+
+def _month(name: str) -> int:
+    return MONTHS[name[:3].lower()]
+
+
+def _iso(year: int, month: int, day: int) -> Optional[str]:
+    try:
+        return date(year, month, day).isoformat()
+    except ValueError:
+        return None
+
+
+def _from_iso(m) -> Optional[str]:
+    year, month, day = int(m.group('iso_y')), int(m.group('iso_m')), int(m.group('iso_d'))
+    tz = m.group('iso_tz')
+    if tz and m.group('iso_time') and LOCAL_TZ is not None:
+        # Timestamps carry an offset; report the date as seen in New York
+        stamp = f"{m.group('iso')[:10]}T{m.group('iso_time')}{'+00:00' if tz in 'Zz' else tz}"
+        try:
+            return datetime.fromisoformat(stamp).astimezone(LOCAL_TZ).date().isoformat()
+        except ValueError:
+            return None
+    return _iso(year, month, day)
+
+
+def _from_ymd(m) -> Optional[str]:
+    return _iso(int(m.group('ymd_y')), int(m.group('ymd_m')), int(m.group('ymd_d')))
+
+
+def _from_numeric(m) -> Optional[str]:
+    first, second, year = int(m.group('num_a')), int(m.group('num_b')), int(m.group('num_y'))
+    if year < 100:
+        year += 2000
+    # US month-first unless the first number cannot be a month
+    if first > 12:
+        return _iso(year, second, first)
+    return _iso(year, first, second)
+
+
+def _from_dmy(m) -> Optional[str]:
+    return _iso(int(m.group('dmy_y')), _month(m.group('dmy_m')), int(m.group('dmy_d')))
+
+
+def _from_mdy(m) -> Optional[str]:
+    return _iso(int(m.group('mdy_y')), _month(m.group('mdy_m')), int(m.group('mdy_d')))
+
+
+_HANDLERS = {
+    'iso': _from_iso,
+    'ymd': _from_ymd,
+    'numeric': _from_numeric,
+    'dmy': _from_dmy,
+    'mdy': _from_mdy,
+}
+
+
+@lru_cache(maxsize=4096)
+def parse_date(text: str, default_year: Optional[int] = None) -> Optional[str]:
+    """Return the first date in text as YYYY-MM-DD, or None"""
+    if not text or not isinstance(text, str):
+        return None
+    match = _DATE.search(text)
+    if match:
+        return _HANDLERS[match.lastgroup](match)
+    if default_year:
+        match = _MONTH_DAY.search(text)
+        if match:
+            return _iso(default_year, _month(match.group('m')), int(match.group('d')))
+    return None
+
+
+@lru_cache(maxsize=4096)
+def parse_date_range(text: str) -> Tuple[Optional[str], Optional[str]]:
+    """Return (start, end) as YYYY-MM-DD from text like 'March 3 - June 10, 2025'
+
+    A single date is treated as the start, unless it is introduced by
+    'through'/'until', in which case it is the end. Missing parts are None.
+    """
+    if not text or not isinstance(text, str):
+        return None, None
+
+    span = _DAY_SPAN.search(text)
+    if span:
+        year, month = int(span.group('y')), _month(span.group('m'))
+        return _iso(year, month, int(span.group('d1'))), _iso(year, month, int(span.group('d2')))
+
+    matches = list(_DATE.finditer(text))
+    if len(matches) >= 2:
+        first, second = matches[0], matches[1]
+        return _HANDLERS[first.lastgroup](first), _HANDLERS[second.lastgroup](second)
+    if not matches:
+        return None, None
+
+    match = matches[0]
+    found = _HANDLERS[match.lastgroup](match)
+    prefix = text[:match.start()]
+    partial = _PARTIAL_START.search(prefix)
+    if partial and found:
+        end = date.fromisoformat(found)
+        name = partial.group('m') or partial.group('m2')
+        month = _month(name) if name else end.month
+        start = _iso(end.year, month, int(partial.group('d') or partial.group('d2')))
+        if start and start > found:
+            # "November 15 - February 3, 2026" starts in the previous year
+            start = _iso(end.year - 1, month, int(partial.group('d') or partial.group('d2')))
+        return start, found
+    if _OPEN_START.search(prefix):
+        return None, found
+    return found, None
@@ -0,0 +1,197 @@
+"""
+Compact event records shared by every scraper and converter
+
+Event is a __slots__ record with dict-style access, so code written against
+the old per-event dicts keeps working. Categorical fields (museum, type,
+location, date, ...) are interned, so thousands of events share one copy
+of each value. EventTable stores many events column by column, which is
+what the merge steps use for large histories.
+
+Only the keys an event was given are written back by to_dict(), so the
+JSON files keep the same shape as before.
+"""
+
+import sys
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Union
+
+FIELDS = (
+    'id', 'museum', 'museumName', 'title', 'type', 'date', 'time', 'start_time', 'end_time',
+    'description', 'location', 'url', 'image_url', 'price', 'registration_url', 'data_source',
+)
+_FIELD_SET = frozenset(FIELDS)
+
+# Values repeated across many events; interned so they are stored once
+CATEGORICAL = frozenset({
+    'museum', 'museumName', 'type', 'date', 'time', 'start_time', 'end_time',
+    'location', 'price', 'data_source',
+})
+
+_MISSING = object()
+
+
+def _intern(field: str, value: Any) -> Any:
+    if field in CATEGORICAL and type(value) is str:
+        return sys.intern(value)
+    return value
+
+
+class Event:
+    __slots__ = FIELDS + ('extra',)
+
+    def __init__(self, **fields):
+        self.extra = None
+        for key, value in fields.items():
+            self[key] = value
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> 'Event':
+        if isinstance(data, cls):
+            return data
+        event = cls.__new__(cls)
+        event.extra = None
+        for key, value in data.items():
+            event[key] = value
+        return event
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {}
+        for field in FIELDS:
+            value = getattr(self, field, _MISSING)
+            if value is not _MISSING:
+                data[field] = value
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    # Mapping-style access, as the pipeline used to do on dicts
+    def __getitem__(self, key: str) -> Any:
+        if key in _FIELD_SET:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        if self.extra and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any):
+        if key in _FIELD_SET:
+            setattr(self, key, _intern(key, value))
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+
+    def __contains__(self, key: str) -> bool:
+        if key in _FIELD_SET:
+            return hasattr(self, key)
+        return bool(self.extra) and key in self.extra
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self) -> List[str]:
+        return list(self.to_dict())
+
+    def items(self):
+        return self.to_dict().items()
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, Event):
+            return self.to_dict() == other.to_dict()
+        if isinstance(other, Mapping):
+            return self.to_dict() == dict(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __getstate__(self):
+        return self.to_dict()
+
+    def __setstate__(self, state):
+        self.extra = None
+        for key, value in state.items():
+            self[key] = value
+
+    def __repr__(self) -> str:
+        return f"Event({self.to_dict()!r})"
+
+
+class EventTable:
+    """Columnar event list: one Python list per field instead of one object per event"""
+
+    def __init__(self, events: Iterable[Union[Event, Mapping[str, Any]]] = ()):
+        self.columns: Dict[str, List[Any]] = {field: [] for field in FIELDS}
+        self.extras: List[Optional[Dict[str, Any]]] = []
+        self.extend(events)
+
+    def append(self, event: Union[Event, Mapping[str, Any]]):
+        for field, column in self.columns.items():
+            column.append(_intern(field, event.get(field, _MISSING)))
+        if isinstance(event, Event):
+            extra = event.extra
+        else:
+            extra = {k: v for k, v in event.items() if k not in _FIELD_SET}
+        self.extras.append(dict(extra) if extra else None)
+
+    def extend(self, events: Iterable[Union[Event, Mapping[str, Any]]]):
+        for event in events:
+            self.append(event)
+
+    def __len__(self) -> int:
+        return len(self.extras)
+
+    def _row(self, index: int) -> Dict[str, Any]:
+        data = {}
+        for field, column in self.columns.items():
+            value = column[index]
+            if value is not _MISSING:
+                data[field] = value
+        if self.extras[index]:
+            data.update(self.extras[index])
+        return data
+
+    def __getitem__(self, index: int) -> Event:
+        return Event.from_dict(self._row(index))
+
+    def __iter__(self) -> Iterator[Event]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def values(self, field: str, default: Any = None) -> List[Any]:
+        """One column, with default for events that lack the field"""
+        return [default if value is _MISSING else value for value in self.columns[field]]
+
+    def set_value(self, index: int, field: str, value: Any):
+        self.columns[field][index] = _intern(field, value)
+
+    def _take(self, indices: List[int]):
+        for field, column in self.columns.items():
+            self.columns[field] = [column[i] for i in indices]
+        self.extras = [self.extras[i] for i in indices]
+
+    def dedupe(self, field: str = 'id'):
+        """Keep the first event for every non-empty value of field"""
+        seen, keep = set(), []
+        for index, value in enumerate(self.values(field)):
+            if value and value not in seen:
+                seen.add(value)
+                keep.append(index)
+        self._take(keep)
+
+    def sort_by(self, field: str):
+        values = self.values(field, '')
+        self._take(sorted(range(len(self)), key=lambda i: values[i] or ''))
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        return [self._row(index) for index in range(len(self))]
+
+
+def to_dicts(events: Iterable[Union[Event, Mapping[str, Any]]]) -> List[Dict[str, Any]]:
+    """Plain dicts for JSON output, from Events, dicts or an EventTable"""
+    if isinstance(events, EventTable):
+        return events.to_dicts()
+    return [event.to_dict() if isinstance(event, Event) else dict(event) for event in events]
@@ -1,10 +1,15 @@
 # museums/explorers.py
 from typing import List, Dict, Any
-from bs4 import BeautifulSoup
 from .base import BaseScraper
 import re
 
 class ExplorersScraper(BaseScraper):
+    parse_targets = [
+        ('div', {'class': 'event-block'}),
+        ('div', {'class': 'event-listing'}),
+        ('article', {}),
+    ]
+    
     def __init__(self, session):
         super().__init__(session)
         self.museum_id = "explorers"
@@ -18,7 +23,7 @@ class ExplorersScraper(BaseScraper):
         ]
         
     async def parse_events(self, html: str, url: str) -> List[Dict[str, Any]]:
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = self.make_soup(html)
         events = []
         
         # Explorers Club event structure
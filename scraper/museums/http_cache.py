@@ -0,0 +1,125 @@
+import hashlib
+import json
+import os
+import time
+from typing import Dict, Optional
+
+
+class HTTPCache:
+    """Disk-backed cache of page bodies with their validators (ETag/Last-Modified)
+
+    Each URL is stored as <key>.json (metadata) plus <key>.body (text).
+    Entries older than max_age are dropped and the least recently used
+    entries are evicted once the total body size exceeds max_bytes.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = 50 * 1024 * 1024,
+                 max_age: int = 14 * 24 * 3600):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _paths(self, url: str):
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        base = os.path.join(self.cache_dir, key)
+        return base + '.json', base + '.body'
+
+    def _load_meta(self, url: str) -> Optional[Dict]:
+        meta_path, body_path = self._paths(url)
+        if not (os.path.exists(meta_path) and os.path.exists(body_path)):
+            return None
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if time.time() - meta.get('stored_at', 0) > self.max_age:
+            return None
+        return meta
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """Validator headers to send with a request for url"""
+        meta = self._load_meta(url)
+        if not meta:
+            return {}
+        headers = {}
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+        return headers
+
+    def get(self, url: str) -> Optional[str]:
+        """Return the stored body for url and mark it as recently used"""
+        if not self._load_meta(url):
+            return None
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(body_path, 'r', encoding='utf-8') as f:
+                body = f.read()
+        except OSError:
+            return None
+        os.utime(meta_path)
+        return body
+
+    def store(self, url: str, headers, body: str):
+        """Store a 200 response body if it carries a validator"""
+        etag = headers.get('ETag')
+        last_modified = headers.get('Last-Modified')
+        if not etag and not last_modified:
+            return
+        meta_path, body_path = self._paths(url)
+        with open(body_path, 'w', encoding='utf-8') as f:
+            f.write(body)
+        with open(meta_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'url': url,
+                'etag': etag,
+                'last_modified': last_modified,
+                'stored_at': time.time(),
+                'size': os.path.getsize(body_path)
+            }, f)
+
+    def refresh(self, url: str):
+        """Restart the age of an entry after the server confirmed it with a 304"""
+        meta_path, _ = self._paths(url)
+        meta = self._load_meta(url)
+        if meta:
+            meta['stored_at'] = time.time()
+            with open(meta_path, 'w', encoding='utf-8') as f:
+                json.dump(meta, f)
+
+    def evict(self):
+        """Drop expired entries, then least recently used ones over max_bytes"""
+        entries = []
+        now = time.time()
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith('.json'):
+                continue
+            meta_path = os.path.join(self.cache_dir, name)
+            body_path = meta_path[:-len('.json')] + '.body'
+            try:
+                with open(meta_path, 'r', encoding='utf-8') as f:
+                    meta = json.load(f)
+                last_used = os.path.getmtime(meta_path)
+            except (OSError, ValueError):
+                meta, last_used = {}, 0
+            if not meta or now - meta.get('stored_at', 0) > self.max_age:
+                self._remove(meta_path, body_path)
+                continue
+            entries.append((last_used, meta.get('size', 0), meta_path, body_path))
+
+        total = sum(size for _, size, _, _ in entries)
+        for _, size, meta_path, body_path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self._remove(meta_path, body_path)
+            total -= size
+
+    def _remove(self, *paths):
+        for path in paths:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
@@ -0,0 +1,132 @@
+"""
+Zero-DOM extraction of schema.org Events from JSON-LD blocks
+
+Scans the raw page text (str or bytes) for <script type="application/ld+json">
+blocks with a regex instead of building a DOM, decodes them with orjson when
+it is installed, and normalizes every Event it finds.
+"""
+
+import html as html_lib
+import json
+import re
+from typing import Any, Dict, Iterator, List, Union
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+_SCRIPT_PATTERN = (r'<script\b[^>]*\btype\s*=\s*["\']?application/ld\+json["\']?[^>]*>'
+                   r'(.*?)</script\s*>')
+_SCRIPT_TEXT = re.compile(_SCRIPT_PATTERN, re.IGNORECASE | re.DOTALL)
+_SCRIPT_BYTES = re.compile(_SCRIPT_PATTERN.encode('ascii'), re.IGNORECASE | re.DOTALL)
+_WRAPPERS_TEXT = re.compile(r'^\s*(?:<!--|<!\[CDATA\[)|(?:-->|\]\]>)\s*$')
+_WRAPPERS_BYTES = re.compile(_WRAPPERS_TEXT.pattern.encode('ascii'))
+_ISO_DATE = re.compile(r'^(\d{4}-\d{2}-\d{2})')
+_TAGS = re.compile(r'<[^>]+>')
+
+# schema.org Event subtypes that map directly onto our event types
+SCHEMA_TYPES = {
+    'ExhibitionEvent': 'Exhibition',
+    'ScreeningEvent': 'Film',
+    'TheaterEvent': 'Performance',
+    'MusicEvent': 'Performance',
+    'DanceEvent': 'Performance',
+    'ComedyEvent': 'Performance',
+    'ChildrensEvent': 'Family Program',
+    'SocialEvent': 'Social Event',
+}
+
+
+def _blocks(page: Union[str, bytes]) -> Iterator[Any]:
+    """Yield the decoded JSON of every JSON-LD block in the page"""
+    if isinstance(page, bytes):
+        if b'application/ld+json' not in page:
+            return
+        pattern, wrappers = _SCRIPT_BYTES, _WRAPPERS_BYTES
+    else:
+        if 'application/ld+json' not in page:
+            return
+        pattern, wrappers = _SCRIPT_TEXT, _WRAPPERS_TEXT
+    for match in pattern.finditer(page):
+        raw = wrappers.sub(type(page)(), match.group(1))
+        try:
+            yield _loads(raw)
+        except ValueError as e:
+            print(f"Skipping malformed JSON-LD block: {e}")
+
+
+def _types(node: Dict[str, Any]) -> List[str]:
+    types = node.get('@type', [])
+    if isinstance(types, str):
+        types = [types]
+    return [t for t in types if isinstance(t, str)]
+
+
+def _is_event(node: Dict[str, Any]) -> bool:
+    return any(t.endswith('Event') for t in _types(node))
+
+
+def _event_nodes(data: Any) -> Iterator[Dict[str, Any]]:
+    """Walk @graph containers, lists, ItemLists and single objects"""
+    if isinstance(data, list):
+        for item in data:
+            yield from _event_nodes(item)
+    elif isinstance(data, dict):
+        if _is_event(data):
+            yield data
+        for key in ('@graph', 'itemListElement', 'item'):
+            if key in data:
+                yield from _event_nodes(data[key])
+
+
+def _text(value: Any) -> str:
+    if isinstance(value, list):
+        value = value[0] if value else ''
+    if isinstance(value, dict):
+        value = value.get('name') or value.get('@id') or ''
+    if not isinstance(value, str):
+        return ''
+    return ' '.join(html_lib.unescape(_TAGS.sub(' ', value)).split())
+
+
+def _location(value: Any) -> str:
+    if isinstance(value, list):
+        value = value[0] if value else ''
+    if isinstance(value, dict):
+        name = _text(value.get('name'))
+        address = value.get('address')
+        if isinstance(address, dict):
+            address = address.get('streetAddress')
+        address = _text(address)
+        return ', '.join(part for part in (name, address) if part)
+    return _text(value)
+
+
+def normalize_event(node: Dict[str, Any]) -> Dict[str, str]:
+    """Flatten a schema.org Event into the fields the scrapers use"""
+    start_date = _text(node.get('startDate'))
+    date_match = _ISO_DATE.match(start_date)
+    event_type = next((SCHEMA_TYPES[t] for t in _types(node) if t in SCHEMA_TYPES), '')
+    return {
+        'title': _text(node.get('name')),
+        'start_date': start_date,
+        'end_date': _text(node.get('endDate')),
+        'date': date_match.group(1) if date_match else '',
+        'description': _text(node.get('description')),
+        'url': _text(node.get('url')),
+        'location': _location(node.get('location')),
+        'type': event_type,
+    }
+
+
+def extract_events(page: Union[str, bytes]) -> List[Dict[str, str]]:
+    """Return normalized events from every JSON-LD block in the page"""
+    events = []
+    for data in _blocks(page):
+        for node in _event_nodes(data):
+            event = normalize_event(node)
+            if event['title'] and event['start_date']:
+                events.append(event)
+    return events
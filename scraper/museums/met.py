@@ -1,10 +1,15 @@
 from typing import List, Dict, Any
-from bs4 import BeautifulSoup
 from .base import BaseScraper
-import re
-import json
 
 class MetScraper(BaseScraper):
+    parse_targets = [
+        ('div', {'class': 'exhibition-object__content-wrapper'}),
+        ('article', {'data-testid': 'exhibition-card'}),
+        ('div', {'class': 'event-card'}),
+        ('article', {'class': 'program-card'}),
+        ('div', {'class': 'card-event'}),
+    ]
+    
     def __init__(self, session):
         super().__init__(session)
         self.museum_id = "met"
@@ -21,7 +26,7 @@ class MetScraper(BaseScraper):
         ]
         
     async def parse_events(self, html: str, url: str) -> List[Dict[str, Any]]:
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = self.make_soup(html)
         events = []
         
         # The Met has different structures for different sections
@@ -45,24 +50,23 @@ class MetScraper(BaseScraper):
                 
                 if date_elem:
                     date_text = date_elem.get_text(strip=True)
-                    # Extract opening date from range
-                    date_match = re.search(r'(\w+\s+\d+,?\s+\d{4})', date_text)
-                    if date_match:
-                        date = self.parse_date(date_match.group(1))
-                        if date:
-                            # Get description
-                            desc_elem = exhibit.find('div', class_='exhibition-object__short-description') or \
-                                       exhibit.find('p')
-                            description = desc_elem.get_text(strip=True)[:200] if desc_elem else ""
-                            
-                            events.append(self.create_event(
-                                title=title,
-                                date=date,
-                                description=description,
-                                event_type='Exhibition',
-                                url=url
-                            ))
-                            
+                    # Use the opening date, or the closing date for "Through ..." ranges
+                    start, end = self.parse_date_range(date_text)
+                    date = start or end
+                    if date:
+                        # Get description
+                        desc_elem = exhibit.find('div', class_='exhibition-object__short-description') or \
+                                   exhibit.find('p')
+                        description = desc_elem.get_text(strip=True)[:200] if desc_elem else ""
+                        
+                        events.append(self.create_event(
+                            title=title,
+                            date=date,
+                            description=description,
+                            event_type='Exhibition',
+                            url=url
+                        ))
+                        
         else:
             # Parse regular events
             # Look for event cards in various possible containers
@@ -70,29 +74,6 @@ class MetScraper(BaseScraper):
                          soup.find_all('article', class_='program-card') or \
                          soup.find_all('div', class_='card-event')
             
-            # Also check for JSON-LD structured data
-            scripts = soup.find_all('script', type='application/ld+json')
-            for script in scripts:
-                try:
-                    data = json.loads(script.string)
-                    if isinstance(data, list):
-                        for item in data:
-                            if item.get('@type') == 'Event':
-                                title = item.get('name', '')
-                                start_date = item.get('startDate', '')
-                                if title and start_date:
-                                    date = self.parse_date(start_date)
-                                    if date:
-                                        events.append(self.create_event(
-                                            title=title,
-                                            date=date,
-                                            description=item.get('description', '')[:200],
-                                            event_type=self.classify_event_type(title, item.get('description', '')),
-                                            url=item.get('url', url)
-                                        ))
-                except:
-                    pass
-            
             # Parse event cards
             for card in event_cards[:20]:
                 title_elem = card.find(['h2', 'h3', 'h4']) or \
@@ -1,9 +1,17 @@
 from typing import List, Dict, Any
-from bs4 import BeautifulSoup
 from .base import BaseScraper
 import re
 
 class MoMAScraper(BaseScraper):
+    parse_targets = [
+        ('div', {'class': 'exhibition-item'}),
+        ('article', {'class': 'exhibition'}),
+        ('div', {'data-testid': 'exhibition-card'}),
+        ('div', {'class': 'event-item'}),
+        ('article', {'class': 'program'}),
+        ('div', {'class': 'calendar-event'}),
+    ]
+    
     def __init__(self, session):
         super().__init__(session)
         self.museum_id = "moma"
@@ -18,7 +26,7 @@ class MoMAScraper(BaseScraper):
         ]
         
     async def parse_events(self, html: str, url: str) -> List[Dict[str, Any]]:
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = self.make_soup(html)
         events = []
         
         # MoMA uses different structures for different pages
@@ -44,25 +52,24 @@ class MoMAScraper(BaseScraper):
                 
                 if date_elem:
                     date_text = date_elem.get_text() if hasattr(date_elem, 'get_text') else str(date_elem)
-                    # For exhibitions, use the opening date
-                    date_match = re.search(r'(\w+\s+\d+,?\s+\d{4})', date_text)
-                    if date_match:
-                        date = self.parse_date(date_match.group(1))
-                        if date:
-                            description = ""
-                            desc_elem = exhibit.find('div', class_='description') or \
-                                       exhibit.find('p')
-                            if desc_elem:
-                                description = desc_elem.get_text(strip=True)[:200]
-                                
-                            events.append(self.create_event(
-                                title=title,
-                                date=date,
-                                description=description,
-                                event_type='Exhibition',
-                                url=url
-                            ))
+                    # For exhibitions, use the opening date (closing date for "Through ...")
+                    start, end = self.parse_date_range(date_text)
+                    date = start or end
+                    if date:
+                        description = ""
+                        desc_elem = exhibit.find('div', class_='description') or \
+                                   exhibit.find('p')
+                        if desc_elem:
+                            description = desc_elem.get_text(strip=True)[:200]
                             
+                        events.append(self.create_event(
+                            title=title,
+                            date=date,
+                            description=description,
+                            event_type='Exhibition',
+                            url=url
+                        ))
+                        
         else:
             # Parse regular events/programs
             event_items = soup.find_all('div', class_='event-item') or \
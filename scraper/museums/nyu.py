@@ -1,9 +1,10 @@
 from typing import List, Dict, Any
-from bs4 import BeautifulSoup
 from .base import BaseScraper
 import re
 
 class NYUScraper(BaseScraper):
+    # No parse_targets: without event containers the page's text blocks are scanned
+    
     def __init__(self, session):
         super().__init__(session)
         self.museum_id = "nyu"
@@ -18,7 +19,7 @@ class NYUScraper(BaseScraper):
         ]
         
     async def parse_events(self, html: str, url: str) -> List[Dict[str, Any]]:
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = self.make_soup(html)
         events = []
         
         # NYU IFA typically uses a simple list structure
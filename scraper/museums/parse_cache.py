@@ -0,0 +1,94 @@
+import hashlib
+import inspect
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+from .event import Event, to_dicts
+
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+_version_cache: Dict[type, str] = {}
+
+
+def _source_files(scraper_class: type) -> List[str]:
+    # Every module of the museums package (base.py and the helpers it parses
+    # with: dates, times, classify, jsonld, event, parsing, ...), plus any
+    # module in the class's MRO that lives outside it
+    files = {os.path.join(PACKAGE_DIR, name) for name in os.listdir(PACKAGE_DIR)
+             if name.endswith('.py')}
+    for klass in scraper_class.__mro__:
+        if klass is object:
+            continue
+        try:
+            source_file = inspect.getsourcefile(klass)
+        except TypeError:
+            continue
+        if source_file and os.path.exists(source_file):
+            files.add(os.path.abspath(source_file))
+    return sorted(files)
+
+
+def parser_version(scraper_class: type) -> str:
+    """Hash of the source files that define a scraper's parsing behaviour
+
+    Covers the whole museums package and the scraper's own module, so
+    editing the scraper or any helper it parses with invalidates the
+    cached results automatically.
+    """
+    if scraper_class not in _version_cache:
+        digest = hashlib.sha256()
+        for source_file in _source_files(scraper_class):
+            digest.update(os.path.basename(source_file).encode('utf-8'))
+            with open(source_file, 'rb') as f:
+                digest.update(f.read())
+        _version_cache[scraper_class] = digest.hexdigest()[:16]
+    return _version_cache[scraper_class]
+
+
+class ParseCache:
+    """Cache of parse_events results keyed by scraper, parser version and page hash"""
+
+    def __init__(self, cache_dir: str, max_age: int = 14 * 24 * 3600):
+        self.cache_dir = cache_dir
+        self.max_age = max_age
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def key(self, scraper, html: str, url: str) -> str:
+        """Cache key for a page; url is included because events carry it"""
+        scraper_class = type(scraper)
+        digest = hashlib.sha256()
+        for part in (scraper_class.__module__, scraper_class.__qualname__,
+                     parser_version(scraper_class), scraper.parser_engine, url):
+            digest.update(part.encode('utf-8'))
+            digest.update(b'\0')
+        digest.update(hashlib.sha256(html.encode('utf-8')).digest())
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        path = os.path.join(self.cache_dir, key + '.json')
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                events = json.load(f)
+        except (OSError, ValueError):
+            return None
+        os.utime(path)
+        return [Event.from_dict(event) for event in events]
+
+    def put(self, key: str, events: List[Dict[str, Any]]):
+        path = os.path.join(self.cache_dir, key + '.json')
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(to_dicts(events), f, ensure_ascii=False)
+
+    def evict(self):
+        """Drop results that have not been used for max_age seconds"""
+        cutoff = time.time() - self.max_age
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+            except OSError:
+                pass
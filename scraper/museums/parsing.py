@@ -0,0 +1,207 @@
+"""
+HTML parser engines for the museum scrapers
+
+make_soup() returns an object with the BeautifulSoup API the scrapers use
+(find, find_all, select, select_one, get_text, get, string). Passing parse
+targets builds only the matching subtrees. Engines:
+
+    lxml         BeautifulSoup on the lxml tree builder (default)
+    html.parser  BeautifulSoup on the pure-Python builder (slowest)
+    selectolax   lexbor-backed adapter covering the find_all/select patterns
+                 used in this package; optional dependency
+"""
+
+import re
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml  # noqa: F401
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+    HAS_SELECTOLAX = True
+except ImportError:
+    HAS_SELECTOLAX = False
+
+ENGINES = ('lxml', 'html.parser', 'selectolax')
+DEFAULT_ENGINE = 'lxml'
+
+# find('.date') is a literal tag name in BeautifulSoup and never matches
+_TAG_NAME = re.compile(r'^[A-Za-z][\w-]*$')
+
+# A parse target is (tag name, attribute filters), e.g.
+# ('div', {'class': 'event-card'}) or ('script', {'type': 'application/ld+json'})
+ParseTarget = Tuple[str, Dict[str, str]]
+
+
+def available_engines() -> List[str]:
+    """Engines that can run with the installed packages"""
+    engines = ['html.parser']
+    if HAS_LXML:
+        engines.insert(0, 'lxml')
+    if HAS_SELECTOLAX:
+        engines.append('selectolax')
+    return engines
+
+
+class TargetStrainer(SoupStrainer):
+    """SoupStrainer that keeps the subtrees rooted at any of the parse targets
+
+    Implements the tag hooks of both bs4 < 4.13 (search_tag) and
+    bs4 >= 4.13 (allow_tag_creation / allow_string_creation).
+    """
+
+    def __init__(self, targets: Sequence[ParseTarget]):
+        super().__init__()
+        self.targets = [(name, dict(attrs)) for name, attrs in targets]
+
+    def matches(self, name: str, attrs) -> bool:
+        attrs = attrs or {}
+        for target_name, target_attrs in self.targets:
+            if target_name and target_name != name:
+                continue
+            for attr, wanted in target_attrs.items():
+                value = attrs.get(attr)
+                if value is None:
+                    break
+                if attr == 'class':
+                    classes = value.split() if isinstance(value, str) else value
+                    if wanted not in classes:
+                        break
+                elif value != wanted:
+                    break
+            else:
+                return True
+        return False
+
+    def search_tag(self, markup_name=None, markup_attrs=None):
+        return self.matches(markup_name, markup_attrs)
+
+    def allow_tag_creation(self, nsprefix, name, attrs) -> bool:
+        return self.matches(name, attrs)
+
+    def allow_string_creation(self, string) -> bool:
+        return False
+
+
+def make_soup(html: str, engine: str = DEFAULT_ENGINE,
+              targets: Optional[Sequence[ParseTarget]] = None):
+    """Parse html with the requested engine, falling back to what is installed
+
+    With targets, the BeautifulSoup engines build only the matching subtrees
+    (nav, footers and the rest of the page are skipped). The selectolax
+    engine always parses the full document.
+    """
+    if engine == 'selectolax':
+        if HAS_SELECTOLAX:
+            return SelectolaxNode(LexborHTMLParser(html).root)
+        engine = DEFAULT_ENGINE
+    if engine == 'lxml' and not HAS_LXML:
+        engine = 'html.parser'
+    if engine not in ('lxml', 'html.parser'):
+        raise ValueError(f"Unknown parser engine: {engine}")
+    if targets:
+        return BeautifulSoup(html, engine, parse_only=TargetStrainer(targets))
+    return BeautifulSoup(html, engine)
+
+
+def _css_for(name, attrs) -> str:
+    """Translate a find()/find_all() query into a CSS selector"""
+    names = name if isinstance(name, (list, tuple)) else [name or '']
+    names = [tag for tag in names if not tag or _TAG_NAME.match(tag)]
+    suffix = ''
+    for attr, value in attrs.items():
+        if value is None:
+            continue
+        if attr == 'class':
+            suffix += ''.join('.' + cls for cls in str(value).split())
+        elif value is True:
+            suffix += f'[{attr}]'
+        else:
+            suffix += f'[{attr}="{value}"]'
+    return ', '.join((tag or '*') + suffix for tag in names)
+
+
+class SelectolaxNode:
+    """Minimal BeautifulSoup-compatible wrapper around a selectolax node"""
+
+    __slots__ = ('_node',)
+
+    def __init__(self, node):
+        self._node = node
+
+    def _query(self, name, attrs, class_, kwargs) -> str:
+        attrs = dict(attrs or {})
+        if class_ is not None:
+            attrs['class'] = class_
+        attrs.update(kwargs)
+        return _css_for(name, attrs)
+
+    def _matches(self, css: str, limit: Optional[int] = None) -> List['SelectolaxNode']:
+        results = []
+        if not css:
+            return results
+        for node in self._node.css(css):
+            # selectolax includes the context node itself; BeautifulSoup does not
+            if node == self._node:
+                continue
+            results.append(SelectolaxNode(node))
+            if limit and len(results) >= limit:
+                break
+        return results
+
+    def _find_text(self, pattern) -> Optional[str]:
+        for node in self._node.traverse(include_text=True):
+            if node.tag != '-text':
+                continue
+            text = node.text(deep=False)
+            if hasattr(pattern, 'search') and pattern.search(text):
+                return text
+            if pattern is True or text == pattern:
+                return text
+        return None
+
+    def find_all(self, name=None, attrs=None, class_=None, text=None,
+                 limit=None, **kwargs) -> List[Any]:
+        if text is not None and name is None:
+            found = self._find_text(text)
+            return [found] if found is not None else []
+        return self._matches(self._query(name, attrs, class_, kwargs), limit)
+
+    def find(self, name=None, attrs=None, class_=None, text=None, **kwargs):
+        results = self.find_all(name, attrs, class_, text, limit=1, **kwargs)
+        return results[0] if results else None
+
+    def select(self, selector: str) -> List['SelectolaxNode']:
+        return self._matches(selector)
+
+    def select_one(self, selector: str) -> Optional['SelectolaxNode']:
+        results = self._matches(selector, limit=1)
+        return results[0] if results else None
+
+    def get_text(self, separator: str = '', strip: bool = False) -> str:
+        return self._node.text(deep=True, separator=separator, strip=strip)
+
+    def get(self, key: str, default=None):
+        value = self._node.attributes.get(key)
+        if value is None:
+            return default
+        if key == 'class':
+            return value.split()
+        return value
+
+    @property
+    def string(self) -> str:
+        return self._node.text(deep=True)
+
+    @property
+    def name(self) -> str:
+        return self._node.tag
+
+    def __bool__(self) -> bool:
+        return True
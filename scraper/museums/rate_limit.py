@@ -0,0 +1,164 @@
+"""
+Per-host token-bucket rate limiter shared by every scraper in a run
+
+Each host has its own bucket, refilled at one request per `interval`
+seconds and holding up to `burst` requests: a few requests to a host go
+out at once, then settle to the configured rate. Requests to different
+hosts never wait for each other, and callers only wait for whatever is
+left of their slot. Hosts can be given their own interval, and a
+robots.txt Crawl-delay (read once per host) raises the host's interval
+and drops its burst to one.
+
+    limiter = shared_limiter(config['rate_limit'])
+    limiter.wait(url)               # threads and Selenium drivers
+    await limiter.wait_async(url)   # aiohttp and Playwright
+"""
+
+import asyncio
+import threading
+import time
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+from urllib.request import Request, urlopen
+from urllib.robotparser import RobotFileParser
+
+
+def host_of(url: str) -> str:
+    return urlsplit(url).netloc.lower() or url
+
+
+def fetch_crawl_delay(url: str, user_agent: str = '*', timeout: float = 10) -> Optional[float]:
+    """Crawl-delay that the robots.txt of url's host sets for user_agent, if any"""
+    parts = urlsplit(url)
+    robots_url = f"{parts.scheme}://{parts.netloc}/robots.txt"
+    try:
+        with urlopen(Request(robots_url, headers={'User-Agent': 'Mozilla/5.0'}), timeout=timeout) as response:
+            lines = response.read().decode('utf-8', 'replace').splitlines()
+    except (OSError, ValueError):
+        # Missing or unreachable robots.txt: no delay requested
+        return None
+    parser = RobotFileParser()
+    parser.parse(lines)
+    delay = parser.crawl_delay(user_agent)
+    return float(delay) if delay else None
+
+
+class TokenBucket:
+    """Request tokens for one host
+
+    reserve() may take the bucket below zero: each caller then waits for
+    its own future token, so concurrent callers are served in order.
+    """
+
+    __slots__ = ('interval', 'burst', 'tokens', 'updated')
+
+    def __init__(self, interval: float, burst: int = 1):
+        self.interval = interval
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+
+    def reserve(self, now: float) -> float:
+        """Take a token; returns seconds until it is actually available"""
+        if self.interval <= 0:
+            return 0.0
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) / self.interval)
+        self.updated = now
+        self.tokens -= 1
+        return max(0.0, -self.tokens * self.interval)
+
+    def slow_to(self, interval: float):
+        """At most one request per interval seconds from now on"""
+        self.interval = max(self.interval, interval)
+        self.burst = 1
+        self.tokens = min(self.tokens, 1.0)
+
+
+class RateLimiter:
+    def __init__(self, interval: float = 1.0, burst: int = 1,
+                 hosts: Optional[Dict[str, float]] = None, crawl_delay: bool = False,
+                 user_agent: str = '*', robots_timeout: float = 10):
+        self.interval = interval
+        self.burst = burst
+        self.hosts = {host.lower(): value for host, value in (hosts or {}).items()}
+        self.respect_crawl_delay = crawl_delay
+        self.user_agent = user_agent
+        self.robots_timeout = robots_timeout
+        # host -> Crawl-delay (None when robots.txt sets none)
+        self.crawl_delays: Dict[str, Optional[float]] = {}
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._robots_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, settings: Dict[str, Any]) -> 'RateLimiter':
+        """Limiter described by the 'rate_limit' config section"""
+        return cls(interval=settings['interval'],
+                   burst=settings['burst'],
+                   hosts=settings['hosts'],
+                   crawl_delay=settings['crawl_delay'],
+                   user_agent=settings['user_agent'],
+                   robots_timeout=settings['robots_timeout'])
+
+    def _bucket(self, host: str) -> TokenBucket:
+        # Callers hold self._lock
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = self._buckets[host] = TokenBucket(self.hosts.get(host, self.interval), self.burst)
+        return bucket
+
+    def _needs_robots(self, url: str) -> bool:
+        return (self.respect_crawl_delay and url.startswith(('http://', 'https://'))
+                and host_of(url) not in self.crawl_delays)
+
+    def _read_robots(self, url: str):
+        """Apply the host's Crawl-delay, reading robots.txt on the first request only"""
+        host = host_of(url)
+        with self._lock:
+            lock = self._robots_locks.setdefault(host, threading.Lock())
+        with lock:
+            if host in self.crawl_delays:
+                return
+            delay = fetch_crawl_delay(url, self.user_agent, self.robots_timeout)
+            with self._lock:
+                self.crawl_delays[host] = delay
+                if delay:
+                    self._bucket(host).slow_to(delay)
+        if delay:
+            print(f"robots.txt of {host} asks for {delay:g}s between requests")
+
+    def _reserve(self, url: str) -> float:
+        """Book the next slot for url's host; return how long to wait for it"""
+        with self._lock:
+            return self._bucket(host_of(url)).reserve(time.monotonic())
+
+    def wait(self, url: str) -> float:
+        """Block until a request to url's host is allowed; returns seconds waited"""
+        if self._needs_robots(url):
+            self._read_robots(url)
+        delay = self._reserve(url)
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    async def wait_async(self, url: str) -> float:
+        if self._needs_robots(url):
+            await asyncio.get_running_loop().run_in_executor(None, self._read_robots, url)
+        delay = self._reserve(url)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+
+_shared: Optional[RateLimiter] = None
+_shared_lock = threading.Lock()
+
+
+def shared_limiter(settings: Dict[str, Any]) -> RateLimiter:
+    """The limiter every scraper in this process shares, built from the
+    'rate_limit' config section on first use"""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = RateLimiter.from_config(settings)
+        return _shared
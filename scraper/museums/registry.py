@@ -0,0 +1,43 @@
+"""
+Registry of museum scrapers by id
+
+Maps each museum id to its scraper class by dotted path, and imports the
+module only when that museum is selected, so running one museum (or a tool
+that never scrapes) does not pay for importing all of them.
+"""
+
+import importlib
+from typing import Dict, Iterable, List, Optional
+
+SCRAPERS = {
+    'moma': 'museums.moma.MoMAScraper',
+    'met': 'museums.met.MetScraper',
+    'nyu': 'museums.nyu.NYUScraper',
+    'arts': 'museums.arts_club.ArtsClubScraper',
+    'explorers': 'museums.explorers.ExplorersScraper',
+    'womens': 'museums.womens_history.WomensHistoryScraper',
+    'asia': 'museums.asia_society.AsiaSocietyScraper',
+}
+
+_classes: Dict[str, type] = {}
+
+
+def museum_ids() -> List[str]:
+    return list(SCRAPERS)
+
+
+def scraper_class(museum_id: str) -> type:
+    """Import and return the scraper class registered for museum_id"""
+    if museum_id not in _classes:
+        try:
+            path = SCRAPERS[museum_id]
+        except KeyError:
+            raise ValueError(f"Unknown museum: {museum_id} (choose from {', '.join(SCRAPERS)})") from None
+        module_name, class_name = path.rsplit('.', 1)
+        _classes[museum_id] = getattr(importlib.import_module(module_name), class_name)
+    return _classes[museum_id]
+
+
+def scraper_classes(selected: Optional[Iterable[str]] = None) -> List[type]:
+    """Classes for the selected museum ids, or for every museum"""
+    return [scraper_class(museum_id) for museum_id in (selected or SCRAPERS)]
@@ -0,0 +1,71 @@
+"""
+Per-URL choice between a plain HTTP fetch and a headless browser render
+
+Pages are fetched statically first. A page escalates to the browser when
+the static parse finds no events or the response is a bot challenge, and
+the mode that worked is remembered per URL, so later runs go straight to
+the cheapest one. Stored modes expire after recheck_days, so browser-only
+URLs get another static try in case the site changed back.
+"""
+
+import json
+import os
+import re
+import time
+from typing import Any, Dict, Optional
+
+STATIC = 'static'
+BROWSER = 'browser'
+
+# Markers of interstitial pages from the common bot-protection services
+_BOT_CHALLENGE = re.compile('|'.join([
+    r'cf-browser-verification', r'challenge-platform', r'cf_chl_opt',
+    r'<title>\s*Just a moment\.\.\.', r'Attention Required! \| Cloudflare',
+    r'Checking your browser before accessing',
+    r'_Incapsula_Resource', r'Pardon Our Interruption',
+    r'px-captcha', r'captcha-delivery\.com', r'geo\.captcha-delivery',
+    r'<title>\s*Access Denied\s*</title>',
+    r'Please enable JS and disable any ad blocker',
+]), re.IGNORECASE)
+
+
+def is_bot_challenge(html: Optional[str]) -> bool:
+    """Whether html is a bot-protection interstitial rather than the page"""
+    # Challenge pages are small; only their head needs checking
+    return bool(html) and _BOT_CHALLENGE.search(html[:20000]) is not None
+
+
+class RenderModeStore:
+    """JSON file of {url: {'mode', 'events', 'checked'}}"""
+
+    def __init__(self, path: str, recheck_days: float = 7):
+        self.path = path
+        self.recheck_after = recheck_days * 24 * 3600
+        self.modes: Dict[str, Dict[str, Any]] = {}
+        self.dirty = False
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    self.modes = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"Ignoring unreadable render mode store {path}: {e}")
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """The stored entry for url, or None if unknown or due for a recheck"""
+        entry = self.modes.get(url)
+        if entry and time.time() - entry['checked'] < self.recheck_after:
+            return entry
+        return None
+
+    def set(self, url: str, mode: str, events: int):
+        self.modes[url] = {'mode': mode, 'events': events, 'checked': time.time()}
+        self.dirty = True
+
+    def save(self):
+        if not self.dirty:
+            return
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(self.modes, f, indent=2, sort_keys=True)
+        self.dirty = False
@@ -0,0 +1,155 @@
+"""
+Retry policy shared by every HTTP fetch path
+
+A transient failure (connection error, timeout, 408/429/5xx) is retried
+after an exponential backoff with decorrelated jitter, or after the
+server's Retry-After when it sends one. Only idempotent methods are
+retried, and every retry spends from a budget shared by the whole run, so
+a site that is down cannot stall a run with endless retries. Successful
+requests never sleep.
+
+    policy = RetryPolicy.from_config(config['retry'])
+    response = policy.call(lambda: session.get(url, timeout=15))
+    result = await policy.call_async(fetch_once)
+"""
+
+import asyncio
+import random
+import threading
+import time
+from collections import namedtuple
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+# One HTTP exchange, read inside the response context so the call can be retried
+FetchResult = namedtuple('FetchResult', ['status', 'headers', 'body'])
+
+RETRYABLE_STATUSES = frozenset({408, 425, 429, 500, 502, 503, 504})
+IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE', 'TRACE'})
+# requests' and aiohttp's connection errors are OSErrors; callers add their
+# library's base error class where it is not
+TRANSIENT_ERRORS: Tuple[type, ...] = (OSError, asyncio.TimeoutError, TimeoutError)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP-date)"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError, IndexError, OverflowError):
+        return None
+
+
+def _status(result: Any) -> Optional[int]:
+    # aiohttp responses have .status, requests responses .status_code
+    status = getattr(result, 'status', None)
+    return status if status is not None else getattr(result, 'status_code', None)
+
+
+class RetryBudget:
+    """Retries left for the whole run, shared by every scraper and thread"""
+
+    def __init__(self, total: Optional[int]):
+        self.remaining = total
+        self._lock = threading.Lock()
+        self._warned = False
+
+    def spend(self) -> bool:
+        if self.remaining is None:
+            return True
+        with self._lock:
+            if self.remaining > 0:
+                self.remaining -= 1
+                return True
+            if not self._warned:
+                self._warned = True
+                print("Retry budget for this run is spent; failing fast from now on")
+            return False
+
+
+class RetryPolicy:
+    def __init__(self, max_attempts: int = 3, base_delay: float = 0.5, max_delay: float = 20,
+                 max_retry_after: float = 60, budget: Optional[RetryBudget] = None,
+                 statuses: Iterable[int] = RETRYABLE_STATUSES):
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_retry_after = max_retry_after
+        self.budget = budget or RetryBudget(None)
+        self.statuses = frozenset(statuses)
+
+    @classmethod
+    def from_config(cls, settings: Dict[str, Any]) -> 'RetryPolicy':
+        """Policy described by the 'retry' config section, with a fresh run budget"""
+        return cls(max_attempts=settings['max_attempts'],
+                   base_delay=settings['base_delay'],
+                   max_delay=settings['max_delay'],
+                   max_retry_after=settings['max_retry_after'],
+                   budget=RetryBudget(settings['budget']))
+
+    def backoff(self, previous: float) -> float:
+        """Decorrelated jitter: random between the base delay and 3x the previous one"""
+        return min(self.max_delay, random.uniform(self.base_delay, max(self.base_delay, previous * 3)))
+
+    def next_delay(self, attempt: int, method: str, previous: float, result: Any = None,
+                   error: Optional[BaseException] = None,
+                   statuses: Optional[Iterable[int]] = None) -> Optional[float]:
+        """Seconds to wait before retrying, or None if this outcome is final"""
+        if attempt >= self.max_attempts or method.upper() not in IDEMPOTENT_METHODS:
+            return None
+        retry_after = None
+        if error is None:
+            if _status(result) not in (self.statuses if statuses is None else frozenset(statuses)):
+                return None
+            headers = getattr(result, 'headers', None) or {}
+            retry_after = parse_retry_after(headers.get('Retry-After'))
+            if retry_after is not None and retry_after > self.max_retry_after:
+                # Waiting that long would stall the run; try again next run
+                return None
+        if not self.budget.spend():
+            return None
+        return retry_after if retry_after is not None else self.backoff(previous)
+
+    def call(self, fn: Callable[[], Any], method: str = 'GET',
+             errors: Tuple[type, ...] = TRANSIENT_ERRORS,
+             statuses: Optional[Iterable[int]] = None) -> Any:
+        """Run fn() until it returns a final result; re-raises the last error"""
+        delay = self.base_delay
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                result, error = fn(), None
+            except errors as e:
+                result, error = None, e
+            wait = self.next_delay(attempt, method, delay, result, error, statuses)
+            if wait is None:
+                if error is not None:
+                    raise error
+                return result
+            delay = wait
+            time.sleep(wait)
+
+    async def call_async(self, fn: Callable[[], Awaitable[Any]], method: str = 'GET',
+                         errors: Tuple[type, ...] = TRANSIENT_ERRORS,
+                         statuses: Optional[Iterable[int]] = None) -> Any:
+        """Await fn() until it returns a final result; re-raises the last error"""
+        delay = self.base_delay
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                result, error = await fn(), None
+            except errors as e:
+                result, error = None, e
+            wait = self.next_delay(attempt, method, delay, result, error, statuses)
+            if wait is None:
+                if error is not None:
+                    raise error
+                return result
+            delay = wait
+            await asyncio.sleep(wait)
+
+
+# Behaviour of a fetch path that has not been given a policy: one attempt
+SINGLE_ATTEMPT = RetryPolicy(max_attempts=1)
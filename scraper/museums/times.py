@@ -0,0 +1,91 @@
+"""
+Shared time-range parsing for the scrapers and CSV converter
+
+Turns free text like "6-7:30 pm", "4:00 p.m." or "11:30 am – 12:30 pm" into
+a display string plus 24-hour start/end times, so nothing downstream has to
+parse time text again. Patterns are compiled once and results memoized.
+"""
+
+import re
+from collections import namedtuple
+from functools import lru_cache
+from typing import Optional
+
+TimeRange = namedtuple('TimeRange', ['display', 'start_time', 'end_time'])
+
+_MERIDIEM = r'(?:(?P<{0}>[ap])\.?\s?m\b\.?)'
+_CLOCK = r'(?<![\d:])(?P<h{0}>\d{{1,2}})(?::(?P<m{0}>\d{{2}}))?\s*' + _MERIDIEM.replace('{0}', 'ap{0}') + '?'
+
+_RANGE = re.compile(_CLOCK.format(1) + r'\s*(?:[-–—]|\bto\b)\s*' + _CLOCK.format(2), re.IGNORECASE)
+_SINGLE = re.compile(_CLOCK.format(1), re.IGNORECASE)
+
+
+def _minutes(hour: str, minute: Optional[str], meridiem: Optional[str]) -> Optional[int]:
+    """Minutes after midnight, or None if the clock reading is impossible"""
+    hour, minute = int(hour), int(minute or 0)
+    if minute > 59:
+        return None
+    if meridiem:
+        if not 1 <= hour <= 12:
+            return None
+        hour = hour % 12 + (12 if meridiem.lower() == 'p' else 0)
+    elif hour > 23:
+        return None
+    return hour * 60 + minute
+
+
+def _hhmm(minutes: int) -> str:
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def _display(minutes: int) -> str:
+    hour, minute = divmod(minutes, 60)
+    return f"{hour % 12 or 12}:{minute:02d} {'PM' if hour >= 12 else 'AM'}"
+
+
+def _meridiem(own, other, hour):
+    """A side without am/pm borrows the other side's; bare hours default to PM"""
+    if own or other:
+        return own or other
+    return None if int(hour) > 12 else 'p'
+
+
+def _start_end(match):
+    ap1, ap2 = match.group('ap1'), match.group('ap2')
+    if not (ap1 or ap2 or match.group('m1') or match.group('m2')):
+        # Bare "5-7" is more likely floors or dates than times
+        return None
+    start = _minutes(match.group('h1'), match.group('m1'), _meridiem(ap1, ap2, match.group('h1')))
+    end = _minutes(match.group('h2'), match.group('m2'), _meridiem(ap2, ap1, match.group('h2')))
+    if start is None or end is None:
+        return None
+    if not ap1 and start > end and start >= 12 * 60:
+        # "11-12:30 pm": the meridiem belongs to the end time only
+        start -= 12 * 60
+    elif not ap2 and end < start and end < 12 * 60:
+        end += 12 * 60
+    return start, end
+
+
+@lru_cache(maxsize=2048)
+def parse_time_range(text: str) -> Optional[TimeRange]:
+    """Parse a time or time range; None if the text holds no clock time"""
+    if not text or not isinstance(text, str):
+        return None
+
+    # Take the first candidate that reads as a clock time, so a bare date or
+    # day number earlier in the text does not hide the real time after it
+    for match in _RANGE.finditer(text):
+        times = _start_end(match)
+        if times:
+            start, end = times
+            return TimeRange(f"{_display(start)} - {_display(end)}", _hhmm(start), _hhmm(end))
+
+    for match in _SINGLE.finditer(text):
+        if not (match.group('ap1') or match.group('m1')):
+            continue
+        hour = match.group('h1')
+        start = _minutes(hour, match.group('m1'), _meridiem(match.group('ap1'), None, hour))
+        if start is not None:
+            return TimeRange(_display(start), _hhmm(start), None)
+    return None
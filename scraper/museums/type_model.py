@@ -0,0 +1,161 @@
+"""
+Statistical event-type model trained on the labelled CSV corpus
+
+Multinomial naive Bayes over hashed, IDF-weighted unigrams and bigrams,
+implemented with NumPy only. Features are hashed into a fixed number of
+buckets so the saved artifact is just a few arrays (.npz). predict()
+tokenizes a whole batch with one regex pass, looks every token's bucket up
+in a per-process memo (crc32 runs once per distinct token), and scores the
+batch by summing each text's rows of IDF-weighted class log probabilities
+with one reduceat, so it stays cheap when a run produces thousands of events.
+
+Train with train_type_model.py; scrapers use refine_types() to replace the
+keyword classifier's 'Special Event' fallback with the model's guess.
+"""
+
+import os
+import re
+import zlib
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .classify import DEFAULT_TYPE, EVENT_TYPES
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+N_FEATURES = 2 ** 12
+ALPHA = 0.1
+
+_TOKEN = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+
+# Joins a batch into one string so it is tokenized with a single findall
+_DOC_BREAK = ' qqdocbreakqq '
+_BREAK_TOKEN = _DOC_BREAK.strip()
+
+
+# Bucket id of every distinct token seen in this process
+_buckets: Dict[str, int] = {_BREAK_TOKEN: -1}
+_MAX_BUCKETS = 200000
+
+
+def _bucket_ids(words: List[str]) -> 'np.ndarray':
+    try:
+        return np.fromiter(map(_buckets.__getitem__, words), dtype=np.int64, count=len(words))
+    except KeyError:
+        pass
+    if len(_buckets) > _MAX_BUCKETS:
+        _buckets.clear()
+        _buckets[_BREAK_TOKEN] = -1
+    for token in set(words).difference(_buckets):
+        # crc32 rather than hash(): it must be stable across processes
+        _buckets[token] = zlib.crc32(token.encode('utf-8')) % N_FEATURES
+    return np.fromiter(map(_buckets.__getitem__, words), dtype=np.int64, count=len(words))
+
+
+def _featurize(texts: Sequence[str]) -> List[Tuple['np.ndarray', 'np.ndarray']]:
+    """(bucket ids, text indices) of the batch's unigrams and of its bigrams,
+    each sorted by text index"""
+    ids = _bucket_ids(_TOKEN.findall(_DOC_BREAK.join(texts).lower()))
+    breaks = ids < 0
+    docs = np.cumsum(breaks)
+    # Bigrams are hashed from their unigram buckets, never across texts
+    pairs = ~breaks[:-1] & ~breaks[1:]
+    bigrams = (ids[:-1][pairs] * 1000003 + ids[1:][pairs]) % N_FEATURES
+    return [(ids[~breaks], docs[~breaks]), (bigrams, docs[:-1][pairs])]
+
+
+class TypeModel:
+    def __init__(self, classes: Sequence[str], log_prior, feature_log_prob, idf):
+        self.classes = list(classes)
+        self.log_prior = log_prior
+        self.feature_log_prob = feature_log_prob
+        self.idf = idf
+        # IDF-weighted log probabilities, (N_FEATURES, classes)
+        self.weights = np.ascontiguousarray((feature_log_prob * idf).T, dtype=np.float32)
+
+    @classmethod
+    def train(cls, texts: Sequence[str], labels: Sequence[str], alpha: float = ALPHA) -> 'TypeModel':
+        classes = sorted(set(labels))
+        class_ids = np.array([classes.index(label) for label in labels], dtype=np.int64)
+        indices, token_docs = (np.concatenate(arrays) for arrays in zip(*_featurize(texts)))
+
+        # Document frequency counts each bucket once per text
+        pairs = np.unique(token_docs * N_FEATURES + indices)
+        df = np.bincount(pairs % N_FEATURES, minlength=N_FEATURES)
+        idf = np.log((1 + len(texts)) / (1 + df)) + 1
+
+        counts = np.zeros((len(classes), N_FEATURES))
+        np.add.at(counts, (class_ids[token_docs], indices), idf[indices])
+        smoothed = counts + alpha
+        feature_log_prob = np.log(smoothed / smoothed.sum(axis=1, keepdims=True))
+        log_prior = np.log(np.bincount(class_ids, minlength=len(classes)) / len(labels))
+        return cls(classes, log_prior.astype(np.float32),
+                   feature_log_prob.astype(np.float32), idf.astype(np.float32))
+
+    def save(self, path: str):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        np.savez_compressed(path, classes=np.array(self.classes), log_prior=self.log_prior,
+                            feature_log_prob=self.feature_log_prob, idf=self.idf)
+
+    @classmethod
+    def load(cls, path: str) -> 'TypeModel':
+        with np.load(path) as data:
+            if data['idf'].shape[0] != N_FEATURES:
+                raise ValueError(f"{path} was trained with {data['idf'].shape[0]} features")
+            return cls(data['classes'].tolist(), data['log_prior'],
+                       data['feature_log_prob'], data['idf'])
+
+    def predict(self, texts: Sequence[str]) -> List[str]:
+        """Most likely type for every text, scored in one vectorized pass"""
+        if not texts:
+            return []
+        n_texts = len(texts)
+        scores = np.tile(self.log_prior, (n_texts, 1))
+        for ids, docs in _featurize(texts):
+            # Every token's class weights, summed over each text's run of
+            # tokens; the zero row lets a run end at the last token
+            rows = np.vstack([self.weights[ids], np.zeros((1, len(self.classes)), dtype=np.float32)])
+            starts = np.searchsorted(docs, np.arange(n_texts))
+            present = np.bincount(docs, minlength=n_texts) > 0
+            scores[present] += np.add.reduceat(rows, starts, axis=0)[present]
+        return [self.classes[i] for i in scores.argmax(axis=1)]
+
+
+_loaded_models: Dict[str, Optional[TypeModel]] = {}
+
+
+def load_model(path: str) -> Optional[TypeModel]:
+    """Load (once) the model at path; None if NumPy or the artifact is missing"""
+    if path not in _loaded_models:
+        model = None
+        if not HAS_NUMPY:
+            print("NumPy not installed; keeping keyword event types")
+        elif not os.path.exists(path):
+            print(f"No event type model at {path}; run train_type_model.py")
+        else:
+            try:
+                model = TypeModel.load(path)
+            except (OSError, ValueError, KeyError) as e:
+                print(f"Could not load event type model {path}: {e}")
+        _loaded_models[path] = model
+    return _loaded_models[path]
+
+
+def refine_types(events: Iterable[Dict[str, Any]], model: Optional[TypeModel]) -> int:
+    """Re-type events left at the keyword fallback with one batched prediction;
+    guesses outside the scrapers' type vocabulary (EVENT_TYPES) are ignored"""
+    if model is None:
+        return 0
+    pending = [event for event in events
+               if event.get('type') == DEFAULT_TYPE and (event.get('title') or '').strip()]
+    texts = [f"{event['title']} {event.get('description') or ''}" for event in pending]
+    changed = 0
+    for event, event_type in zip(pending, model.predict(texts)):
+        if event_type != event['type'] and event_type in EVENT_TYPES:
+            event['type'] = event_type
+            changed += 1
+    return changed
@@ -1,10 +1,15 @@
 # museums/womens_history.py
 from typing import List, Dict, Any
-from bs4 import BeautifulSoup
 from .base import BaseScraper
 import re
 
 class WomensHistoryScraper(BaseScraper):
+    parse_targets = [
+        ('div', {'class': 'program-item'}),
+        ('article', {'class': 'event'}),
+        ('div', {'class': 'views-row'}),
+    ]
+    
     def __init__(self, session):
         super().__init__(session)
         self.museum_id = "womens"
@@ -19,7 +24,7 @@ class WomensHistoryScraper(BaseScraper):
         ]
         
     async def parse_events(self, html: str, url: str) -> List[Dict[str, Any]]:
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = self.make_soup(html)
         events = []
         
         # NY Historical Society structure
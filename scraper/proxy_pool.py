@@ -0,0 +1,176 @@
+"""
+Scored pool of HTTP proxies for ProxyRotationScraper
+Every proxy keeps an EWMA of its latency and success rate, updated by
+health checks and by real requests. pick() chooses among the healthy ones
+weighted by score; a proxy that fails eject_after times in a row (or whose
+success rate sinks below min_success) is ejected for eject_seconds and
+then given another chance. Each proxy has its own session and connector,
+so connections through it are reused.
+
+The connector factory is injectable, so the pool can be exercised against
+local stand-in proxy servers:
+
+    pool = ProxyPool(['http://127.0.0.1:8899'], check_url='http://127.0.0.1:8000/')
+"""
+
+import asyncio
+import random
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import aiohttp
+
+
+class NoProxyAvailable(Exception):
+    """Every proxy in the pool is ejected or was already tried for this request"""
+
+
+def proxy_connector(proxy_url: str):
+    """aiohttp-proxy connector that sends every request through proxy_url"""
+    from aiohttp_proxy import ProxyConnector
+    return ProxyConnector.from_url(proxy_url)
+
+
+class ProxyStats:
+    __slots__ = ('url', 'latency', 'measured', 'success', 'failures', 'requests', 'ejected_until')
+
+    def __init__(self, url: str):
+        self.url = url
+        self.latency = 1.0       # EWMA seconds; a neutral prior until measured
+        self.measured = False
+        self.success = 1.0       # EWMA of 1 for success, 0 for failure
+        self.failures = 0        # consecutive failures
+        self.requests = 0
+        self.ejected_until = 0.0
+
+    @property
+    def score(self) -> float:
+        # Reliability counts twice as much as speed
+        return self.success ** 2 / max(self.latency, 0.05)
+
+    def __repr__(self) -> str:
+        return (f"ProxyStats({self.url!r}, latency={self.latency:.2f}s, "
+                f"success={self.success:.2f}, failures={self.failures})")
+
+
+class ProxyPool:
+    def __init__(self, proxies: Iterable[str], check_url: str, alpha: float = 0.3,
+                 eject_after: int = 3, eject_seconds: float = 600, min_success: float = 0.2,
+                 check_interval: float = 300, timeout: float = 10,
+                 connector_factory: Optional[Callable[[str], Any]] = None):
+        self.stats: Dict[str, ProxyStats] = {url: ProxyStats(url) for url in proxies}
+        self.check_url = check_url
+        self.alpha = alpha
+        self.eject_after = eject_after
+        self.eject_seconds = eject_seconds
+        self.min_success = min_success
+        self.check_interval = check_interval
+        self.timeout = timeout
+        self.connector_factory = connector_factory or proxy_connector
+        self._sessions: Dict[str, aiohttp.ClientSession] = {}
+        self._last_check = None
+
+    @classmethod
+    def from_config(cls, settings: Dict[str, Any], proxies: Optional[Iterable[str]] = None,
+                    **kwargs) -> 'ProxyPool':
+        """Pool described by the 'proxies' config section (or over the given proxies)"""
+        return cls(settings['urls'] if proxies is None else proxies, settings['check_url'],
+                   alpha=settings['ewma_alpha'],
+                   eject_after=settings['eject_after_failures'],
+                   eject_seconds=settings['eject_seconds'],
+                   check_interval=settings['check_interval_s'], **kwargs)
+
+    def __len__(self) -> int:
+        return len(self.stats)
+
+    def available(self) -> List[ProxyStats]:
+        now = time.monotonic()
+        return [stats for stats in self.stats.values() if stats.ejected_until <= now]
+
+    def session_for(self, proxy: str) -> aiohttp.ClientSession:
+        """The proxy's own session, so its connections are kept alive between requests"""
+        session = self._sessions.get(proxy)
+        if session is None or session.closed:
+            session = aiohttp.ClientSession(
+                connector=self.connector_factory(proxy),
+                timeout=aiohttp.ClientTimeout(total=self.timeout))
+            self._sessions[proxy] = session
+        return session
+
+    def record(self, proxy: str, ok: bool, latency: Optional[float] = None):
+        """Fold one request's outcome into the proxy's EWMAs; eject it if it keeps failing"""
+        stats = self.stats[proxy]
+        stats.requests += 1
+        stats.success += self.alpha * ((1.0 if ok else 0.0) - stats.success)
+        if ok:
+            stats.failures = 0
+            if latency is not None:
+                # The first sample replaces the prior instead of being averaged into it
+                if stats.measured:
+                    stats.latency += self.alpha * (latency - stats.latency)
+                else:
+                    stats.latency, stats.measured = latency, True
+            return
+        stats.failures += 1
+        if stats.failures >= self.eject_after or stats.success < self.min_success:
+            stats.ejected_until = time.monotonic() + self.eject_seconds
+            # On return it starts from a clean slate rather than instantly re-ejecting
+            stats.failures = 0
+            stats.success = max(stats.success, self.min_success * 2)
+            print(f"Ejected proxy {proxy} for {self.eject_seconds:.0f}s")
+
+    def pick(self, exclude: Iterable[str] = ()) -> Optional[str]:
+        """A healthy proxy, chosen with probability proportional to its score"""
+        exclude = set(exclude)
+        candidates = [stats for stats in self.available() if stats.url not in exclude]
+        if not candidates:
+            return None
+        return random.choices(candidates, weights=[stats.score for stats in candidates])[0].url
+
+    async def check(self, proxy: str) -> bool:
+        start = time.perf_counter()
+        try:
+            async with self.session_for(proxy).get(self.check_url) as response:
+                await response.read()
+                ok = response.status < 400
+        except (aiohttp.ClientError, asyncio.TimeoutError, OSError):
+            ok = False
+        self.record(proxy, ok, time.perf_counter() - start)
+        return ok
+
+    async def health_check(self) -> int:
+        """Check every proxy that is not ejected, concurrently; returns how many passed"""
+        self._last_check = time.monotonic()
+        results = await asyncio.gather(*(self.check(stats.url) for stats in self.available()))
+        return sum(results)
+
+    async def ensure_checked(self):
+        """Run a health check if none ran in the last check_interval seconds"""
+        if self._last_check is None or time.monotonic() - self._last_check >= self.check_interval:
+            healthy = await self.health_check()
+            print(f"Proxy health check: {healthy}/{len(self)} healthy")
+
+    async def get(self, url: str, exclude: Iterable[str] = (),
+                  **kwargs) -> Tuple[Optional[str], int, Dict[str, str], str]:
+        """GET url through a picked proxy; returns (proxy, status, headers, body)
+        with status 0 if the request failed, and proxy None if none is usable"""
+        proxy = self.pick(exclude)
+        if proxy is None:
+            return None, 0, {}, ''
+        start = time.perf_counter()
+        try:
+            async with self.session_for(proxy).get(url, **kwargs) as response:
+                body = await response.text()
+                status, headers = response.status, response.headers
+        except (aiohttp.ClientError, asyncio.TimeoutError, OSError) as e:
+            print(f"Proxy {proxy} failed for {url}: {e!r}")
+            self.record(proxy, False)
+            return proxy, 0, {}, ''
+        # 407/5xx point at the proxy; other statuses are the site's answer
+        self.record(proxy, status != 407 and status < 500, time.perf_counter() - start)
+        return proxy, status, headers, body
+
+    async def close(self):
+        for session in self._sessions.values():
+            await session.close()
+        self._sessions = {}
@@ -0,0 +1,115 @@
+"""
+Request blocking for headless browser page loads
+The scrapers only read text, so images, fonts, media and analytics scripts
+are dropped before they are fetched. Policies are per museum and come from
+the 'resource_blocking' section of the config:
+
+    'default': {'block_types': [...], 'deny_domains': [...], 'allow_domains': [...]}
+    'museums': {'moma': {...}}   # keys override the default for that museum
+
+Museums are named by their registry ids (museums/registry.py: 'moma', 'met',
+'nyu', 'arts', 'explorers', 'womens', 'asia').
+
+Selenium applies a policy through CDP Network.setBlockedURLs, which matches
+URL patterns only: resource types become file-extension patterns and
+allow_domains only exempt hosts from deny_domains. Playwright routing sees
+the real resource type and exempts allow_domains from every rule.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional
+from urllib.parse import urlsplit
+
+from config import load_config
+
+# File extensions used to block a resource type by URL (CDP cannot see types)
+TYPE_EXTENSIONS = {
+    'image': ('png', 'jpg', 'jpeg', 'gif', 'webp', 'avif', 'svg', 'ico', 'bmp'),
+    'font': ('woff', 'woff2', 'ttf', 'otf', 'eot'),
+    'media': ('mp4', 'webm', 'mov', 'm4v', 'mp3', 'm4a', 'ogg', 'wav', 'm3u8'),
+    'stylesheet': ('css',),
+}
+
+
+def _matches(host: str, domains: Iterable[str]) -> bool:
+    return any(host == domain or host.endswith('.' + domain) for domain in domains)
+
+
+class BlockingPolicy:
+    def __init__(self, block_types: Iterable[str] = (), deny_domains: Iterable[str] = (),
+                 allow_domains: Iterable[str] = ()):
+        self.block_types = frozenset(block_types)
+        self.deny_domains = tuple(d.lower() for d in deny_domains)
+        self.allow_domains = tuple(d.lower() for d in allow_domains)
+
+    def __bool__(self) -> bool:
+        return bool(self.block_types or self.deny_domains)
+
+    def blocks(self, url: str, resource_type: str) -> bool:
+        """Whether a request of resource_type to url should be aborted"""
+        host = (urlsplit(url).hostname or '').lower()
+        if _matches(host, self.allow_domains):
+            return False
+        return resource_type in self.block_types or _matches(host, self.deny_domains)
+
+    def url_patterns(self) -> List[str]:
+        """Wildcard patterns for CDP Network.setBlockedURLs"""
+        patterns = []
+        for resource_type in sorted(self.block_types):
+            for extension in TYPE_EXTENSIONS.get(resource_type, ()):
+                patterns += [f'*.{extension}', f'*.{extension}?*']
+        for domain in self.deny_domains:
+            if not _matches(domain, self.allow_domains):
+                patterns += [f'*://{domain}/*', f'*://*.{domain}/*']
+        return patterns
+
+
+def policy_for(museum: Optional[str] = None, config: Optional[Dict[str, Any]] = None) -> BlockingPolicy:
+    """The blocking policy for a museum id (or the default one)"""
+    settings = (config or load_config())['resource_blocking']
+    if not settings.get('enabled', True):
+        return BlockingPolicy()
+    policy = dict(settings['default'])
+    policy.update(settings.get('museums', {}).get(museum, {}))
+    return BlockingPolicy(policy.get('block_types', ()), policy.get('deny_domains', ()),
+                          policy.get('allow_domains', ()))
+
+
+class Policies:
+    """Policies by museum id from one loaded config, each built once"""
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        self.config = config or load_config()
+        self._policies: Dict[Optional[str], BlockingPolicy] = {}
+
+    def __call__(self, museum: Optional[str] = None) -> BlockingPolicy:
+        policy = self._policies.get(museum)
+        if policy is None:
+            policy = self._policies[museum] = policy_for(museum, self.config)
+        return policy
+
+
+def block_with_cdp(driver, policy: BlockingPolicy) -> bool:
+    """Install policy on a Chrome driver; replaces any earlier policy"""
+    try:
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': policy.url_patterns()})
+        return True
+    except Exception as e:
+        # Not a Chromium driver; pages load everything as before
+        print(f"⚠️ Resource blocking unavailable: {e}")
+        return False
+
+
+async def block_with_route(target, policy: BlockingPolicy):
+    """Install policy on a Playwright page or browser context"""
+    if not policy:
+        return
+
+    async def handle(route):
+        request = route.request
+        if policy.blocks(request.url, request.resource_type):
+            await route.abort()
+        else:
+            await route.continue_()
+
+    await target.route('**/*', handle)
@@ -1,14 +1,66 @@
+import argparse
 import asyncio
 import aiohttp
 import json
 from datetime import datetime
 import os
-from museums import moma, met, nyu, arts_club, explorers, womens_history, asia_society
+from concurrent.futures import ProcessPoolExecutor
+from config import load_config
+from museums.archive import FetchArchive, RECORD, REPLAY, archive_from_env
+from museums.event import to_dicts
+from museums.http_cache import HTTPCache
+from museums.parse_cache import ParseCache
+from museums.rate_limit import shared_limiter
+from museums.registry import museum_ids, scraper_classes
+from museums.render_modes import RenderModeStore
+from museums.retry import RetryPolicy
 
 class MuseumEventsScraper:
-    def __init__(self):
+    def __init__(self, config=None, use_cache=True, archive=None, museums=None, escalate=True):
+        self.config = config or load_config()
+        # Museum ids to scrape (see museums/registry.py); None scrapes all
+        self.museums = museums
         self.scrapers = []
         self.all_events = []
+        self.http_cache = None
+        self.parse_cache = None
+        self.parse_executor = None
+        self.archive = archive
+        # One policy, and so one retry budget, for every museum in the run
+        self.retry_policy = RetryPolicy.from_config(self.config['retry'])
+        # Per-host request rate; hosts proceed in parallel, each at its own pace
+        self.rate_limiter = shared_limiter(self.config['rate_limit'])
+        self.renderer = None
+        self.render_modes = None
+        # Browser escalation for pages plain HTTP cannot handle; archived runs
+        # only ever see the recorded responses
+        escalation = self.config['render_escalation']
+        if escalate and escalation['enabled'] and not archive:
+            # Imported here: the renderer modules are only needed when enabled
+            if escalation['engine'] == 'playwright':
+                from proxy_scraper import PlaywrightRenderService
+                self.renderer = PlaywrightRenderService(rate_limiter=self.rate_limiter,
+                                                        config=self.config)
+            else:
+                from browser_pool import PoolRenderer
+                self.renderer = PoolRenderer(size=escalation['browsers'],
+                                             rate_limiter=self.rate_limiter,
+                                             config=self.config)
+            self.render_modes = RenderModeStore(escalation['modes_file'],
+                                                escalation['recheck_days'])
+        # Recordings and replays must see the real responses, not cached ones
+        if use_cache and not archive:
+            cache_config = self.config['http_cache']
+            self.http_cache = HTTPCache(
+                cache_config['dir'],
+                max_bytes=cache_config['max_mb'] * 1024 * 1024,
+                max_age=cache_config['max_age_days'] * 24 * 3600
+            )
+            cache_config = self.config['parse_cache']
+            self.parse_cache = ParseCache(
+                cache_config['dir'],
+                max_age=cache_config['max_age_days'] * 24 * 3600
+            )
         
     async def initialize(self):
         """Initialize all museum scrapers with a shared session."""
@@ -23,18 +75,34 @@ class MuseumEventsScraper:
         }
         
         timeout = aiohttp.ClientTimeout(total=30)
-        self.session = aiohttp.ClientSession(headers=headers, timeout=timeout)
+        # The connector caps open connections overall and per host, so every
+        # scraper fanning out over its URLs shares the same limits
+        connector = aiohttp.TCPConnector(
+            limit=self.config['max_concurrency'],
+            limit_per_host=self.config['per_host_concurrency']
+        )
+        self.session = aiohttp.ClientSession(headers=headers, timeout=timeout, connector=connector)
+        
+        # Parsing is CPU-bound; run it in worker processes so one museum's
+        # parse does not stall every other museum's network I/O
+        workers = self.config['parse_workers']
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers > 1:
+            self.parse_executor = ProcessPoolExecutor(max_workers=workers)
         
-        # Initialize all scrapers
-        self.scrapers = [
-            moma.MoMAScraper(self.session),
-            met.MetScraper(self.session),
-            nyu.NYUScraper(self.session),
-            arts_club.ArtsClubScraper(self.session),
-            explorers.ExplorersScraper(self.session),
-            womens_history.WomensHistoryScraper(self.session),
-            asia_society.AsiaSocietyScraper(self.session)
-        ]
+        # Initialize the selected scrapers; only their modules get imported
+        self.scrapers = [scraper_class(self.session) for scraper_class in scraper_classes(self.museums)]
+        for scraper in self.scrapers:
+            scraper.http_cache = self.http_cache
+            scraper.parse_cache = self.parse_cache
+            scraper.parser_engine = self.config['parser_engine']
+            scraper.parse_executor = self.parse_executor
+            scraper.archive = self.archive
+            scraper.retry_policy = self.retry_policy
+            scraper.rate_limiter = self.rate_limiter
+            scraper.renderer = self.renderer
+            scraper.render_modes = self.render_modes
         
     async def scrape_all(self):
         """Run all scrapers concurrently."""
@@ -54,10 +122,30 @@ class MuseumEventsScraper:
                 self.all_events.extend(result)
             else:
                 print(f"No events found from {self.scrapers[i].museum_name}")
+        
+        # One batched prediction for every event the keywords could not type
+        # (imported here so NumPy is only loaded once there are events)
+        from museums.type_model import load_model, refine_types
+        refined = refine_types(self.all_events, load_model(self.config['type_model']))
+        if refined:
+            print(f"Event type model re-typed {refined} 'Special Event' events")
                 
     async def close(self):
         """Close the session."""
         await self.session.close()
+        if self.parse_executor:
+            self.parse_executor.shutdown()
+        if self.http_cache:
+            self.http_cache.evict()
+        if self.parse_cache:
+            self.parse_cache.evict()
+        if self.renderer:
+            # PoolRenderer closes synchronously, the Playwright service is async
+            closing = self.renderer.close()
+            if asyncio.iscoroutine(closing):
+                await closing
+        if self.render_modes:
+            self.render_modes.save()
         
     def save_events(self, filename='../data/events.json'):
         """Save all events to a JSON file."""
@@ -66,7 +154,7 @@ class MuseumEventsScraper:
         
         data = {
             'last_updated': datetime.now().isoformat(),
-            'events': self.all_events
+            'events': to_dicts(self.all_events)
         }
         
         with open(filename, 'w', encoding='utf-8') as f:
@@ -74,16 +162,42 @@ class MuseumEventsScraper:
             
         print(f"Saved {len(self.all_events)} events to {filename}")
 
-async def main():
-    scraper = MuseumEventsScraper()
+async def main(use_cache=True, archive=None, museums=None, output='../data/events.json',
+               escalate=True):
+    scraper = MuseumEventsScraper(use_cache=use_cache, archive=archive, museums=museums,
+                                  escalate=escalate)
     try:
         await scraper.initialize()
         await scraper.scrape_all()
-        scraper.save_events()
+        scraper.save_events(output)
     finally:
         await scraper.close()
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Scrape museum events')
+    parser.add_argument('--museum', action='append', choices=museum_ids(),
+                       help='Only scrape this museum (repeatable; default: all)')
+    parser.add_argument('--output', default='../data/events.json',
+                       help='Where to write the scraped events')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Ignore the HTTP and parse caches and process every page in full')
+    parser.add_argument('--static-only', action='store_true',
+                       help='Never render pages in a browser, even when plain HTTP finds no events')
+    parser.add_argument('--record', metavar='ARCHIVE',
+                       help='Record every request and response to a .jsonl.gz archive')
+    parser.add_argument('--replay', metavar='ARCHIVE',
+                       help='Serve every request from a recorded archive (offline)')
+    args = parser.parse_args()
+    
+    if args.replay:
+        archive = FetchArchive(args.replay, REPLAY)
+    elif args.record:
+        archive = FetchArchive(args.record, RECORD)
+    else:
+        archive = archive_from_env()
+    
     print("Starting museum events scraper...")
-    asyncio.run(main())
+    asyncio.run(main(use_cache=not args.no_cache, archive=archive,
+                     museums=args.museum, output=args.output,
+                     escalate=not args.static_only))
     print("Scraping complete!")
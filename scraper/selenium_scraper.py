@@ -12,16 +12,26 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 from selenium_stealth import stealth
 import undetected_chromedriver as uc
-import time
 import random
 import json
 from datetime import datetime
 import re
-from bs4 import BeautifulSoup
+from browser_waits import scroll_to_end, wait_until_ready
+from config import load_config
+from museums import dates
+from museums.parsing import make_soup
+from museums.rate_limit import shared_limiter
+from museums.retry import RetryPolicy
+from resource_blocking import block_with_cdp, policy_for
 
 class StealthMuseumScraper:
-    def __init__(self):
+    def __init__(self, rate_limiter=None):
         self.events = []
+        config = load_config()
+        # Per-host request rate, shared with every other scraper in the process
+        self.rate_limiter = rate_limiter or shared_limiter(config['rate_limit'])
+        # Backoff, jitter and Retry-After for the plain HTTP API probes
+        self.retry_policy = RetryPolicy.from_config(config['retry'])
         self.setup_driver()
         
     def setup_driver(self):
@@ -84,33 +94,26 @@ class StealthMuseumScraper:
         import os
         return os.environ.get('GITHUB_ACTIONS') == 'true'
     
-    def random_delay(self, min_seconds=1, max_seconds=3):
-        """Add random delay to mimic human behavior"""
-        time.sleep(random.uniform(min_seconds, max_seconds))
+    def load(self, url, selectors=None):
+        """Open url once the host's rate limit allows, and wait until
+        selectors (if given) appear and the page settles"""
+        self.rate_limiter.wait(url)
+        self.driver.get(url)
+        return wait_until_ready(self.driver, selectors)
     
     def scroll_page(self, pause_time=2):
-        """Scroll page to load dynamic content"""
-        last_height = self.driver.execute_script("return document.body.scrollHeight")
-        
-        while True:
-            # Scroll down
-            self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            self.random_delay(pause_time, pause_time + 1)
-            
-            # Check if new content loaded
-            new_height = self.driver.execute_script("return document.body.scrollHeight")
-            if new_height == last_height:
-                break
-            last_height = new_height
+        """Scroll page to load dynamic content, waiting up to pause_time per scroll"""
+        scroll_to_end(self.driver, settle=pause_time)
     
     def scrape_moma(self):
         """Scrape MoMA using Selenium"""
         print("Scraping MoMA...")
         
         try:
+            block_with_cdp(self.driver, policy_for('moma'))
             # Try the main calendar page
-            self.driver.get("https://www.moma.org/calendar/")
-            self.random_delay(3, 5)
+            self.load("https://www.moma.org/calendar/",
+                      ['.calendar-tile', 'article.event-listing'])
             
             # Wait for content to load
             WebDriverWait(self.driver, 10).until(
@@ -121,7 +124,7 @@ class StealthMuseumScraper:
             self.scroll_page()
             
             # Get page source and parse with BeautifulSoup
-            soup = BeautifulSoup(self.driver.page_source, 'html.parser')
+            soup = make_soup(self.driver.page_source)
             
             # Find event tiles
             events = soup.find_all('div', class_='calendar-tile') or \
@@ -191,9 +194,14 @@ class StealthMuseumScraper:
             'Referer': 'https://www.metmuseum.org/events/whats-on'
         }
         
+        def fetch(endpoint):
+            # Every attempt, retries included, waits for the host's turn
+            self.rate_limiter.wait(endpoint)
+            return requests.get(endpoint, headers=headers, timeout=10)
+            
         for endpoint in api_endpoints:
             try:
-                response = requests.get(endpoint, headers=headers, timeout=10)
+                response = self.retry_policy.call(lambda: fetch(endpoint))
                 if response.status_code == 200:
                     data = response.json()
                     print(f"Found API endpoint: {endpoint}")
@@ -204,18 +212,7 @@ class StealthMuseumScraper:
     
     def parse_date(self, date_string):
         """Parse date string to YYYY-MM-DD format"""
-        # Implementation from previous examples
-        try:
-            # Try various date formats
-            for fmt in ['%Y-%m-%d', '%m/%d/%Y', '%B %d, %Y', '%b %d, %Y']:
-                try:
-                    dt = datetime.strptime(date_string, fmt)
-                    return dt.strftime('%Y-%m-%d')
-                except:
-                    continue
-        except:
-            pass
-        return None
+        return dates.parse_date(date_string)
     
     def save_events(self):
         """Save scraped events"""
@@ -5,20 +5,22 @@ Uses multiple strategies to maximize success
 """
 
 import requests
-from bs4 import BeautifulSoup
-import json
-from datetime import datetime
 import time
 import re
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
-import undetected_chromedriver as uc
+from archive_adapters import mount_archive
+from config import load_config
+from museums import dates, jsonld, times
+from museums.archive import archive_from_env
+from museums.classify import event_classifier
+from museums.event import Event
+from museums.parsing import make_soup
+from museums.rate_limit import shared_limiter
+from museums.retry import RetryPolicy
 
 class TargetedMuseumScraper:
-    def __init__(self):
+    def __init__(self, config=None, archive=None):
+        self.config = config or load_config()
+        self.parser_engine = self.config['parser_engine']
         self.events = []
         self.session = requests.Session()
         self.session.headers.update({
@@ -30,6 +32,25 @@ class TargetedMuseumScraper:
             'Connection': 'keep-alive',
             'Upgrade-Insecure-Requests': '1'
         })
+        # Record to or replay from an archive (SCRAPER_RECORD / SCRAPER_REPLAY)
+        self.archive = archive or archive_from_env()
+        if self.archive:
+            mount_archive(self.session, self.archive)
+        # Transient failures are retried before falling through to the next strategy
+        self.retry_policy = RetryPolicy.from_config(self.config['retry'])
+        # Per-host request rate; every attempt, retries included, waits its turn
+        self.rate_limiter = shared_limiter(self.config['rate_limit'])
+        
+    def get(self, url, **kwargs):
+        """GET through the session at the host's rate, retrying transient failures"""
+        kwargs.setdefault('timeout', 15)
+        
+        def attempt():
+            if not self.archive or not self.archive.replaying:
+                self.rate_limiter.wait(url)
+            return self.session.get(url, **kwargs)
+            
+        return self.retry_policy.call(attempt)
         
     def scrape_all_museums(self):
         """Try to scrape all 7 museums using various techniques"""
@@ -82,8 +103,20 @@ class TargetedMuseumScraper:
             except Exception as e:
                 print(f"✗ {museum['name']}: Failed - {str(e)}")
                 
+        self.classify_events()
         return self.events
     
+    def classify_events(self):
+        """Type every event the page did not label, in one pass over the batch"""
+        pending = [event for event in self.events if not event.get('type')]
+        types = event_classifier.classify_many(
+            (event['title'], event.get('description', '')) for event in pending)
+        for event, event_type in zip(pending, types):
+            event['type'] = event_type
+        # Imported here so NumPy is only loaded once there are events
+        from museums.type_model import load_model, refine_types
+        refine_types(pending, load_model(self.config['type_model']))
+    
     # ========== MoMA ==========
     def scrape_moma(self):
         """Scrape MoMA - they use WordPress"""
@@ -101,7 +134,7 @@ class TargetedMuseumScraper:
         
         for url, parser in strategies:
             try:
-                response = self.session.get(url, timeout=10)
+                response = self.get(url, timeout=10)
                 if response.status_code == 200:
                     parser(response, 'moma', 'MoMA')
                     if self.events:  # If we got events, stop trying
@@ -111,7 +144,9 @@ class TargetedMuseumScraper:
                 
     def parse_moma_html(self, response, museum_id, museum_name):
         """Parse MoMA HTML page"""
-        soup = BeautifulSoup(response.text, 'html.parser')
+        if self.parse_jsonld(response, museum_id, museum_name):
+            return
+        soup = make_soup(response.text, self.parser_engine)
         
         # Look for event containers
         selectors = [
@@ -135,26 +170,12 @@ class TargetedMuseumScraper:
         url = 'https://www.metmuseum.org/events/whats-on'
         
         try:
-            response = self.session.get(url)
+            response = self.get(url)
             if response.status_code == 200:
-                # Look for JSON-LD structured data
-                soup = BeautifulSoup(response.text, 'html.parser')
-                scripts = soup.find_all('script', type='application/ld+json')
-                
-                for script in scripts:
-                    try:
-                        data = json.loads(script.string)
-                        if isinstance(data, list):
-                            for item in data:
-                                if item.get('@type') == 'Event':
-                                    self.parse_structured_data(item, 'met', 'The Met')
-                        elif data.get('@type') == 'Event':
-                            self.parse_structured_data(data, 'met', 'The Met')
-                    except:
-                        continue
-                        
-                # Also try regular HTML parsing
-                self.parse_met_html(soup, 'met', 'The Met')
+                # JSON-LD structured data first; the DOM is only parsed without it
+                if not self.parse_jsonld(response, 'met', 'The Met'):
+                    soup = make_soup(response.text, self.parser_engine)
+                    self.parse_met_html(soup, 'met', 'The Met')
                 
         except Exception as e:
             print(f"Met scraping error: {e}")
@@ -179,9 +200,9 @@ class TargetedMuseumScraper:
         
         for url in urls:
             try:
-                response = self.session.get(url)
-                if response.status_code == 200:
-                    soup = BeautifulSoup(response.text, 'html.parser')
+                response = self.get(url)
+                if response.status_code == 200 and not self.parse_jsonld(response, 'nyu', 'NYU Institute'):
+                    soup = make_soup(response.text, self.parser_engine)
                     # NYU often uses simple HTML structure
                     self.parse_academic_events(soup, 'nyu', 'NYU Institute')
             except:
@@ -194,9 +215,9 @@ class TargetedMuseumScraper:
         
         try:
             # Many clubs use event management systems
-            response = self.session.get(url)
-            if response.status_code == 200:
-                soup = BeautifulSoup(response.text, 'html.parser')
+            response = self.get(url)
+            if response.status_code == 200 and not self.parse_jsonld(response, 'arts', 'National Arts Club'):
+                soup = make_soup(response.text, self.parser_engine)
                 
                 # Check for common event management systems
                 if 'tribe-events' in response.text:
@@ -222,9 +243,9 @@ class TargetedMuseumScraper:
                 headers = self.session.headers.copy()
                 headers['Referer'] = 'https://explorers.org/'
                 
-                response = self.session.get(url, headers=headers)
-                if response.status_code == 200:
-                    soup = BeautifulSoup(response.text, 'html.parser')
+                response = self.get(url, headers=headers)
+                if response.status_code == 200 and not self.parse_jsonld(response, 'explorers', 'Explorers Club'):
+                    soup = make_soup(response.text, self.parser_engine)
                     self.parse_generic_events(soup, 'explorers', 'Explorers Club')
             except:
                 continue
@@ -235,12 +256,14 @@ class TargetedMuseumScraper:
         url = 'https://www.nyhistory.org/programs'
         
         try:
-            response = self.session.get(url)
-            if response.status_code == 200:
-                soup = BeautifulSoup(response.text, 'html.parser')
+            response = self.get(url)
+            filter_terms = ['women', 'female', 'gender', 'feminist']
+            if response.status_code == 200 and not self.parse_jsonld(response, 'womens', "Women's History",
+                                                                     filter_terms=filter_terms):
+                soup = make_soup(response.text, self.parser_engine)
                 # Filter for women's history events
                 self.parse_filtered_events(soup, 'womens', "Women's History",
-                                         filter_terms=['women', 'female', 'gender', 'feminist'])
+                                         filter_terms=filter_terms)
         except:
             pass
     
@@ -250,9 +273,9 @@ class TargetedMuseumScraper:
         url = 'https://asiasociety.org/new-york/events'
         
         try:
-            response = self.session.get(url)
-            if response.status_code == 200:
-                soup = BeautifulSoup(response.text, 'html.parser')
+            response = self.get(url)
+            if response.status_code == 200 and not self.parse_jsonld(response, 'asia', 'Asia Society'):
+                soup = make_soup(response.text, self.parser_engine)
                 self.parse_generic_events(soup, 'asia', 'Asia Society')
         except:
             pass
@@ -283,7 +306,7 @@ class TargetedMuseumScraper:
                         'date': date,
                         'time': 'See website for time',
                         'description': '',
-                        'type': 'Special Event',
+                        'type': None,  # classified in batch by classify_events
                         'location': location or f'{museum_name}, New York, NY',
                         'url': f'https://{museum_id}.org/events'
                     }
@@ -293,54 +316,58 @@ class TargetedMuseumScraper:
                     if desc_elem:
                         event['description'] = desc_elem.get_text(strip=True)[:200]
                     
-                    self.events.append(event)
+                    self.add_event(event, date_elem.get_text(' ', strip=True))
                     
         except Exception as e:
             pass
     
+    def parse_jsonld(self, response, museum_id, museum_name, filter_terms=None):
+        """Add events from JSON-LD blocks without building a DOM; returns how many"""
+        added = 0
+        for item in jsonld.extract_events(response.content):
+            if filter_terms:
+                text = (item['title'] + ' ' + item['description']).lower()
+                if not any(term in text for term in filter_terms):
+                    continue
+            if self.parse_structured_data(item, museum_id, museum_name):
+                added += 1
+        return added
+    
     def parse_structured_data(self, data, museum_id, museum_name):
-        """Parse schema.org structured data"""
-        try:
-            date = self.parse_date(data.get('startDate', ''))
-            if date:
-                event = {
-                    'id': f"{museum_id}-web-{len(self.events)}",
-                    'museum': museum_id,
-                    'museumName': museum_name,
-                    'title': data.get('name', ''),
-                    'date': date,
-                    'time': 'See website for time',
-                    'description': data.get('description', '')[:200],
-                    'type': 'Special Event',
-                    'location': data.get('location', {}).get('name', f'{museum_name}, New York, NY'),
-                    'url': data.get('url', '')
-                }
-                self.events.append(event)
-        except:
-            pass
+        """Add an event from a normalized schema.org item (see museums.jsonld)"""
+        date = data['date'] or self.parse_date(data['start_date'])
+        if not date:
+            return False
+        event = {
+            'id': f"{museum_id}-web-{len(self.events)}",
+            'museum': museum_id,
+            'museumName': museum_name,
+            'title': data['title'],
+            'date': date,
+            'time': 'See website for time',
+            'description': data['description'][:200],
+            'type': data['type'] or None,
+            'location': data['location'] or f'{museum_name}, New York, NY',
+            'url': data['url']
+        }
+        self.add_event(event, data['start_date'])
+        return True
     
     def parse_date(self, date_string):
         """Parse date to YYYY-MM-DD format"""
-        if not date_string:
-            return None
-            
-        # Try ISO format
-        try:
-            dt = datetime.fromisoformat(date_string.replace('Z', '+00:00'))
-            return dt.strftime('%Y-%m-%d')
-        except:
-            pass
-            
-        # Try common formats
-        formats = ['%Y-%m-%d', '%m/%d/%Y', '%B %d, %Y', '%b %d, %Y']
-        for fmt in formats:
-            try:
-                dt = datetime.strptime(date_string.strip(), fmt)
-                return dt.strftime('%Y-%m-%d')
-            except:
-                continue
-                
-        return None
+        return dates.parse_date(date_string)
+    
+    def add_event(self, event, time_text=None):
+        """Store an event with 24-hour start/end times parsed from its time
+        text, or from time_text (e.g. the date line) when it has none"""
+        parsed = times.parse_time_range(event['time'])
+        if not parsed and time_text:
+            parsed = times.parse_time_range(time_text)
+            if parsed:
+                event['time'] = parsed.display
+        event['start_time'] = parsed.start_time if parsed else None
+        event['end_time'] = parsed.end_time if parsed else None
+        self.events.append(Event.from_dict(event))
     
     def parse_wordpress_json(self, response, museum_id, museum_name):
         """Parse WordPress REST API response"""
@@ -358,11 +385,11 @@ class TargetedMuseumScraper:
                         'date': date,
                         'time': 'See website for time',
                         'description': '',
-                        'type': 'Special Event',
+                        'type': None,  # classified in batch by classify_events
                         'location': f'{museum_name}, New York, NY',
                         'url': item.get('link', '')
                     }
-                    self.events.append(event)
+                    self.add_event(event)
         except:
             pass
     
@@ -383,11 +410,12 @@ class TargetedMuseumScraper:
                         'date': date,
                         'time': item.get('start_time', 'See website for time'),
                         'description': item.get('description', '')[:200],
-                        'type': 'Special Event',
+                        'type': None,  # classified in batch by classify_events
                         'location': item.get('venue', {}).get('venue', f'{museum_name}, New York, NY'),
                         'url': item.get('url', '')
                     }
-                    self.events.append(event)
+                    # start_date is "YYYY-MM-DD HH:MM:SS"; midnight on all-day events
+                    self.add_event(event, None if item.get('all_day') else item.get('start_date'))
         except:
             pass
     
@@ -407,10 +435,11 @@ class TargetedMuseumScraper:
                 
             for item in events[:20]:
                 # Generic event parsing
-                date = None
+                date = date_text = None
                 for date_field in ['date', 'start_date', 'event_date', 'startDate']:
                     if date_field in item:
-                        date = self.parse_date(item[date_field])
+                        date_text = item[date_field]
+                        date = self.parse_date(date_text)
                         break
                         
                 if date:
@@ -424,11 +453,11 @@ class TargetedMuseumScraper:
                         'date': date,
                         'time': 'See website for time',
                         'description': item.get('description', '')[:200],
-                        'type': 'Special Event',
+                        'type': None,  # classified in batch by classify_events
                         'location': f'{museum_name}, New York, NY',
                         'url': item.get('url', '') or item.get('link', '')
                     }
-                    self.events.append(event)
+                    self.add_event(event, date_text if isinstance(date_text, str) else None)
         except:
             pass
     
@@ -479,7 +508,7 @@ class TargetedMuseumScraper:
                             'location': 'NYU Institute of Fine Arts, 1 East 78th Street, New York, NY',
                             'url': 'https://ifa.nyu.edu/events/'
                         }
-                        self.events.append(event)
+                        self.add_event(event, text[date_match.start():])
     
     def parse_filtered_events(self, soup, museum_id, museum_name, filter_terms):
         """Parse events and filter by terms"""
@@ -513,8 +542,8 @@ class TargetedMuseumScraper:
                         'date': date,
                         'time': 'See website for time',
                         'description': '',
-                        'type': 'Special Event',
+                        'type': None,  # classified in batch by classify_events
                         'location': f'{museum_name}, New York, NY',
                         'url': ''
                     }
-                    self.events.append(event_data)
+                    self.add_event(event_data, date_elem.get_text(' ', strip=True))
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The scrapers import each other (and museums.*) from the scraper directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
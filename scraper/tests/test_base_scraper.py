@@ -0,0 +1,29 @@
+import asyncio
+
+from museums.base import BaseScraper
+
+
+class ListingScraper(BaseScraper):
+    """Scrapes three URLs; the second one always fails"""
+
+    def get_urls(self):
+        return ['https://a.example.org/', 'https://b.example.org/', 'https://c.example.org/']
+
+    async def parse_events(self, html, url):
+        return []
+
+    async def scrape_url(self, url):
+        if url.startswith('https://b.'):
+            raise ConnectionError('connection reset')
+        # The first URL finishes last, so order comes from get_urls()
+        await asyncio.sleep(0.02 if url.startswith('https://a.') else 0)
+        return [{'url': url, 'n': n} for n in range(2)]
+
+
+def test_a_failing_url_does_not_lose_the_others(capsys):
+    events = asyncio.run(ListingScraper(None).scrape())
+    assert [(event['url'], event['n']) for event in events] == [
+        ('https://a.example.org/', 0), ('https://a.example.org/', 1),
+        ('https://c.example.org/', 0), ('https://c.example.org/', 1),
+    ]
+    assert 'Error scraping https://b.example.org/' in capsys.readouterr().out
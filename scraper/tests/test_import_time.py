@@ -0,0 +1,60 @@
+"""
+Import-time budget for the scraper entry points
+
+Each entry point is imported in a fresh interpreter with -X importtime; it
+must fit its budget and must not pull in a heavy module it should only load
+on demand (browsers, NumPy, the museum modules).
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+SCRAPER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+BROWSER = ('selenium', 'undetected_chromedriver', 'selenium_stealth', 'seleniumwire', 'playwright')
+MUSEUM_MODULES = ('museums.moma', 'museums.met', 'museums.nyu', 'museums.arts_club',
+                  'museums.explorers', 'museums.womens_history', 'museums.asia_society')
+
+# entry point: (budget in ms, modules it must not import)
+BUDGETS = {
+    'csv_to_events': (150, BROWSER + ('numpy', 'aiohttp', 'bs4', 'requests')),
+    'integrated_scraper': (150, BROWSER + ('numpy', 'aiohttp', 'bs4')),
+    'hybrid_scraper': (150, BROWSER + ('numpy', 'aiohttp', 'bs4')),
+    'targeted_scraper': (500, BROWSER + ('numpy', 'aiohttp')),
+    'scraper': (600, BROWSER + ('numpy',) + MUSEUM_MODULES),
+}
+
+
+def import_profile(module):
+    """Return (cumulative ms, imported module names) for a fresh import"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            cwd=SCRAPER_DIR, capture_output=True, text=True)
+    assert result.returncode == 0, f"import {module} failed:\n{result.stderr[-2000:]}"
+    total_us, names = 0, set()
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if not cumulative.strip().isdigit():
+            continue
+        name = name.strip()
+        names.add(name)
+        if name == module:
+            total_us = int(cumulative)
+    return total_us / 1000, names
+
+
+@pytest.mark.parametrize('module', list(BUDGETS))
+def test_import_time_budget(module):
+    budget_ms, forbidden = BUDGETS[module]
+    # Best of three to keep noisy CI machines from failing the check
+    profiles = [import_profile(module) for _ in range(3)]
+    elapsed = min(ms for ms, _ in profiles)
+    heavy = sorted(name for name in profiles[0][1]
+                   if any(name == f or name.startswith(f + '.') for f in forbidden))
+
+    assert not heavy, f"{module} imports {', '.join(heavy[:5])} at startup"
+    assert elapsed <= budget_ms, f"{module}: {elapsed:.1f} ms exceeds {budget_ms} ms budget"
@@ -0,0 +1,215 @@
+"""
+ProxyPool against local stand-in proxies
+
+Each stand-in is an aiohttp server on 127.0.0.1; connector_factory gives
+every proxy URL a connector whose resolver sends all traffic to its
+stand-in, so requests for http://events.test/... land there. A proxy with
+no stand-in points at a closed port and fails to connect.
+"""
+
+import asyncio
+import random
+import socket
+
+import aiohttp
+import pytest
+from aiohttp import web
+from aiohttp.abc import AbstractResolver
+
+import proxy_pool
+from proxy_pool import ProxyPool
+
+CHECK_URL = 'http://events.test/generate_204'
+PAGE_URL = 'http://events.test/calendar'
+
+
+class StandInResolver(AbstractResolver):
+    """Resolves every host to the stand-in's port on 127.0.0.1"""
+
+    def __init__(self, port):
+        self.port = port
+
+    async def resolve(self, host, port=0, family=socket.AF_INET):
+        return [{'hostname': host, 'host': '127.0.0.1', 'port': self.port,
+                 'family': socket.AF_INET, 'proto': 0, 'flags': 0}]
+
+    async def close(self):
+        pass
+
+
+def closed_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+async def stand_in(status=200, delay=0.0):
+    """Start a stand-in answering every GET with status after delay; (runner, port)"""
+    async def handle(request):
+        await asyncio.sleep(delay)
+        return web.Response(status=status, text=f'via stand-in {request.path}')
+
+    app = web.Application()
+    app.router.add_get('/{tail:.*}', handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    return runner, runner.addresses[0][1]
+
+
+async def make_pool(stand_ins, **kwargs):
+    """Pool over proxies named after their stand-ins: {name: (status, delay) or None}"""
+    runners, ports = [], {}
+    for name, behaviour in stand_ins.items():
+        if behaviour is None:
+            ports[name] = closed_port()
+            continue
+        runner, ports[name] = await stand_in(*behaviour)
+        runners.append(runner)
+
+    def connector_factory(proxy):
+        return aiohttp.TCPConnector(resolver=StandInResolver(ports[proxy]))
+
+    pool = ProxyPool(list(stand_ins), check_url=CHECK_URL, connector_factory=connector_factory,
+                     timeout=2, **kwargs)
+    return pool, runners
+
+
+async def shut_down(pool, runners):
+    await pool.close()
+    for runner in runners:
+        await runner.cleanup()
+
+
+def test_health_check_scores_live_and_dead_proxies():
+    async def scenario():
+        pool, runners = await make_pool({'live': (204, 0.0), 'dead': None})
+        try:
+            healthy = await pool.health_check()
+        finally:
+            await shut_down(pool, runners)
+        return healthy, pool.stats
+
+    healthy, stats = asyncio.run(scenario())
+    assert healthy == 1
+    assert stats['live'].measured and stats['live'].latency < 1.0
+    assert stats['live'].success == 1.0 and stats['live'].failures == 0
+    assert stats['dead'].failures == 1 and stats['dead'].success < 1.0
+
+
+def test_get_goes_through_the_picked_stand_in():
+    async def scenario():
+        pool, runners = await make_pool({'live': (200, 0.0), 'erroring': (502, 0.0)})
+        try:
+            via_live = await pool.get(PAGE_URL, exclude=['erroring'])
+            via_erroring = await pool.get(PAGE_URL, exclude=['live'])
+            none_left = await pool.get(PAGE_URL, exclude=['live', 'erroring'])
+        finally:
+            await shut_down(pool, runners)
+        return pool, via_live, via_erroring, none_left
+
+    pool, via_live, via_erroring, none_left = asyncio.run(scenario())
+    proxy, status, _, body = via_live
+    assert (proxy, status, body) == ('live', 200, 'via stand-in /calendar')
+    # A 5xx is the proxy's fault and counts against it
+    assert via_erroring[:2] == ('erroring', 502)
+    assert pool.stats['erroring'].failures == 1
+    assert none_left == (None, 0, {}, '')
+
+
+def test_ewma_updates():
+    pool = ProxyPool(['p'], check_url=CHECK_URL, alpha=0.5)
+    stats = pool.stats['p']
+
+    # The first latency sample replaces the prior, later ones are averaged in
+    pool.record('p', True, 0.2)
+    assert stats.latency == pytest.approx(0.2)
+    pool.record('p', True, 0.4)
+    assert stats.latency == pytest.approx(0.3)
+
+    pool.record('p', False)
+    assert stats.success == pytest.approx(0.5)
+    assert stats.latency == pytest.approx(0.3)
+    pool.record('p', True, 0.3)
+    assert stats.success == pytest.approx(0.75)
+    assert stats.failures == 0
+    assert stats.requests == 4
+
+
+def test_ejection_and_readmission(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(proxy_pool.time, 'monotonic', lambda: now[0])
+    pool = ProxyPool(['flaky', 'steady'], check_url=CHECK_URL, eject_after=2,
+                     eject_seconds=60, min_success=0.1)
+
+    pool.record('flaky', False)
+    assert 'flaky' in [stats.url for stats in pool.available()]
+    pool.record('flaky', False)
+    assert [stats.url for stats in pool.available()] == ['steady']
+    assert all(pool.pick() == 'steady' for _ in range(20))
+    assert pool.pick(exclude=['steady']) is None
+
+    now[0] += 61
+    stats = pool.stats['flaky']
+    assert 'flaky' in [stats.url for stats in pool.available()]
+    # Back with a clean slate, so one more failure does not eject it again
+    assert stats.failures == 0 and stats.success >= 0.2
+    pool.record('flaky', False)
+    assert 'flaky' in [stats.url for stats in pool.available()]
+
+
+def test_low_success_rate_ejects_before_the_failure_streak():
+    pool = ProxyPool(['p'], check_url=CHECK_URL, alpha=0.9, eject_after=10, min_success=0.2)
+    pool.record('p', False)
+    assert pool.available() == []
+
+
+def test_pick_is_weighted_by_score():
+    pool = ProxyPool(['fast', 'slow', 'unreliable'], check_url=CHECK_URL)
+    for url, latency, success in (('fast', 0.1, 1.0), ('slow', 1.0, 1.0), ('unreliable', 0.1, 0.5)):
+        pool.stats[url].latency, pool.stats[url].measured = latency, True
+        pool.stats[url].success = success
+
+    # Scores are success^2 / latency: 10, 1 and 2.5
+    random.seed(7)
+    picks = [pool.pick() for _ in range(5000)]
+    share = {url: picks.count(url) / len(picks) for url in pool.stats}
+    assert share['fast'] == pytest.approx(10 / 13.5, abs=0.03)
+    assert share['unreliable'] == pytest.approx(2.5 / 13.5, abs=0.03)
+    assert share['slow'] == pytest.approx(1 / 13.5, abs=0.02)
+    assert pool.pick(exclude=['fast', 'unreliable']) == 'slow'
+
+
+def test_fetch_with_retry_never_bypasses_the_pool():
+    pytest.importorskip('fake_useragent')
+    from museums.rate_limit import RateLimiter
+    from museums.retry import RetryPolicy
+    from proxy_scraper import ProxyRotationScraper
+
+    class DirectSession:
+        calls = 0
+
+        def get(self, *args, **kwargs):
+            DirectSession.calls += 1
+            raise AssertionError('fetched without a proxy')
+
+    async def scenario():
+        pool, runners = await make_pool({'live': (200, 0.0), 'dead': None},
+                                        eject_after=1, eject_seconds=600)
+        scraper = ProxyRotationScraper(proxy_pool=pool)
+        scraper.rate_limiter = RateLimiter(interval=0)
+        scraper.retry_policy = RetryPolicy(max_attempts=3, base_delay=0.01)
+        try:
+            fetched = await scraper.fetch_with_retry(DirectSession(), PAGE_URL)
+            # With every proxy ejected the fetch fails rather than going out directly
+            pool.stats['live'].ejected_until = float('inf')
+            refused = await scraper.fetch_with_retry(DirectSession(), PAGE_URL)
+        finally:
+            await shut_down(pool, runners)
+        return fetched, refused
+
+    fetched, refused = asyncio.run(scenario())
+    assert fetched == 'via stand-in /calendar'
+    assert refused is None
+    assert DirectSession.calls == 0
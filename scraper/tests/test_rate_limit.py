@@ -0,0 +1,121 @@
+import asyncio
+
+import pytest
+
+from museums import rate_limit
+from museums.rate_limit import RateLimiter, TokenBucket, host_of
+
+
+def test_bucket_allows_a_burst_then_spaces_requests():
+    bucket = TokenBucket(interval=2.0, burst=3)
+    bucket.updated = 0.0
+    assert [bucket.reserve(0.0) for _ in range(3)] == [0.0, 0.0, 0.0]
+    # Later callers queue up one interval apart
+    assert bucket.reserve(0.0) == pytest.approx(2.0)
+    assert bucket.reserve(0.0) == pytest.approx(4.0)
+
+
+def test_bucket_refills_up_to_burst():
+    bucket = TokenBucket(interval=1.0, burst=2)
+    bucket.updated = 0.0
+    bucket.reserve(0.0)
+    bucket.reserve(0.0)
+    assert bucket.reserve(0.5) == pytest.approx(0.5)
+    # A long pause refills the bucket, but only up to burst
+    assert bucket.reserve(100.0) == 0.0
+    assert bucket.reserve(100.0) == 0.0
+    assert bucket.reserve(100.0) == pytest.approx(1.0)
+
+
+def test_zero_interval_never_waits():
+    bucket = TokenBucket(interval=0, burst=1)
+    assert all(bucket.reserve(0.0) == 0.0 for _ in range(10))
+
+
+def test_slow_to_only_slows_down():
+    bucket = TokenBucket(interval=1.0, burst=5)
+    bucket.updated = 0.0
+    bucket.slow_to(10.0)
+    assert (bucket.interval, bucket.burst) == (10.0, 1)
+    assert bucket.reserve(0.0) == 0.0
+    assert bucket.reserve(0.0) == pytest.approx(10.0)
+
+    bucket = TokenBucket(interval=5.0)
+    bucket.slow_to(1.0)
+    assert bucket.interval == 5.0
+
+
+def test_hosts_are_limited_independently(monkeypatch):
+    monkeypatch.setattr(rate_limit.time, 'monotonic', lambda: 0.0)
+    limiter = RateLimiter(interval=1.0, burst=1, hosts={'Slow.example.org': 5.0})
+
+    assert limiter._reserve('https://a.example.org/1') == 0.0
+    assert limiter._reserve('https://a.example.org/2') == pytest.approx(1.0)
+    # Another host is not held up by the first one's queue
+    assert limiter._reserve('https://b.example.org/1') == 0.0
+    assert limiter._reserve('https://slow.example.org/1') == 0.0
+    assert limiter._reserve('https://slow.example.org/2') == pytest.approx(5.0)
+
+
+def test_crawl_delay_is_read_once_per_host(monkeypatch):
+    fetched = []
+
+    def fake_fetch(url, user_agent, timeout):
+        fetched.append(host_of(url))
+        return 3.0 if 'polite' in url else None
+
+    monkeypatch.setattr(rate_limit, 'fetch_crawl_delay', fake_fetch)
+    monkeypatch.setattr(rate_limit.time, 'monotonic', lambda: 0.0)
+    monkeypatch.setattr(rate_limit.time, 'sleep', lambda delay: None)
+    limiter = RateLimiter(interval=1.0, burst=2, crawl_delay=True)
+
+    assert limiter.wait('https://polite.example.org/a') == 0.0
+    assert limiter.wait('https://polite.example.org/b') == pytest.approx(3.0)
+    assert limiter.wait('https://other.example.org/a') == 0.0
+    assert limiter.wait('https://other.example.org/b') == 0.0
+    assert fetched == ['polite.example.org', 'other.example.org']
+    assert limiter.crawl_delays == {'polite.example.org': 3.0, 'other.example.org': None}
+
+    # Non-HTTP URLs have no robots.txt to read
+    limiter.wait('about:blank')
+    assert len(fetched) == 2
+
+
+def test_crawl_delay_from_robots_txt(monkeypatch):
+    class Response:
+        def __init__(self, body):
+            self.body = body
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def read(self):
+            return self.body
+
+    robots = b'User-agent: *\nCrawl-delay: 4\n\nUser-agent: fastbot\nCrawl-delay: 1\n'
+    monkeypatch.setattr(rate_limit, 'urlopen', lambda request, timeout: Response(robots))
+    assert rate_limit.fetch_crawl_delay('https://example.org/events') == 4.0
+    assert rate_limit.fetch_crawl_delay('https://example.org/events', 'fastbot') == 1.0
+
+    def unreachable(request, timeout):
+        raise OSError('connection refused')
+
+    monkeypatch.setattr(rate_limit, 'urlopen', unreachable)
+    assert rate_limit.fetch_crawl_delay('https://example.org/events') is None
+
+
+def test_wait_async_spaces_requests():
+    limiter = RateLimiter(interval=0.05, burst=1)
+
+    async def scenario():
+        return await asyncio.gather(*(limiter.wait_async('https://a.example.org/') for _ in range(3)),
+                                    limiter.wait_async('https://b.example.org/'))
+
+    waits = asyncio.run(scenario())
+    assert waits[0] == 0.0
+    assert waits[1] == pytest.approx(0.05, abs=0.01)
+    assert waits[2] == pytest.approx(0.10, abs=0.01)
+    assert waits[3] == 0.0
@@ -0,0 +1,86 @@
+import asyncio
+
+import pytest
+
+import browser_waits
+import resource_blocking
+from browser_pool import PoolRenderer
+from resource_blocking import Policies, policy_for
+
+CONFIG = {
+    'resource_blocking': {
+        'enabled': True,
+        'default': {'block_types': ['image', 'font'], 'deny_domains': ['tracker.example'],
+                    'allow_domains': []},
+        'museums': {'moma': {'block_types': ['image'], 'allow_domains': ['moma.org']}},
+    },
+}
+
+
+@pytest.fixture
+def no_config_loading(monkeypatch):
+    def load_config():
+        raise AssertionError('config loaded again')
+
+    monkeypatch.setattr(resource_blocking, 'load_config', load_config)
+
+
+def test_museum_overrides_the_default():
+    default, moma = policy_for(None, CONFIG), policy_for('moma', CONFIG)
+    assert default.blocks('https://cdn.example/font.woff2', 'font')
+    assert not moma.blocks('https://cdn.example/font.woff2', 'font')
+    assert moma.blocks('https://cdn.example/a.png', 'image')
+    assert not moma.blocks('https://www.moma.org/a.png', 'image')
+    # Unlisted museums get the default
+    assert policy_for('met', CONFIG).block_types == default.block_types
+
+
+def test_policies_use_the_given_config_once(no_config_loading):
+    policies = Policies(CONFIG)
+    assert policies('moma') is policies('moma')
+    assert policies('moma').block_types == {'image'}
+    assert policies(None).block_types == {'image', 'font'}
+
+
+def test_pool_renderer_blocks_per_museum(monkeypatch, no_config_loading):
+    class Driver:
+        page_source = '<html></html>'
+
+        def __init__(self):
+            self.blocked = []
+
+        def execute_cdp_cmd(self, command, params):
+            if command == 'Network.setBlockedURLs':
+                self.blocked.append(params['urls'])
+
+        def get(self, url):
+            pass
+
+    class Pool:
+        driver = Driver()
+
+        def acquire(self):
+            return self.driver
+
+        def release(self, driver):
+            pass
+
+        def close(self):
+            pass
+
+    monkeypatch.setattr(browser_waits, 'wait_until_ready', lambda driver, timeout: True)
+    renderer = PoolRenderer(config=CONFIG)
+    renderer._pool = Pool()
+
+    async def scenario():
+        await renderer.render('https://www.moma.org/calendar/', museum='moma')
+        await renderer.render('https://www.metmuseum.org/events', museum='met')
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        renderer.close()
+    moma, met = Pool.driver.blocked
+    assert '*.woff2' not in moma and '*.png' in moma
+    # The shared driver gets the next museum's policy, not the last one's
+    assert '*.woff2' in met and '*://tracker.example/*' in met
@@ -0,0 +1,161 @@
+import asyncio
+import random
+from email.utils import formatdate
+
+import pytest
+
+from museums import retry
+from museums.retry import FetchResult, RetryBudget, RetryPolicy, parse_retry_after
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record the delays the policy sleeps for instead of sleeping"""
+    recorded = []
+
+    async def fake_async_sleep(delay):
+        recorded.append(delay)
+
+    monkeypatch.setattr(retry.time, 'sleep', recorded.append)
+    monkeypatch.setattr(retry.asyncio, 'sleep', fake_async_sleep)
+    return recorded
+
+
+def responses(*statuses, headers=None):
+    """fn() returning a FetchResult per status in turn; .calls counts them"""
+    remaining = list(statuses)
+
+    def fn():
+        fn.calls += 1
+        return FetchResult(remaining.pop(0), headers or {}, '')
+    fn.calls = 0
+    return fn
+
+
+def test_retry_after_delta_seconds():
+    assert parse_retry_after('120') == 120.0
+    assert parse_retry_after(' 0 ') == 0.0
+
+
+def test_retry_after_http_date(monkeypatch):
+    now = 1_700_000_000.0
+    monkeypatch.setattr(retry.time, 'time', lambda: now)
+    assert parse_retry_after(formatdate(now + 30, usegmt=True)) == pytest.approx(30)
+    # A date in the past means retry now
+    assert parse_retry_after(formatdate(now - 30, usegmt=True)) == 0.0
+
+
+def test_retry_after_unusable():
+    assert parse_retry_after(None) is None
+    assert parse_retry_after('') is None
+    assert parse_retry_after('soon') is None
+    assert parse_retry_after('-5') is None
+
+
+def test_success_never_sleeps(sleeps):
+    fn = responses(200)
+    assert RetryPolicy().call(fn).status == 200
+    assert fn.calls == 1
+    assert sleeps == []
+
+
+def test_retries_until_success_with_retry_after(sleeps):
+    fn = responses(503, 429, 200, headers={'Retry-After': '3'})
+    assert RetryPolicy(max_attempts=3).call(fn).status == 200
+    assert fn.calls == 3
+    assert sleeps == [3.0, 3.0]
+
+
+def test_gives_up_on_a_retry_after_beyond_the_cap(sleeps):
+    fn = responses(429, 200, headers={'Retry-After': '600'})
+    result = RetryPolicy(max_attempts=3, max_retry_after=60).call(fn)
+    assert result.status == 429
+    assert fn.calls == 1
+    assert sleeps == []
+
+
+def test_final_statuses_are_not_retried(sleeps):
+    for status in (200, 304, 403, 404):
+        fn = responses(status, 200)
+        assert RetryPolicy().call(fn).status == status
+        assert fn.calls == 1
+    assert sleeps == []
+
+
+def test_extra_statuses_per_call(sleeps):
+    fn = responses(403, 200)
+    assert RetryPolicy().call(fn, statuses={403}).status == 200
+    assert fn.calls == 2
+
+
+def test_non_idempotent_methods_are_not_retried(sleeps):
+    fn = responses(503, 200)
+    assert RetryPolicy().call(fn, method='POST').status == 503
+    assert fn.calls == 1
+
+    fn = responses(503, 200)
+    assert RetryPolicy().call(fn, method='put').status == 200
+    assert fn.calls == 2
+
+
+def test_budget_is_shared_and_exhausts(sleeps):
+    budget = RetryBudget(2)
+    first, second = RetryPolicy(max_attempts=5, budget=budget), RetryPolicy(max_attempts=5, budget=budget)
+
+    fn = responses(503, 503, 200)
+    assert first.call(fn).status == 200
+    assert budget.remaining == 0
+
+    # The other policy has nothing left to spend; it fails fast
+    fn = responses(503, 200)
+    assert second.call(fn).status == 503
+    assert fn.calls == 1
+    assert len(sleeps) == 2
+
+
+def test_transient_errors_are_retried_then_reraised(sleeps):
+    calls = []
+
+    def fn():
+        calls.append(1)
+        raise ConnectionError('reset')
+
+    with pytest.raises(ConnectionError):
+        RetryPolicy(max_attempts=3).call(fn)
+    assert len(calls) == 3
+    assert len(sleeps) == 2
+
+
+def test_other_errors_propagate_at_once(sleeps):
+    calls = []
+
+    def fn():
+        calls.append(1)
+        raise ValueError('bad payload')
+
+    with pytest.raises(ValueError):
+        RetryPolicy().call(fn)
+    assert len(calls) == 1
+
+
+def test_decorrelated_jitter_stays_in_bounds():
+    policy = RetryPolicy(base_delay=0.5, max_delay=20)
+    random.seed(3)
+    previous = policy.base_delay
+    for _ in range(200):
+        delay = policy.backoff(previous)
+        assert policy.base_delay <= delay <= min(policy.max_delay, max(policy.base_delay, previous * 3))
+        previous = delay
+    # It grows towards the cap rather than staying at the base delay
+    assert previous > policy.base_delay
+
+
+def test_call_async(sleeps):
+    statuses = [502, 200]
+
+    async def fn():
+        return FetchResult(statuses.pop(0), {'Retry-After': '1'}, 'body')
+
+    result = asyncio.run(RetryPolicy().call_async(fn))
+    assert (result.status, result.body) == (200, 'body')
+    assert sleeps == [1.0]
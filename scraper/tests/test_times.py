@@ -0,0 +1,54 @@
+import pytest
+
+from museums.times import TimeRange, parse_time_range
+
+
+@pytest.mark.parametrize('text, start, end', [
+    ('6-7:30 pm', '18:00', '19:30'),
+    ('11:30 am – 12:30 pm', '11:30', '12:30'),
+    ('11-12:30 pm', '11:00', '12:30'),
+    ('10 a.m. to 2 p.m.', '10:00', '14:00'),
+    ('4:00 p.m.', '16:00', None),
+    ('18:30', '18:30', None),
+])
+def test_times_and_ranges(text, start, end):
+    parsed = parse_time_range(text)
+    assert (parsed.start_time, parsed.end_time) == (start, end)
+
+
+@pytest.mark.parametrize('text, start', [
+    ('Jan 5, 2025 2:00 PM', '14:00'),
+    ('March 8, 6 PM', '18:00'),
+    ('Doors 7, show 8 PM', '20:00'),
+    ('Floors 3-4, 6:30 pm - 8 pm', '18:30'),
+])
+def test_bare_numbers_before_the_time_are_skipped(text, start):
+    assert parse_time_range(text).start_time == start
+
+
+def test_display_string():
+    assert parse_time_range('6-7:30 pm') == TimeRange('6:00 PM - 7:30 PM', '18:00', '19:30')
+    assert parse_time_range('Jan 5, 2025 2:00 PM') == TimeRange('2:00 PM', '14:00', None)
+
+
+@pytest.mark.parametrize('text', ['', None, 'See website for time', '5-7', 'Gallery 12', '25:00', '13 pm'])
+def test_no_clock_time(text):
+    assert parse_time_range(text) is None
+
+
+def test_targeted_scraper_events_get_start_and_end_times():
+    from targeted_scraper import TargetedMuseumScraper
+
+    scraper = TargetedMuseumScraper.__new__(TargetedMuseumScraper)
+    scraper.events = []
+    base = {'id': 'x', 'museum': 'met', 'museumName': 'The Met', 'title': 'Gallery Talk',
+            'date': '2025-01-05', 'description': '', 'type': None, 'location': '', 'url': ''}
+    scraper.add_event(dict(base, time='6-7:30 pm'))
+    scraper.add_event(dict(base, time='See website for time'), 'Jan 5, 2025 2:00 PM')
+    scraper.add_event(dict(base, time='See website for time'))
+
+    assert [(e['time'], e['start_time'], e['end_time']) for e in scraper.events] == [
+        ('6-7:30 pm', '18:00', '19:30'),
+        ('2:00 PM', '14:00', None),
+        ('See website for time', None, None),
+    ]
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Train the event-type model on the labelled CSVs in csv_data/
+Reports held-out accuracy against the keyword classifier and batch
+throughput, then saves the model for the scrapers to load.
+"""
+
+import argparse
+import csv
+import glob
+import os
+import time
+
+from config import load_config
+from museums.classify import event_classifier
+from museums.type_model import TypeModel
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+CSV_DIR = os.path.join(SCRIPT_DIR, 'csv_data')
+
+# CSV labels mapped onto the scrapers' type vocabulary (classify.EVENT_TYPES):
+# plural spellings, and the CSV-only types the site has no keywords for
+LABEL_ALIASES = {
+    'Films': 'Film',
+    'Tours': 'Tour',
+    'Workshops': 'Workshop',
+    'Talk': 'Lecture',
+    'Music': 'Performance',
+    'Gallery Experience': 'Tour',
+    "Member's Only": 'Special Event',
+    'Social Event': 'Special Event',
+    'Exhibition/Special Event': 'Special Event',
+}
+
+
+def load_labelled_rows(csv_dir=CSV_DIR):
+    """Return (texts, labels) for every CSV row with a title and an Event Type"""
+    texts, labels = [], []
+    for filepath in sorted(glob.glob(os.path.join(csv_dir, '*.csv'))):
+        with open(filepath, 'r', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                title = (row.get('Name') or row.get('title') or '').strip()
+                label = (row.get('Event Type') or row.get('type') or '').strip()
+                if not title or not label:
+                    continue
+                description = row.get('Short Description') or row.get('Description') or ''
+                texts.append(f"{title} {' '.join(description.split())}")
+                labels.append(LABEL_ALIASES.get(label, label))
+    return texts, labels
+
+
+def evaluate(texts, labels, every=5):
+    """Accuracy of the model and of the keyword classifier on every n-th row"""
+    test = set(range(0, len(texts), every))
+    train_texts = [t for i, t in enumerate(texts) if i not in test]
+    train_labels = [l for i, l in enumerate(labels) if i not in test]
+    test_texts = [texts[i] for i in sorted(test)]
+    test_labels = [labels[i] for i in sorted(test)]
+
+    model = TypeModel.train(train_texts, train_labels)
+    predicted = model.predict(test_texts)
+    keyword = [event_classifier.classify(text) for text in test_texts]
+    model_accuracy = sum(p == l for p, l in zip(predicted, test_labels)) / len(test_labels)
+    keyword_accuracy = sum(k == l for k, l in zip(keyword, test_labels)) / len(test_labels)
+    return model_accuracy, keyword_accuracy
+
+
+def throughput(model, texts, batch_size=5000, repeat=3):
+    """Events per second for one batched predict vs the per-event keyword
+    loop, best of repeat runs each so scheduler noise does not decide it"""
+    batch = (texts * (batch_size // len(texts) + 1))[:batch_size]
+    model_best = keyword_best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        model.predict(batch)
+        model_best = min(model_best, time.perf_counter() - start)
+        start = time.perf_counter()
+        for text in batch:
+            event_classifier.classify(text)
+        keyword_best = min(keyword_best, time.perf_counter() - start)
+    return batch_size / model_best, batch_size / keyword_best
+
+
+def main():
+    config = load_config()
+    parser = argparse.ArgumentParser(description='Train the event-type model on csv_data/')
+    parser.add_argument('--csv-dir', default=CSV_DIR, help='Directory of labelled CSVs')
+    parser.add_argument('--output', default=config['type_model'], help='Where to save the model')
+    args = parser.parse_args()
+
+    texts, labels = load_labelled_rows(args.csv_dir)
+    if not texts:
+        print(f"No labelled rows in {args.csv_dir}")
+        return
+    print(f"Loaded {len(texts)} labelled events in {len(set(labels))} types")
+
+    model_accuracy, keyword_accuracy = evaluate(texts, labels)
+    print(f"Held-out accuracy: model {model_accuracy:.0%}, keywords {keyword_accuracy:.0%}")
+
+    model = TypeModel.train(texts, labels)
+    for batch_size in (1000, 5000, 20000):
+        model_rate, keyword_rate = throughput(model, texts, batch_size)
+        print(f"Throughput at {batch_size:,} events: model {model_rate:,.0f} events/s, "
+              f"keywords {keyword_rate:,.0f} events/s ({model_rate / keyword_rate:.1f}x)")
+
+    model.save(args.output)
+    print(f"Saved model to {args.output} ({os.path.getsize(args.output) / 1024:.0f} KiB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+"""
+Capture the JSON (XHR/fetch) responses a calendar page renders from
+Many museum calendars are drawn from a JSON endpoint. While the browser
+loads the page, Chrome's performance log lists every response; the JSON
+ones are read back through CDP, searched for a list of events, and the
+best one is persisted: the payload under the cache dir and the endpoint in
+api_endpoints.json. Later runs fetch that endpoint over plain HTTP and
+skip the browser entirely, falling back to it if the endpoint stops
+returning events.
+"""
+
+import base64
+import hashlib
+import json
+import os
+import re
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from museums import dates
+from museums.retry import SINGLE_ATTEMPT
+
+# Keys that commonly hold each event field in museum JSON APIs
+TITLE_KEYS = ('title', 'name', 'headline', 'eventTitle', 'event_title', 'displayTitle')
+DATE_KEYS = ('startDate', 'start_date', 'date', 'start', 'startTime', 'start_time', 'dateStart',
+             'eventDate', 'event_date', 'datetime', 'startsAt', 'starts_at')
+URL_KEYS = ('url', 'link', 'permalink', 'href', 'eventUrl', 'event_url')
+DESCRIPTION_KEYS = ('description', 'summary', 'excerpt', 'teaser', 'subtitle')
+
+_TAGS = re.compile(r'<[^>]+>')
+
+
+def enable_performance_log(options):
+    """Ask Chrome to keep the network events that capture_json_responses reads"""
+    options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+    return options
+
+
+def capture_json_responses(driver) -> List[Dict[str, Any]]:
+    """JSON bodies of the XHR/fetch GET responses logged since the last call"""
+    try:
+        entries = driver.get_log('performance')
+    except Exception:
+        # Driver started without the performance log
+        return []
+
+    methods, responses = {}, []
+    for entry in entries:
+        message = json.loads(entry['message'])['message']
+        params = message.get('params', {})
+        if message.get('method') == 'Network.requestWillBeSent':
+            methods[params.get('requestId')] = params.get('request', {}).get('method', 'GET')
+        elif (message.get('method') == 'Network.responseReceived'
+              and params.get('type') in ('XHR', 'Fetch')
+              and 'json' in params.get('response', {}).get('mimeType', '')):
+            responses.append(params)
+
+    captured = []
+    for params in responses:
+        if methods.get(params['requestId'], 'GET') != 'GET':
+            # Only GET endpoints can be replayed without the page's request body
+            continue
+        try:
+            result = driver.execute_cdp_cmd('Network.getResponseBody', {'requestId': params['requestId']})
+            body = result['body']
+            if result.get('base64Encoded'):
+                body = base64.b64decode(body).decode('utf-8', 'replace')
+            payload = json.loads(body)
+        except Exception:
+            continue
+        captured.append({
+            'url': params['response']['url'],
+            'status': params['response'].get('status'),
+            'payload': payload,
+        })
+    return captured
+
+
+def _value(item: Dict[str, Any], keys) -> Optional[str]:
+    for key in keys:
+        value = item.get(key)
+        if isinstance(value, dict):
+            # WordPress REST style: {"title": {"rendered": "..."}}
+            value = value.get('rendered') or value.get('value')
+        if isinstance(value, (str, int, float)) and str(value).strip():
+            return ' '.join(_TAGS.sub(' ', str(value)).split())
+    return None
+
+
+def _lists(payload: Any, depth: int = 0) -> Iterator[List[Dict[str, Any]]]:
+    if depth > 5:
+        return
+    if isinstance(payload, list):
+        if payload and all(isinstance(item, dict) for item in payload):
+            yield payload
+        for item in payload[:50]:
+            yield from _lists(item, depth + 1)
+    elif isinstance(payload, dict):
+        for value in payload.values():
+            yield from _lists(value, depth + 1)
+
+
+def find_event_list(payload: Any) -> List[Dict[str, Any]]:
+    """The list in payload whose items most often have both a title and a date"""
+    best, best_score = [], 0
+    for items in _lists(payload):
+        score = sum(1 for item in items if _value(item, TITLE_KEYS) and _value(item, DATE_KEYS))
+        if score > best_score:
+            best, best_score = items, score
+    return best
+
+
+def events_from_json(payload: Any, museum: str, location: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Events in a captured payload, with dates normalized to YYYY-MM-DD;
+    museum and location are copied onto every event"""
+    events = []
+    for item in find_event_list(payload):
+        title = _value(item, TITLE_KEYS)
+        date = dates.parse_date(_value(item, DATE_KEYS) or '')
+        if not title or not date:
+            continue
+        event = {
+            'title': title,
+            'date': date,
+            'museum': museum,
+        }
+        if location:
+            event['location'] = location
+        event['data_source'] = 'xhr_capture'
+        url = _value(item, URL_KEYS)
+        if url:
+            event['url'] = url
+        description = _value(item, DESCRIPTION_KEYS)
+        if description:
+            event['description'] = description[:500]
+        events.append(event)
+    return events
+
+
+class EndpointStore:
+    """Endpoints that served a museum's events, persisted between runs"""
+
+    def __init__(self, path: str, payload_dir: Optional[str] = None):
+        self.path = path
+        self.payload_dir = payload_dir
+        self.endpoints: Dict[str, Dict[str, Any]] = {}
+        # Museums scraped in parallel share one store
+        self._lock = threading.RLock()
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    self.endpoints = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"Ignoring unreadable endpoint store {path}: {e}")
+
+    def get(self, museum: str) -> Optional[Dict[str, Any]]:
+        return self.endpoints.get(museum)
+
+    def record(self, museum: str, url: str, payload: Any, event_count: int):
+        if self.payload_dir:
+            os.makedirs(self.payload_dir, exist_ok=True)
+            name = f"{museum}-{hashlib.sha1(url.encode('utf-8')).hexdigest()[:10]}.json"
+            with open(os.path.join(self.payload_dir, name), 'w', encoding='utf-8') as f:
+                json.dump({'url': url, 'payload': payload}, f, ensure_ascii=False)
+        with self._lock:
+            entry = self.endpoints.setdefault(museum, {'discovered': datetime.now().isoformat()})
+            entry.update({'url': url, 'events': event_count, 'last_ok': datetime.now().isoformat()})
+            self.save()
+
+    def forget(self, museum: str):
+        with self._lock:
+            if self.endpoints.pop(museum, None) is not None:
+                self.save()
+
+    def save(self):
+        with self._lock:
+            if os.path.dirname(self.path):
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, 'w', encoding='utf-8') as f:
+                json.dump(self.endpoints, f, indent=2, sort_keys=True)
+
+
+def endpoint_store(settings: Dict[str, Any]) -> EndpointStore:
+    """The store described by the 'xhr_capture' config section"""
+    return EndpointStore(settings['endpoints_file'], settings.get('payload_dir'))
+
+
+def best_capture(captured: List[Dict[str, Any]], museum: str, location: Optional[str] = None):
+    """(response, events) for the captured response with the most events"""
+    best, best_events = None, []
+    for response in captured:
+        events = events_from_json(response['payload'], museum, location)
+        if len(events) > len(best_events):
+            best, best_events = response, events
+    return best, best_events
+
+
+def fetch_endpoint(url: str, session=None, timeout: int = 15, retry_policy=None,
+                   rate_limiter=None) -> Tuple[Optional[int], Optional[Any]]:
+    """GET a stored endpoint over plain HTTP; returns (status, payload)
+
+    status is None when the request itself failed, and payload is None
+    unless the endpoint answered 200 with valid JSON. Transient failures
+    are retried by retry_policy, each attempt waiting for rate_limiter.
+    """
+    import requests
+
+    http = session or requests
+
+    def attempt():
+        if rate_limiter:
+            rate_limiter.wait(url)
+        return http.get(url, timeout=timeout, headers={
+            'Accept': 'application/json, text/plain, */*',
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+        })
+
+    try:
+        response = (retry_policy or SINGLE_ATTEMPT).call(attempt)
+    except requests.RequestException:
+        return None, None
+    if response.status_code != 200:
+        return response.status_code, None
+    try:
+        return 200, response.json()
+    except ValueError:
+        return 200, None